@@ -34,11 +34,20 @@ from operator import attrgetter
 import enum
 
 
-_Context = enum.Enum('Context', 'Load Store Del')
-Load = _Context.Load
-Store = _Context.Store
-Del = _Context.Del
-del _Context
+class Context(enum.Enum):
+    Load = 1
+    Store = 2
+    Del = 3
+
+    def __reduce_ex__(self, protocol):
+        # The enumeration itself isn't exposed by the package, so its
+        # members are pickled as references to the module-level names.
+        return self.name
+
+Load = Context.Load
+Store = Context.Store
+Del = Context.Del
+del Context
 
 
 # WARNING: internal imports order matters !
@@ -51,7 +60,7 @@ from astroid.exceptions import *
 # make all node classes accessible from astroid package
 from astroid.nodes import *
 
-from astroid.builder import parse
+from astroid.builder import parse, parse_file, parse_many
 
 # TODO
 # from astroid import zipper
@@ -16,6 +16,93 @@ from astroid import util
 # representation of a node.
 FIELD_CHARACTERS_LIMIT = 160
 
+# The node classes, in the order of their bits in the class masks.
+_NODE_CLASSES = []
+# The masks of the classes given to classes_mask.
+_CLASSES_MASKS = {}
+
+
+class _SlotDefault(object):
+    """A slot with a class-level default, returned while the slot is unset."""
+
+    __slots__ = ('slot', 'default')
+
+    def __init__(self, slot, default):
+        self.slot = slot
+        self.default = default
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.default
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            return self.default
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance):
+        self.slot.__delete__(instance)
+
+
+class NodeMeta(type):
+    """Metaclass of the nodes, giving them __slots__ instead of a __dict__.
+
+    The slots of a class are its _astroid_fields, its _other_fields and
+    its _private_fields which none of its bases has a slot for yet,
+    unless the class defines __slots__ itself.  A class attribute named
+    like a slot, as Module.lineno, is kept as the default of the slot,
+    returned while it's unset.
+
+    Each class is given its own bit, _class_bit, for the masks of
+    :func:`tree_mask`.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        if '__slots__' in namespace:
+            cls = super(NodeMeta, mcs).__new__(mcs, name, bases, namespace)
+            return _register(cls)
+        namespace = dict(namespace)
+        inherited = set()
+        for base in bases:
+            for klass in base.__mro__:
+                inherited.update(klass.__dict__.get('__slots__', ()))
+        names = []
+        for attribute in ('_astroid_fields', '_other_fields',
+                          '_private_fields'):
+            names.extend(namespace.get(attribute, ()))
+            for base in bases:
+                names.extend(getattr(base, attribute, ()))
+        slots = []
+        for slot in names:
+            if slot not in inherited and slot not in slots:
+                slots.append(slot)
+        defaults = {}
+        for slot in inherited.union(slots):
+            if slot in namespace:
+                defaults[slot] = namespace.pop(slot)
+        namespace['__slots__'] = tuple(slots)
+        cls = super(NodeMeta, mcs).__new__(mcs, name, bases, namespace)
+        for slot, default in defaults.items():
+            for klass in cls.__mro__:
+                if slot in klass.__dict__:
+                    descriptor = klass.__dict__[slot]
+                    break
+            descriptor = getattr(descriptor, 'slot', descriptor)
+            setattr(cls, slot, _SlotDefault(descriptor, default))
+        return _register(cls)
+
+
+def _register(cls):
+    cls._class_bit = 1 << len(_NODE_CLASSES)
+    _NODE_CLASSES.append(cls)
+    # A new class may be a subclass of those already asked for.
+    _CLASSES_MASKS.clear()
+    return cls
+
+
+@six.add_metaclass(NodeMeta)
 class BaseNode(object):
     """Base Class for all Astroid node classes.
 
@@ -25,14 +112,16 @@ class BaseNode(object):
     optional_assign = False # True for For (and for Comprehension if py <3.0)
     is_function = False # True for FunctionDef nodes
     # attributes below are set by the builder module or by raw factories
-    lineno = None
-    col_offset = None
+    __slots__ = ('lineno', 'col_offset', 'end_lineno', '_structural_hash',
+                 '_class_mask')
     # parent node in the tree
     parent = None
     # attributes containing child node(s) redefined in most concrete classes:
     _astroid_fields = ()
     # attributes containing non-nodes:
     _other_fields = ()
+    # attributes of the instances which are neither fields nor positions:
+    _private_fields = ()
     # attributes containing AST-dependent fields:
     _other_other_fields = ()
     # instance specific inference function infer(node, context)
@@ -106,6 +195,54 @@ class BaseNode(object):
                          'lineno': self.fromlineno,
                          'id': id(self)}
 
+    @property
+    def structural_hash(self):
+        """A hash of the subtree rooted at this node, ignoring positions.
+
+        Subtrees equal but for their positions have equal hashes.  The
+        hash of each node of the subtree is computed once, so the
+        subtree must not be changed in place afterwards.
+        """
+        try:
+            return self._structural_hash
+        except AttributeError:
+            return _hash_tree(self)
+
+    def make_node(self, children):
+        """Makes a copy of this node whose children are *children*.
+
+        *children* gives the values of the _astroid_fields, in order.
+        The positions and the other fields are shared with this node,
+        while the private fields are left unset.
+        """
+        cls = self.__class__
+        node = cls.__new__(cls)
+        for field in ('lineno', 'col_offset') + cls._other_fields:
+            setattr(node, field, getattr(self, field))
+        for field, child in zip(cls._astroid_fields, children):
+            setattr(node, field, child)
+        return node
+
+    def copy(self, **fields):
+        """Makes a shallow copy of this node, replacing the values of
+        some of its fields.
+
+        *fields* gives the new values of positions, of _astroid_fields
+        or of _other_fields.  The private fields are left unset.
+
+        :raises ValueError: if a field isn't one of those.
+        """
+        cls = self.__class__
+        names = ('lineno', 'col_offset') + cls._astroid_fields + cls._other_fields
+        unknown = set(fields).difference(names)
+        if unknown:
+            raise ValueError('{0} has no fields {1}.'.format(
+                cls.__name__, ', '.join(sorted(unknown))))
+        node = cls.__new__(cls)
+        for field in names:
+            setattr(node, field, fields.get(field, getattr(self, field)))
+        return node
+
     def accept(self, visitor):
         func = getattr(visitor, "visit_" + self.__class__.__name__.lower())
         return func(self)
@@ -116,15 +253,10 @@ class BaseNode(object):
 
     @property
     def tolineno(self):
-        last_child = self
-        while last_child:
-            for child in reversed(tuple(last_child)):
-                if child:
-                    last_child = child
-                    break
-            else:
-                break
-        return last_child.lineno
+        try:
+            return self.end_lineno
+        except AttributeError:
+            return _find_end_lineno(self)
 
     def block_range(self, lineno):
         """handle block line numbers range for non block opening statements
@@ -260,9 +392,201 @@ class BaseNode(object):
         print(self.repr_tree(*args, **kws))
 
 
+def _find_end_lineno(node):
+    """Finds the first line of the last descendant of *node*.
+
+    It's stored as the end_lineno of the nodes on the way down to that
+    descendant, and the search stops at a node whose end_lineno is
+    already known.
+    """
+    spine = []
+    last_child = node
+    while True:
+        if isinstance(last_child, BaseNode):
+            try:
+                end_lineno = last_child.end_lineno
+                break
+            except AttributeError:
+                spine.append(last_child)
+        for child in reversed(tuple(last_child)):
+            if child:
+                last_child = child
+                break
+        else:
+            end_lineno = last_child.lineno
+            break
+    for ancestor in spine:
+        ancestor.end_lineno = end_lineno
+    return end_lineno
+
+
+def _hash_value(value):
+    if value.__class__ is list:
+        value = tuple(value)
+    # The class is hashed too, so that 1 and 1.0 hash differently.
+    return hash((value.__class__, value))
+
+
+def _hash_tree(root):
+    """Computes the structural hashes of the subtree rooted at *root*.
+
+    The tree is walked in postfix order, with an explicit stack for the
+    hashes of the children, so that deep trees don't overflow the call
+    stack.  The hashes of the nodes are cached on them.
+    """
+    hashes = []
+    to_visit = [(root, False)]
+    while to_visit:
+        value, visited = to_visit.pop()
+        if not visited:
+            if isinstance(value, BaseNode):
+                try:
+                    hashes.append(value._structural_hash)
+                    continue
+                except AttributeError:
+                    pass
+            elif value.__class__ is not tuple and value.__class__ is not list:
+                hashes.append(_hash_value(value))
+                continue
+            to_visit.append((value, True))
+            to_visit.extend((child, False) for child in reversed(tuple(value)))
+            continue
+        count = len(value._astroid_fields if isinstance(value, BaseNode)
+                    else value)
+        children = tuple(hashes[len(hashes) - count:])
+        del hashes[len(hashes) - count:]
+        if isinstance(value, BaseNode):
+            result = hash((value.__class__,
+                           tuple([_hash_value(getattr(value, field))
+                                  for field in value._other_fields]),
+                           children))
+            value._structural_hash = result
+        else:
+            result = hash(children)
+        hashes.append(result)
+    return hashes[0]
+
+
+def tree_mask(value):
+    """Gets the mask of the bits of the classes of the nodes in *value*,
+    a node or a sequence of nodes, and in their descendants.
+
+    The mask of each node is computed once and cached on it, like its
+    structural hash, so the subtree must not be changed in place
+    afterwards.  Transforms and zippers make new nodes for the ones
+    they change, which have no mask yet.  The masks of the sequences
+    aren't cached.
+    """
+    if isinstance(value, BaseNode):
+        try:
+            return value._class_mask
+        except AttributeError:
+            pass
+    elif value.__class__ is not tuple and value.__class__ is not list:
+        return 0
+    masks = []
+    to_visit = [(value, False)]
+    while to_visit:
+        value, visited = to_visit.pop()
+        if not visited:
+            if isinstance(value, BaseNode):
+                try:
+                    masks.append(value._class_mask)
+                    continue
+                except AttributeError:
+                    pass
+            elif value.__class__ is not tuple and value.__class__ is not list:
+                masks.append(0)
+                continue
+            to_visit.append((value, True))
+            to_visit.extend((child, False) for child in reversed(tuple(value)))
+            continue
+        count = len(value._astroid_fields if isinstance(value, BaseNode)
+                    else value)
+        result = 0
+        for mask in masks[len(masks) - count:]:
+            result |= mask
+        del masks[len(masks) - count:]
+        if isinstance(value, BaseNode):
+            result |= value._class_bit
+            value._class_mask = result
+        masks.append(result)
+    return masks[0]
+
+
+def classes_mask(classes):
+    """Gets the mask of the bits of the node classes which are
+    subclasses of *classes*, a class or a tuple of classes as taken by
+    isinstance.
+
+    :returns: The mask, or None if some of *classes* aren't node
+        classes, when the masks can't tell which values are their
+        instances.
+    """
+    try:
+        return _CLASSES_MASKS[classes]
+    except KeyError:
+        pass
+    members = classes if isinstance(classes, tuple) else (classes,)
+    if all(isinstance(member, type) and issubclass(member, BaseNode)
+           for member in members):
+        mask = 0
+        for cls in _NODE_CLASSES:
+            if issubclass(cls, classes):
+                mask |= cls._class_bit
+    else:
+        mask = None
+    _CLASSES_MASKS[classes] = mask
+    return mask
+
+
+class LazyBody(object):
+    """The body of a node, to be built on its first access.
+
+    *build* is called without arguments to build the body.
+    """
+
+    __slots__ = ('build',)
+
+    def __init__(self, build):
+        self.build = build
+
+
+class LazyBodyMixIn(object):
+    """Builds the body of a node lazily, when it was given a LazyBody.
+
+    The slots of the body and of the LazyBody are made by NodeMeta on
+    the node classes, not on this mixin, so they're set with setattr.
+    """
+
+    __slots__ = ()
+    _private_fields = ('_lazy_body',)
+
+    def _set_body(self, body):
+        if isinstance(body, LazyBody):
+            setattr(self, '_lazy_body', body)
+        else:
+            setattr(self, 'body', body)
+
+    def __getattr__(self, name):
+        # Only called when the body wasn't built yet.
+        if name != 'body':
+            raise AttributeError(name)
+        try:
+            lazy_body = object.__getattribute__(self, '_lazy_body')
+        except AttributeError:
+            raise AttributeError(name)
+        body = lazy_body.build()
+        setattr(self, 'body', body)
+        delattr(self, '_lazy_body')
+        return body
+
+
 class BlockRangeMixIn(object):
     """override block range """
 
+    __slots__ = ()
+
     @property
     def blockstart_tolineno(self):
         return self.lineno
@@ -289,7 +613,15 @@ class Empty(BaseNode):
     value.
     """
 
+    lineno = None
+    col_offset = None
+
     def __bool__(self):
         return False
 
     __nonzero__ = __bool__
+
+    def __reduce__(self):
+        # Empty is a singleton bound to the name of its own class, so
+        # pickle it as a reference to that name to keep it unique.
+        return 'Empty'
@@ -0,0 +1,312 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""Benchmarks for the hot paths of astroid.
+
+The benchmarks run over a corpus made of the modules of the standard
+library of the running Python and of synthetic modules, very deep or
+very wide, built in memory, so they need nothing but astroid itself.
+Each benchmark reports the times of several runs, the time per
+operation and the peak memory allocated by a run, when it can be
+measured.  The memory held by the trees of the corpus is reported
+too.  Run them with ``python -m astroid.benchmarks``.
+"""
+
+import collections
+import gc
+import glob
+import os
+import platform
+import sys
+import timeit
+
+from astroid import __pkginfo__
+from astroid import as_string
+from astroid import builder
+from astroid import exceptions
+from astroid import manager
+from astroid import nodes
+from astroid import rebuilder
+from astroid import transforms
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2
+    tracemalloc = None
+
+
+Source = collections.namedtuple('Source', 'name code')
+
+
+def stdlib_sources(limit=None):
+    """Gets the sources of the top-level modules of the standard library.
+
+    :param int limit: The maximum number of modules, by default all of them.
+    """
+    directory = os.path.dirname(os.__file__)
+    paths = sorted(glob.glob(os.path.join(directory, '*.py')))[:limit]
+    sources = []
+    for path in paths:
+        with open(path, 'rb') as stream:
+            code = stream.read()
+        try:
+            code = code.decode(builder._detect_encoding(code))
+        except (LookupError, SyntaxError, UnicodeDecodeError):
+            continue
+        sources.append(Source(os.path.basename(path), code))
+    return sources
+
+
+def deep_source(depth=30, length=50):
+    """Builds a module with nested blocks and long chained expressions."""
+    lines = []
+    for level in range(depth):
+        lines.append('    ' * level + 'if x%d:' % level)
+    expression = ' + '.join('x%d' % index for index in range(length))
+    lines.append('    ' * depth + 'y = ' + expression)
+    return Source('deep', '\n'.join(lines) + '\n')
+
+
+def wide_source(width=2000):
+    """Builds a module with many small functions and classes."""
+    lines = []
+    for index in range(width):
+        lines.append('def function%d(a, b=%d, *args, **kwargs):'
+                     % (index, index))
+        lines.append('    return [a.b(c) for c in args if c] or kwargs')
+        lines.append('class Class%d(Base):' % index)
+        lines.append('    attribute = {"key": (1, 2.0, None)}')
+    return Source('wide', '\n'.join(lines) + '\n')
+
+
+def default_sources(limit=None):
+    """Gets the corpus of the benchmarks."""
+    return stdlib_sources(limit) + [deep_source(), wide_source()]
+
+
+def _build_modules(sources):
+    """Builds the sources which the current rebuilder supports."""
+    modules = []
+    skipped = []
+    for source in sources:
+        try:
+            modules.append(builder.parse(source.code, source.name))
+        except (exceptions.AstroidError, RuntimeError, AttributeError):
+            # The rebuilder has no visitor for some newer ast classes,
+            # and deep sources can exceed the recursion limit.
+            skipped.append(source)
+    return modules, skipped
+
+
+def _benchmarks(sources, modules):
+    """Yields the benchmarks, as tuples of their name, the number of
+    operations they do, a function running them and a function
+    preparing each run, which isn't timed, or None.
+    """
+    codes = [(source.code, source.name) for source in sources]
+
+    def parse():
+        for code, name in codes:
+            builder.parse(code, name)
+    yield 'parse', len(codes), parse, None
+
+    def parse_fast():
+        for code, name in codes:
+            builder.parse(code, name,
+                          rebuilder_class=rebuilder.FastTreeRebuilder)
+    yield 'parse_fast', len(codes), parse_fast, None
+
+    # The building of the trees alone, without the parsing.  The
+    # rebuilder drops the docstrings from the ast trees, so each run
+    # rebuilds trees parsed again before it.
+    trees = []
+
+    def parse_trees():
+        trees[:] = [(builder._parse(code + '\n'), name)
+                    for code, name in codes]
+
+    def rebuild():
+        for tree, name in trees:
+            rebuilder.TreeRebuilder().visit_module(tree, name, '<?>', False)
+    yield 'rebuild', len(codes), rebuild, parse_trees
+
+    def rebuild_fast():
+        for tree, name in trees:
+            rebuilder.FastTreeRebuilder().visit_module(tree, name, '<?>',
+                                                       False)
+    yield 'rebuild_fast', len(codes), rebuild_fast, parse_trees
+
+    node_count = sum(1 for module in modules
+                     for _ in module.preorder_descendants())
+
+    def preorder_descendants():
+        for module in modules:
+            for _ in module.preorder_descendants():
+                pass
+    yield 'preorder_descendants', node_count, preorder_descendants, None
+
+    # The same walk with cursors instead of zippers, for the cost of a
+    # step of each.
+    def cursor_preorder_descendants():
+        for module in modules:
+            for _ in module.cursor().preorder_descendants():
+                pass
+    yield ('cursor_preorder_descendants', node_count,
+           cursor_preorder_descendants, None)
+
+    def find_descendants_of_type():
+        for module in modules:
+            for _ in module.find_descendants_of_type(nodes.Name):
+                pass
+    yield ('find_descendants_of_type', node_count, find_descendants_of_type,
+           None)
+
+    # A rarer type, for which most subtrees are skipped by their masks.
+    def find_rare_descendants_of_type():
+        for module in modules:
+            for _ in module.find_descendants_of_type(nodes.Global):
+                pass
+    yield ('find_rare_descendants_of_type', node_count,
+           find_rare_descendants_of_type, None)
+
+    names = [location for module in modules
+             for location in module.find_descendants_of_type(nodes.Name)]
+
+    def frame():
+        for location in names:
+            location.frame()
+    yield 'frame', len(names), frame, None
+
+    cursors = [location.cursor() for location in names]
+
+    def cursor_frame():
+        for location in cursors:
+            location.frame()
+    yield 'cursor_frame', len(cursors), cursor_frame, None
+
+    def scope():
+        for location in names:
+            location.scope()
+    yield 'scope', len(names), scope, None
+
+    def to_code():
+        for module in modules:
+            as_string.to_code(module)
+    yield 'to_code', len(modules), to_code, None
+
+    visitor = transforms.TransformVisitor()
+    visitor.register_transform(nodes.Name, lambda node: None)
+    visitor.register_transform(nodes.Call, lambda node: None)
+
+    def transform():
+        for module in modules:
+            visitor.visit(module.__wrapped__)
+    yield 'transform', len(modules), transform, None
+
+
+def _time(function, setup, repeat, number):
+    """Times *function* as :meth:`timeit.Timer.repeat` does, running
+    *setup*, if it isn't None, before each call, outside of the timings.
+    """
+    if setup is None:
+        return timeit.Timer(function).repeat(repeat, number)
+    times = []
+    for _ in range(repeat):
+        time = 0.0
+        for _ in range(number):
+            setup()
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                start = timeit.default_timer()
+                function()
+                time += timeit.default_timer() - start
+            finally:
+                if enabled:
+                    gc.enable()
+        times.append(time)
+    return times
+
+
+def _peak_memory(function, setup=None):
+    """Gets the peak memory allocated while running *function*, in bytes,
+    after running *setup*, if it isn't None."""
+    if tracemalloc is None:
+        return None
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _memory(sources):
+    """Measures the memory held by the trees built from *sources*."""
+    if tracemalloc is not None:
+        tracemalloc.start()
+    try:
+        modules = _build_modules(sources)[0]
+        if tracemalloc is not None:
+            retained = tracemalloc.get_traced_memory()[0]
+        else:
+            retained = None
+    finally:
+        if tracemalloc is not None:
+            tracemalloc.stop()
+    trees = [module.__wrapped__ for module in modules]
+    node_count = sum(manager.count_nodes(tree) for tree in trees)
+    size = sum(manager.estimate_size(tree) for tree in trees)
+    return collections.OrderedDict([
+        ('nodes', node_count),
+        ('estimated_size', size),
+        ('estimated_size_per_node', float(size) / max(node_count, 1)),
+        ('retained', retained),
+    ])
+
+
+def run(sources=None, repeat=5, number=1, names=None):
+    """Runs the benchmarks over *sources* and returns their results.
+
+    :param sources: The sources of the corpus, by default the ones of
+        :func:`default_sources`.
+    :param int repeat: The number of timed runs of each benchmark.
+    :param int number: The number of times a benchmark is run per timing.
+    :param names: The names of the benchmarks to run, by default all.
+    :returns: A dictionary, which can be dumped to JSON, with the times
+        of the runs in seconds, the best time per operation and the peak
+        memory in bytes of each benchmark, and the memory held by the
+        trees of the corpus, both as estimated by
+        :func:`astroid.manager.estimate_size` and as allocated while
+        building them.  Memory is None where it can't be measured.
+    """
+    if sources is None:
+        sources = default_sources()
+    modules, skipped = _build_modules(sources)
+    # The sources the rebuilder doesn't support aren't benchmarked.
+    sources = [source for source in sources if source not in skipped]
+    results = collections.OrderedDict()
+    for name, operations, function, setup in _benchmarks(sources, modules):
+        if names is not None and name not in names:
+            continue
+        times = _time(function, setup, repeat, number)
+        results[name] = collections.OrderedDict([
+            ('operations', operations),
+            ('times', times),
+            ('best_per_operation', min(times) / number / max(operations, 1)),
+            ('peak_memory', _peak_memory(function, setup)),
+        ])
+    return collections.OrderedDict([
+        ('astroid', __pkginfo__.version),
+        ('python', sys.version.split()[0]),
+        ('implementation', platform.python_implementation()),
+        ('corpus', collections.OrderedDict([
+            ('modules', [source.name for source in sources]),
+            ('skipped', [source.name for source in skipped]),
+        ])),
+        ('memory', _memory(sources)),
+        ('benchmarks', results),
+    ])
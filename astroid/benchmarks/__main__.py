@@ -0,0 +1,42 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""Runs the benchmarks and prints their results as JSON."""
+
+import argparse
+import json
+import sys
+
+from astroid import benchmarks
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m astroid.benchmarks',
+        description='Benchmark the hot paths of astroid.')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='the number of timed runs of each benchmark')
+    parser.add_argument('--number', type=int, default=1,
+                        help='the number of runs per timing')
+    parser.add_argument('--limit', type=int, default=None,
+                        help='the maximum number of modules of the '
+                             'standard library in the corpus')
+    parser.add_argument('--output', default=None,
+                        help='the file where to write the results, '
+                             'by default the standard output')
+    parser.add_argument('names', nargs='*',
+                        help='the benchmarks to run, by default all')
+    options = parser.parse_args(args)
+    results = benchmarks.run(benchmarks.default_sources(options.limit),
+                             repeat=options.repeat, number=options.number,
+                             names=options.names or None)
+    if options.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(options.output, 'w') as stream:
+            json.dump(results, stream, indent=2)
+
+
+if __name__ == '__main__':
+    main()
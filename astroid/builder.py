@@ -4,27 +4,72 @@
 """The AstroidBuilder makes astroid from living object and / or from _ast
 
 The builder is not thread safe and can't be used to parse different sources
-at the same time.
+at the same time.  Use :func:`parse_many` to build several sources in
+parallel, it distributes them over worker processes.  After an edit
+of a module's source, :func:`reparse` rebuilds only the statements
+affected by the edit.
 """
 
+import __future__
 import ast
+import codecs
+import functools
+import io
+import logging
+import multiprocessing
 import os
+import re
 import textwrap
+import tokenize
+
+import six
 
 from astroid import exceptions
+from astroid import nodes
+from astroid import positions
 from astroid import rebuilder
+from astroid import serialization
 from astroid import zipper
 from astroid import util
 
 
+_LOGGER = logging.getLogger(__name__)
+
+# The declaration of the encoding of a source file, from PEP 263.
+_ENCODING_RGX = re.compile(br'^[ \t\f]*#.*?coding[:=][ \t]*([-\w.]+)')
+
+
 def _parse(string):
     return compile(string, "<string>", 'exec', ast.PyCF_ONLY_AST)
 
 
-def _data_build(data, modname, path):
+def _share(module, interner, position_table, cons_table):
+    """Shares the values and subtrees of a module built or cached."""
+    if interner is not None:
+        interner.intern_tree(module)
+    if position_table or cons_table is not None:
+        positions.add_position_table(module)
+    if cons_table is not None:
+        cons_table.cons_tree(module)
+
+
+def _data_build(data, modname, path, cache=None, lazy=(),
+                rebuilder_class=None, interner=None, position_table=False,
+                cons_table=None):
     """Build tree node from data and add some informations"""
+    if cache is not None:
+        key = cache.key(data, modname, path)
+        module = cache.get(key)
+        if module is not None:
+            _share(module, interner, position_table, cons_table)
+            return module
     try:
-        node = _parse(data + '\n')
+        if isinstance(data, six.binary_type):
+            # The source of a file is compiled as it was read, so that
+            # compile() decodes it with the encoding it declares.
+            node = _parse(data)
+        else:
+            node = _parse(data + '\n')
     except (TypeError, ValueError, SyntaxError) as exc:
         util.reraise(exceptions.AstroidSyntaxError(
             'Parsing Python code failed:\n{error}',
@@ -38,20 +83,381 @@ def _data_build(data, modname, path):
         package = True
     else:
         package = path and path.find('__init__.py') > -1 or False
-    builder = rebuilder.TreeRebuilder()
+    if rebuilder_class is None:
+        rebuilder_class = rebuilder.TreeRebuilder
+    builder = rebuilder_class(lazy)
     module = builder.visit_module(node, modname, node_file, package)
+    if cache is not None:
+        # A module which can't be stored is logged by the cache and
+        # is only a miss the next time.
+        cache.set(key, module)
+    _share(module, interner, position_table, cons_table)
     return module
 
 
-def parse(code, module_name='', path=None):
+def parse(code, module_name='', path=None, cache=None, lazy=(),
+          rebuilder_class=None, interner=None, position_table=False,
+          cons_table=None):
     """Parses a source string in order to obtain an astroid AST from it
 
     :param str code: The code for the module.
     :param str module_name: The name for the module, if any
     :param str path: The path for the module
+    :param cache: A :class:`astroid.cache.ModuleCache` where the module
+        is looked up before building it, and stored after.
+    :param lazy: The classes, among :class:`nodes.FunctionDef` and
+        :class:`nodes.ClassDef`, whose bodies are built only when they
+        are first accessed.  A module stored in a cache is built
+        completely.
+    :param rebuilder_class: The class of the rebuilder turning the ast
+        into astroid nodes, by default :class:`rebuilder.TreeRebuilder`.
+        :class:`rebuilder.FastTreeRebuilder` builds the same trees faster.
+    :param interner: An :class:`astroid.interning.Interner` sharing the
+        constants, names and positions of the module with the modules
+        built before with it.
+    :param bool position_table: If true, the module is given a table of
+        the positions of its nodes, see
+        :func:`astroid.positions.add_position_table`.  Its lazy bodies
+        are then built.
+    :param cons_table: An :class:`astroid.hashconsing.ConsTable` sharing
+        the subtrees of the module identical to subtrees of the modules
+        built before with it.  The module is then given a position
+        table, which alone keeps the positions of its nodes.
     """
     code = textwrap.dedent(code)
-    module = _data_build(code, module_name, path)
+    module = _data_build(code, module_name, path, cache, lazy,
+                         rebuilder_class, interner, position_table,
+                         cons_table)
     module.source_code = code.encode('utf-8')
     module.file_encoding = 'utf-8'
     return zipper.Zipper(module)
+
+
+def _detect_encoding(data):
+    """Gets the encoding of the source *data*, following PEP 263."""
+    if six.PY3:
+        return tokenize.detect_encoding(io.BytesIO(data).readline)[0]
+    if data.startswith(codecs.BOM_UTF8):
+        return 'utf-8'
+    lines = io.BytesIO(data)
+    for _ in range(2):
+        line = lines.readline()
+        match = _ENCODING_RGX.match(line)
+        if match:
+            return match.group(1).decode('ascii')
+        if line.strip() and not line.lstrip().startswith(b'#'):
+            break
+    return 'ascii'
+
+
+def parse_file(path, module_name=None, cache=None, lazy=(),
+               rebuilder_class=None, interner=None, position_table=False,
+               cons_table=None):
+    """Parses a source file in order to obtain an astroid AST from it
+
+    The file is read once and its bytes are compiled as they are, with
+    the encoding they declare.  They are kept, without a copy, as the
+    source code of the module.
+
+    :param str path: The path of the file.
+    :param str module_name: The name for the module, by default the name
+        of the file without its extension.
+    :param cache: A :class:`astroid.cache.ModuleCache` where the module
+        is looked up before building it, and stored after.
+    :param lazy: The classes whose bodies are built lazily, as for
+        :func:`parse`.
+    :param rebuilder_class: The class of the rebuilder, as for :func:`parse`.
+    :param interner: The interner of the values of the module, as for
+        :func:`parse`.
+    :param bool position_table: Whether the module is given a table of
+        the positions of its nodes, as for :func:`parse`.
+    :param cons_table: The table sharing the subtrees of the module, as
+        for :func:`parse`.
+    """
+    with open(path, 'rb') as stream:
+        data = stream.read()
+    if module_name is None:
+        module_name = os.path.splitext(os.path.basename(path))[0]
+    module = _data_build(data, module_name, path, cache, lazy,
+                         rebuilder_class, interner, position_table,
+                         cons_table)
+    module.source_code = data
+    module.file_encoding = _detect_encoding(data)
+    return zipper.Zipper(module)
+
+
+def _build_source(source, cache=None):
+    """Build the module for one of the sources given to parse_many."""
+    if isinstance(source, six.string_types):
+        return parse_file(source, cache=cache).__wrapped__
+    return parse(*source, cache=cache).__wrapped__
+
+
+def _build_serialized_source(source, cache=None):
+    """Build a source in a worker process of parse_many.
+
+    The module is sent back to the main process in the format of
+    :mod:`astroid.serialization`, which is cheaper to transfer than a
+    pickle of the nodes.  A module which can't be serialized is built
+    again in the main process: the source is sent back instead.
+
+    :returns: A tuple of the serialized module and None, or of None and
+        the source.
+    """
+    module = _build_source(source, cache)
+    try:
+        return serialization.dumps(module), None
+    except exceptions.SerializationError as exc:
+        _LOGGER.warning('Could not send back the module of %r: %s',
+                        source, exc)
+        return None, source
+
+
+def parse_many(sources, workers=None, ordered=True, chunksize=1, cache=None):
+    """Parses several sources in parallel, using a pool of processes
+
+    :param sources: An iterable of sources, each one being either the
+        path of a file or a tuple with the arguments for :func:`parse`,
+        that is ``(code, module_name)`` or ``(code, module_name, path)``.
+    :param int workers: The number of worker processes, by default the
+        number of CPUs.  With one worker, the sources are parsed in the
+        current process.
+    :param bool ordered: If true, the results are produced in the order
+        of *sources*, otherwise they are produced as they are completed.
+    :param int chunksize: The number of sources sent to a worker at once.
+    :param cache: A :class:`astroid.cache.ModuleCache` shared by the workers.
+    :returns: An iterator over the zippers for the parsed modules.
+    :raises AstroidSyntaxError: when one of the sources can't be parsed,
+        at the moment its result would have been produced.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if workers == 1:
+        for source in sources:
+            yield zipper.Zipper(_build_source(source, cache))
+        return
+    build = functools.partial(_build_serialized_source, cache=cache)
+    pool = multiprocessing.Pool(workers)
+    try:
+        if ordered:
+            modules = pool.imap(build, sources, chunksize)
+        else:
+            modules = pool.imap_unordered(build, sources, chunksize)
+        for data, source in modules:
+            if data is None:
+                yield zipper.Zipper(_build_source(source, cache))
+            else:
+                yield zipper.Zipper(serialization.loads(data))
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+class _ReparseFailed(Exception):
+    """The statements at one level can't be rebuilt on their own."""
+
+
+def _first_line(statement):
+    decorators = getattr(statement, 'decorators', None)
+    if decorators and statement.lineno is not None:
+        return min(statement.lineno, decorators.lineno)
+    return statement.lineno
+
+
+def _is_future_import(statement):
+    if isinstance(statement, ast.ImportFrom):
+        return statement.module == '__future__'
+    return (isinstance(statement, nodes.ImportFrom)
+            and statement.modname == '__future__')
+
+
+def _starts_line(statement, lines):
+    """Checks that nothing precedes *statement* on its first line."""
+    line = lines[_first_line(statement) - 1]
+    return not line[:statement.col_offset].strip()
+
+
+def _shift_lines(node, delta):
+    """Copies the tree rooted at *node*, moved *delta* lines down."""
+    if not delta:
+        return node
+    # The tree is copied in postfix order, with an explicit stack for
+    # the copies of the children, so that deep trees don't overflow
+    # the call stack.
+    copies = []
+    to_visit = [(node, False)]
+    while to_visit:
+        value, visited = to_visit.pop()
+        if value is nodes.Empty or not isinstance(value, (nodes.BaseNode,
+                                                          list, tuple)):
+            copies.append(value)
+        elif not visited:
+            to_visit.append((value, True))
+            to_visit.extend((child, False) for child in reversed(tuple(value)))
+        else:
+            count = len(tuple(value))
+            children = copies[len(copies) - count:]
+            del copies[len(copies) - count:]
+            if isinstance(value, nodes.BaseNode):
+                fields = dict(zip(value._astroid_fields, children))
+                if value.lineno is not None:
+                    fields['lineno'] = value.lineno + delta
+                copies.append(value.copy(**fields))
+            else:
+                copies.append(type(value)(children))
+    return copies[0]
+
+
+def _affected_statements(body, start_line, end_line):
+    """Finds the statements of *body* spanning the given lines.
+
+    A statement is considered to span the lines up to the first line of
+    the next one, so comments and blank lines belong to the statement
+    before them.  Statements sharing a line are affected together.
+
+    :returns: The bounds of the slice of the affected statements and
+        the first lines of all the statements.
+    """
+    lines = [_first_line(statement) for statement in body]
+    if None in lines:
+        # Statements without positions, which can't be located.
+        raise _ReparseFailed()
+    first = last = None
+    for index, line in enumerate(lines):
+        if line <= start_line and (first is None or line != lines[first]):
+            first = index
+        if line <= end_line:
+            last = index
+    if first is None:
+        raise _ReparseFailed()
+    return first, last + 1, lines
+
+
+def _build_statements(owner, first, new_lines, first_line, last_line, flags):
+    """Builds the ast statements in the given lines of the new source.
+
+    They replace the statements of *owner*'s body starting at index *first*.
+    """
+    segment = ''.join(new_lines[first_line - 1:last_line])
+    nested = not isinstance(owner, nodes.Module)
+    if nested:
+        # The statements of a nested body are indented, they are
+        # parsed in the body of a dummy compound statement.
+        segment = 'if 1:\n' + segment
+    try:
+        tree = compile(segment, '<string>', 'exec', flags)
+    except (TypeError, ValueError, SyntaxError):
+        raise _ReparseFailed()
+    if nested:
+        if len(tree.body) != 1:
+            # Some statement was dedented out of the body.
+            raise _ReparseFailed()
+        statements = tree.body[0].body
+        ast.increment_lineno(tree, first_line - 2)
+    else:
+        statements = tree.body
+        ast.increment_lineno(tree, first_line - 1)
+    if any(_is_future_import(statement) for statement in statements):
+        raise _ReparseFailed()
+    if statements and statements[0].col_offset != owner.body[first].col_offset:
+        # The statements aren't aligned with the rest of the body.
+        raise _ReparseFailed()
+    if (statements and first == 0 and owner.doc is None
+            and isinstance(statements[0], ast.Expr)
+            and isinstance(statements[0].value, ast.Str)):
+        # The string would become a docstring.
+        raise _ReparseFailed()
+    return statements
+
+
+def reparse(module, old_code, new_code, start_line, end_line):
+    """Rebuilds a module after an edit of its source
+
+    Only the statements spanning the edited lines are built again, in
+    the body of the innermost function or class containing the edit.
+    The other nodes of *module* are reused, except that the ones after
+    the edit are copied with new line numbers if the edit added or
+    removed lines.  The whole module is parsed again when the edit
+    can't be isolated, for instance when it changes the structure of
+    the enclosing statements, and when *module* has a position table,
+    since its nodes may have no positions of their own; the new module
+    is then given a position table too.
+
+    :param module: The module built from *old_code*.
+    :param str old_code: The source of the module before the edit.
+    :param str new_code: The source of the module after the edit.
+    :param int start_line: The first line of *old_code* changed by the edit.
+    :param int end_line: The last line of *old_code* changed by the edit.
+        The lines from *start_line* to *end_line* are replaced in
+        *new_code* by as many lines, plus the number of lines added.
+    :returns: A zipper for the new module.
+    """
+    module = getattr(module, '__wrapped__', module)
+    # The sources are normalized as they are by parse().
+    old_code = textwrap.dedent(old_code)
+    new_code = textwrap.dedent(new_code)
+    old_lines = old_code.splitlines(True)
+    new_lines = new_code.splitlines(True)
+    delta = len(new_lines) - len(old_lines)
+    table = module.position_table
+    try:
+        if (table is not None or start_line < 1 or end_line < start_line
+                or old_lines[:start_line - 1] != new_lines[:start_line - 1]
+                or old_lines[end_line:] != new_lines[end_line + delta:]):
+            raise _ReparseFailed()
+        flags = ast.PyCF_ONLY_AST
+        for name in module.future_imports:
+            flags |= getattr(__future__, name).compiler_flag
+        node = _reparse_body(module, len(old_lines), old_lines, new_lines,
+                             start_line, end_line, delta, flags)
+    except _ReparseFailed:
+        modname = module.name
+        if module.package and not modname.endswith('.__init__'):
+            modname += '.__init__'
+        path = module.source_file if module.source_file != '<?>' else None
+        return parse(new_code, modname, path,
+                     position_table=table is not None)
+    node.source_code = new_code.encode('utf-8')
+    node.file_encoding = 'utf-8'
+    return zipper.Zipper(node)
+
+
+def _reparse_body(owner, end, old_lines, new_lines, start_line, end_line,
+                  delta, flags):
+    """Rebuilds *owner* with the statements affected by an edit rebuilt.
+
+    *end* is the last line spanned by *owner*.  If a single function or
+    class of its body contains the edit, the edit is first tried in the
+    body of that statement.
+    """
+    # pylint: disable=too-many-arguments
+    first, last, lines = _affected_statements(owner.body, start_line,
+                                              end_line)
+    if last < len(lines):
+        end = lines[last] - 1
+    if any(_is_future_import(statement)
+           for statement in owner.body[first:last]):
+        raise _ReparseFailed()
+    statement = owner.body[first]
+    replacement = None
+    if (last - first == 1
+            and isinstance(statement, (nodes.FunctionDef, nodes.ClassDef))
+            and statement.body
+            and start_line >= _first_line(statement.body[0])
+            and _starts_line(statement.body[0], old_lines)):
+        try:
+            replacement = [_reparse_body(statement, end, old_lines, new_lines,
+                                         start_line, end_line, delta, flags)]
+        except _ReparseFailed:
+            pass
+    if replacement is None:
+        statements = _build_statements(owner, first, new_lines, lines[first],
+                                       end + delta, flags)
+        tree_builder = rebuilder.TreeRebuilder()
+        if isinstance(owner, nodes.FunctionDef):
+            tree_builder._global_names.append({})
+        replacement = [tree_builder.visit(s) for s in statements]
+    body = (list(owner.body[:first]) + replacement
+            + [_shift_lines(s, delta) for s in owner.body[last:]])
+    return owner.copy(body=type(owner.body)(body))
@@ -0,0 +1,109 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""A persistent cache for the modules built from source code.
+
+Entries are addressed by a hash of everything that determines the
+tree built for a source: its text, the name and the path of the
+module, the version of astroid, the version of the serialization
+format and the version of Python.  A cached
+module can thus be reused as long as its source is unchanged, without
+compiling it or rebuilding it.
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+
+import six
+
+from astroid import __pkginfo__
+from astroid import exceptions
+from astroid import serialization
+
+
+_replace = getattr(os, 'replace', os.rename)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ModuleCache(object):
+    """Stores built modules as files in a directory.
+
+    The modules are stored in the format of :mod:`astroid.serialization`.
+
+    The cache is safe to share between processes: entries are
+    written to temporary files which are then renamed, so readers see
+    either a complete entry or no entry at all.  An entry which can't
+    be serialized or written, as in a read-only directory or on a full
+    disk, is only missing from the cache afterwards.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    @staticmethod
+    def key(code, modname, path):
+        """Get the key under which the module built from *code* is stored."""
+        if isinstance(code, six.text_type):
+            code = code.encode('utf-8')
+        digest = hashlib.sha1()
+        for part in (__pkginfo__.version, serialization.VERSION,
+                     sys.version, modname, path):
+            digest.update(repr(part).encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(code)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def get(self, key):
+        """Get the module stored under *key*, or None if there is none."""
+        try:
+            stream = open(self._path(key), 'rb')
+        except (IOError, OSError):
+            return None
+        with stream:
+            try:
+                return serialization.loads(stream.read())
+            except exceptions.SerializationError:
+                # A corrupted or stale entry is only a cache miss.
+                return None
+
+    def set(self, key, module):
+        """Store *module* under *key*.
+
+        The errors of the serialization and of the file system are
+        logged rather than raised.
+        """
+        try:
+            self._write(self._path(key), serialization.dumps(module))
+        except (exceptions.SerializationError, IOError, OSError) as exc:
+            _LOGGER.warning('Could not write the cache entry %s: %s', key, exc)
+
+    @staticmethod
+    def _write(path, data):
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+        fd, temporary = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                stream.write(data)
+            _replace(temporary, path)
+        except Exception:
+            os.remove(temporary)
+            raise
+
+    def clear(self):
+        """Remove all the entries of the cache."""
+        for directory, _, names in os.walk(self.directory):
+            for name in names:
+                os.remove(os.path.join(directory, name))
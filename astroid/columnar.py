@@ -0,0 +1,412 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""A columnar encoding of trees, with a column of integers per attribute.
+
+A :class:`ColumnarModule` holds a tree as a few arrays of machine
+integers, instead of as one Python object per node.  The nodes, and
+the sequences holding them, are numbered in the prefix order in which
+zippers walk the tree, and the arrays give for each of them its kind,
+its parent, its first child, its next sibling, its depth and its
+position.  The values of the fields which aren't nodes are kept in
+side tables, the identifiers apart, so that they can be compared by
+index.
+
+The arrays are NumPy arrays when NumPy is installed, which makes
+statistics over a whole corpus cheap, and :mod:`array` arrays
+otherwise.  A :class:`ColumnarCursor` walks an encoded tree without
+building its nodes, and :meth:`ColumnarModule.to_module` builds them
+back.
+"""
+
+import array
+import collections
+import sys
+
+import six
+
+from astroid import base
+from astroid import nodes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+#: The kinds of the items of encoded trees: the sequences of nodes,
+#: Empty, and the classes of the nodes.  The kind of an item is its
+#: index in this tuple, the same for all trees.
+KINDS = (list, tuple, type(base.Empty)) + tuple(sorted(
+    (cls for cls in nodes.ALL_NODE_CLASSES
+     if isinstance(cls, type) and cls is not base.BaseNode),
+    key=lambda cls: cls.__name__))
+KIND_IDS = {cls: kind for kind, cls in enumerate(KINDS)}
+
+_LIST, _TUPLE, _EMPTY = range(3)
+
+#: The fields holding the identifiers of nodes.
+IDENTIFIER_FIELDS = ('name', 'attrname', 'arg', 'modname')
+
+# The value standing for a missing index or position in the columns.
+_MISSING = -1
+
+COLUMNS = ('kind', 'parent', 'first_child', 'next_sibling', 'depth',
+           'lineno', 'col_offset', 'name', 'value')
+# The type codes of the columns, for array.array and NumPy: there are
+# fewer than 256 kinds and trees deeper than 65535 can't be built.
+_TYPECODES = {'kind': 'B', 'depth': 'H'}
+
+
+def _value_key(value):
+    """Gets a key telling apart the values which aren't the same,
+    or None if *value* can't be shared."""
+    if isinstance(value, (list, dict, set)):
+        return None
+    if isinstance(value, tuple):
+        keys = tuple(_value_key(element) for element in value)
+        if None in keys:
+            return None
+        return (tuple, keys)
+    if isinstance(value, (float, complex)):
+        # 0.0 and -0.0 are equal, but not the same.
+        return (value.__class__, repr(value))
+    return (value.__class__, value)
+
+
+def _identifier(node):
+    for field in IDENTIFIER_FIELDS:
+        value = getattr(node, field, None)
+        if isinstance(value, six.string_types):
+            return value
+    return None
+
+
+def _to_array(column):
+    if numpy is None:
+        return column
+    return numpy.frombuffer(column, dtype=column.typecode)
+
+
+class ColumnarModule(object):
+    """A tree encoded as columns of integers, see the module docstring.
+
+    Attributes:
+        kind, parent, first_child, next_sibling, depth, lineno,
+        col_offset: The columns, indexed by the number of an item.
+            Missing indices and positions are -1.  The kind is the
+            index of the class of the item in :data:`KINDS`.
+        name: The index of the identifier of each node in *names*,
+            like the name of a Name or the attrname of an Attribute.
+        value: The index of the values of the other fields of each
+            node in *values*.
+        names: The identifiers of the nodes, without duplicates.
+        values: The values of the other fields of the nodes, without
+            duplicates when they can be compared.  They are tuples for
+            the classes with several other fields.
+    """
+
+    __slots__ = COLUMNS + ('names', 'values', '_name_ids')
+
+    def __init__(self, columns, names, values):
+        for field, column in zip(COLUMNS, columns):
+            setattr(self, field, column)
+        self.names = names
+        self.values = values
+        self._name_ids = None
+
+    def name_id(self, name):
+        """Gets the index of the identifier *name* in *names*, or -1."""
+        if self._name_ids is None:
+            self._name_ids = {value: index
+                              for index, value in enumerate(self.names)}
+        return self._name_ids.get(name, _MISSING)
+
+    def __len__(self):
+        return len(self.kind)
+
+    @classmethod
+    def from_module(cls, module):
+        """Encodes the tree rooted at *module*, which doesn't have to be
+        a module.
+
+        Lazy bodies are built.  Private attributes, like the position
+        table of a module, aren't kept.
+        """
+        columns = [array.array(_TYPECODES.get(field, 'i'))
+                   for field in COLUMNS]
+        (kinds, parents, first_children, next_siblings, depths, linenos,
+         col_offsets, name_indices, value_indices) = columns
+        names, name_ids = [], {}
+        values, value_ids = [], {}
+        last_children = []
+        to_visit = [(module, _MISSING, 0)]
+        while to_visit:
+            item, parent, depth = to_visit.pop()
+            index = len(kinds)
+            try:
+                kinds.append(KIND_IDS[item.__class__])
+            except KeyError:
+                raise TypeError('Cannot encode {0!r}.'.format(item))
+            parents.append(parent)
+            first_children.append(_MISSING)
+            next_siblings.append(_MISSING)
+            last_children.append(_MISSING)
+            depths.append(depth)
+            if parent != _MISSING:
+                if last_children[parent] == _MISSING:
+                    first_children[parent] = index
+                else:
+                    next_siblings[last_children[parent]] = index
+                last_children[parent] = index
+            if isinstance(item, (list, tuple)):
+                children = item
+                linenos.append(_MISSING)
+                col_offsets.append(_MISSING)
+                name_indices.append(_MISSING)
+                value_indices.append(_MISSING)
+            else:
+                children = list(item)
+                for column, field in ((linenos, 'lineno'),
+                                      (col_offsets, 'col_offset')):
+                    position = getattr(item, field)
+                    column.append(_MISSING if position is None else position)
+                identifier = _identifier(item)
+                if identifier is None:
+                    name_indices.append(_MISSING)
+                else:
+                    name_indices.append(name_ids.setdefault(identifier,
+                                                            len(names)))
+                    if name_indices[-1] == len(names):
+                        names.append(identifier)
+                if item._other_fields:
+                    if len(item._other_fields) == 1:
+                        fields = getattr(item, item._other_fields[0])
+                    else:
+                        fields = tuple(getattr(item, field)
+                                       for field in item._other_fields)
+                    key = _value_key(fields)
+                    if key is None:
+                        value_indices.append(len(values))
+                        values.append(fields)
+                    else:
+                        value_indices.append(value_ids.setdefault(
+                            key, len(values)))
+                        if value_indices[-1] == len(values):
+                            values.append(fields)
+                else:
+                    value_indices.append(_MISSING)
+            for child in reversed(children):
+                to_visit.append((child, index, depth + 1))
+        return cls([_to_array(column) for column in columns], names, values)
+
+    def _children(self, index):
+        child = int(self.first_child[index])
+        while child != _MISSING:
+            yield child
+            child = int(self.next_sibling[child])
+
+    def end(self, index):
+        """Gets the number following the last descendant of an item.
+
+        It's the next sibling of the item, or of its nearest ancestor
+        which has one, so this takes time linear in the depth of the
+        item.
+        """
+        parent, next_sibling = self.parent, self.next_sibling
+        while index != _MISSING:
+            sibling = int(next_sibling[index])
+            if sibling != _MISSING:
+                return sibling
+            index = int(parent[index])
+        return len(self.kind)
+
+    def to_module(self, index=0):
+        """Builds back the nodes of the tree rooted at the item *index*."""
+        built = {}
+        kinds, linenos, col_offsets = self.kind, self.lineno, self.col_offset
+        for item in range(self.end(index) - 1, index - 1, -1):
+            kind = int(kinds[item])
+            children = [built.pop(child) for child in self._children(item)]
+            if kind == _LIST:
+                built[item] = children
+            elif kind == _TUPLE:
+                built[item] = tuple(children)
+            elif kind == _EMPTY:
+                built[item] = base.Empty
+            else:
+                cls = KINDS[kind]
+                node = cls.__new__(cls)
+                lineno, col_offset = int(linenos[item]), int(col_offsets[item])
+                node.lineno = None if lineno == _MISSING else lineno
+                node.col_offset = None if col_offset == _MISSING else col_offset
+                for field, child in zip(cls._astroid_fields, children):
+                    setattr(node, field, child)
+                if cls._other_fields:
+                    values = self.values[int(self.value[item])]
+                    if len(cls._other_fields) == 1:
+                        values = (values,)
+                    for field, value in zip(cls._other_fields, values):
+                        if isinstance(value, list):
+                            # Lists aren't shared between the trees built.
+                            value = list(value)
+                        setattr(node, field, value)
+                built[item] = node
+        return built[index]
+
+    def nbytes(self):
+        """Estimates the memory used by the encoding, in bytes.
+
+        This is the size of the columns and of the side tables, but not
+        of the values in them.
+        """
+        size = 0
+        for field in COLUMNS:
+            column = getattr(self, field)
+            size += len(column) * column.itemsize
+        for table in (self.names, self.values):
+            size += sys.getsizeof(table)
+        size += sum(sys.getsizeof(values) for values in self.values
+                    if isinstance(values, tuple))
+        return size
+
+    def count_kinds(self):
+        """Counts the items of each kind, as a mapping from their class."""
+        if numpy is not None:
+            counts = numpy.bincount(self.kind, minlength=len(KINDS))
+            return {KINDS[kind]: int(count)
+                    for kind, count in enumerate(counts) if count}
+        counts = collections.Counter(self.kind)
+        return {KINDS[kind]: count for kind, count in counts.items()}
+
+    def cursor(self, index=0):
+        """Gets a cursor on the item *index*, by default the root."""
+        return ColumnarCursor(self, index)
+
+
+class ColumnarCursor(object):
+    """A read-only cursor on an item of a :class:`ColumnarModule`.
+
+    It walks the tree like a :class:`astroid.zipper.Zipper`, returning
+    None when a move isn't possible, without building the nodes.  The
+    class of the node at its focus is its :attr:`node_class`.  The
+    fields of the node which aren't nodes and its positions are read as
+    attributes, while its children are reached by moving the cursor;
+    :attr:`node` builds the node.
+    """
+
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree, index=0):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def node_class(self):
+        """The class of the node, or of the sequence, at the focus."""
+        return KINDS[self.tree.kind[self.index]]
+
+    def __eq__(self, other):
+        return (type(other) is ColumnarCursor and self.tree is other.tree
+                and self.index == other.index)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self):
+        return '<ColumnarCursor at {0} for {1}>'.format(
+            self.index, KINDS[self.tree.kind[self.index]].__name__)
+
+    def __getattr__(self, name):
+        tree, index = self.tree, self.index
+        cls = KINDS[tree.kind[index]]
+        if name in ('lineno', 'col_offset') and issubclass(cls, base.BaseNode):
+            value = int(getattr(tree, name)[index])
+            return None if value == _MISSING else value
+        fields = getattr(cls, '_other_fields', ())
+        if name in fields:
+            values = tree.values[tree.value[index]]
+            if len(fields) == 1:
+                return values
+            return values[fields.index(name)]
+        raise AttributeError(name)
+
+    @property
+    def node(self):
+        """Builds the node, or the sequence, at the focus."""
+        return self.tree.to_module(self.index)
+
+    def _move(self, column):
+        index = int(getattr(self.tree, column)[self.index])
+        if index == _MISSING:
+            return None
+        return ColumnarCursor(self.tree, index)
+
+    def down(self):
+        '''Go to the leftmost child of the focus.'''
+        return self._move('first_child')
+
+    def right(self):
+        '''Go to the sibling directly to the right of the focus.'''
+        return self._move('next_sibling')
+
+    def up(self):
+        '''Go to the parent of the focus.'''
+        return self._move('parent')
+
+    def left(self):
+        '''Go to the sibling directly to the left of the focus.
+
+        This takes time linear in the number of left siblings.
+        '''
+        parent = int(self.tree.parent[self.index])
+        if parent == _MISSING:
+            return None
+        previous = None
+        for child in self.tree._children(parent):
+            if child == self.index:
+                break
+            previous = child
+        if previous is None:
+            return None
+        return ColumnarCursor(self.tree, previous)
+
+    def root(self):
+        '''Go to the root of the tree.'''
+        return ColumnarCursor(self.tree, 0)
+
+    def children(self):
+        '''Iterates over the children of the focus.'''
+        for child in self.tree._children(self.index):
+            yield ColumnarCursor(self.tree, child)
+
+    def preorder_descendants(self, dont_recurse_on=None):
+        '''Iterates over the descendants of the focus in prefix order.
+
+        Arguments:
+            dont_recurse_on (base.BaseNode): If not None, will not include nodes
+                of this type or types or any of the descendants of those nodes.
+        '''
+        tree = self.tree
+        # The descendants of an item follow it in the columns.
+        index, end = self.index, tree.end(self.index)
+        while index < end:
+            cursor = ColumnarCursor(tree, index)
+            if (dont_recurse_on is not None and index != self.index
+                    and issubclass(KINDS[tree.kind[index]], dont_recurse_on)):
+                index = tree.end(index)
+                continue
+            yield cursor
+            index += 1
+
+    def find_descendants_of_type(self, cls, skip_class=None):
+        '''Iterates over the descendants of the focus of a given type in
+        prefix order.'''
+        return (cursor for cursor in self.preorder_descendants(skip_class)
+                if issubclass(KINDS[self.tree.kind[cursor.index]], cls))
+
+    def nodes_of_class(self, cls, skip_class=None):
+        return self.find_descendants_of_type(cls, skip_class)
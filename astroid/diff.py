@@ -0,0 +1,120 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""Structural differences between two trees of the same module.
+
+:func:`diff_modules` finds the smallest subtrees which changed between
+two builds of a module, for instance to lint again only the functions
+which changed.  The trees are compared by the structural hashes of
+their subtrees, see :attr:`astroid.base.BaseNode.structural_hash`, so
+an identical region is skipped in constant time once its hash is
+known, and a region shared by both trees, as after
+:func:`astroid.builder.reparse`, is skipped without hashing it.  The
+positions of the nodes are ignored: a statement which only moved to
+other lines didn't change.
+
+The trees are walked with an explicit stack, so deep trees don't
+overflow the call stack.
+"""
+
+import collections
+import difflib
+
+from astroid import base
+from astroid import zipper
+
+
+INSERTED = 'inserted'
+DELETED = 'deleted'
+MODIFIED = 'modified'
+
+#: A change between the two trees.  *kind* is one of INSERTED, DELETED
+#: and MODIFIED, *old* and *new* are zippers for the subtree in the old
+#: and the new tree, None for an inserted or a deleted subtree.
+Change = collections.namedtuple('Change', 'kind old new')
+
+
+def _hash(value):
+    if isinstance(value, base.BaseNode):
+        return value.structural_hash
+    return base._hash_tree(value)
+
+
+def _same_values(old, new):
+    """Checks that two nodes of the same class have the same values in
+    their fields which aren't nodes."""
+    for field in old._other_fields:
+        old_value, new_value = getattr(old, field), getattr(new, field)
+        if old_value.__class__ is not new_value.__class__:
+            return False
+        if old_value != new_value:
+            return False
+    return True
+
+
+def _compare(old, new):
+    """Compares the foci of two zippers, returning the changes and the
+    pairs of zippers to compare further, in the order of the trees."""
+    old_value, new_value = old.__wrapped__, new.__wrapped__
+    if old_value is new_value:
+        return ()
+    old_node = isinstance(old_value, base.BaseNode)
+    new_node = isinstance(new_value, base.BaseNode)
+    if not old_node and not new_node:
+        return _compare_sequences(old, new)
+    if (not old_node or not new_node
+            or old_value.__class__ is not new_value.__class__
+            or not _same_values(old_value, new_value)):
+        return (Change(MODIFIED, old, new),)
+    if _hash(old_value) == _hash(new_value):
+        return ()
+    return list(zip(old.children(), new.children()))
+
+
+def _compare_sequences(old, new):
+    """Aligns the elements of two sequences of nodes by their hashes.
+
+    The elements which are neither in both sequences nor at the same
+    place in a replaced run are inserted or deleted.
+    """
+    old_children = list(old.children())
+    new_children = list(new.children())
+    matcher = difflib.SequenceMatcher(
+        None, [_hash(child.__wrapped__) for child in old_children],
+        [_hash(child.__wrapped__) for child in new_children],
+        autojunk=False)
+    result = []
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        paired = min(old_end - old_start, new_end - new_start)
+        result.extend(zip(old_children[old_start:old_start + paired],
+                          new_children[new_start:new_start + paired]))
+        result.extend(Change(DELETED, child, None) for child
+                      in old_children[old_start + paired:old_end])
+        result.extend(Change(INSERTED, None, child) for child
+                      in new_children[new_start + paired:new_end])
+    return result
+
+
+def diff_modules(old, new):
+    """Finds the changed subtrees between two trees of a module.
+
+    The fields of the modules themselves, like their source code, are
+    ignored, only their bodies are compared.
+
+    :param old: The old module, or a zipper for it.
+    :param new: The new module, or a zipper for it.
+    :returns: A list of :class:`Change`, in the order of the trees.
+    """
+    old = zipper.Zipper(getattr(old, '__wrapped__', old))
+    new = zipper.Zipper(getattr(new, '__wrapped__', new))
+    changes = []
+    to_compare = list(reversed(list(zip(old.children(), new.children()))))
+    while to_compare:
+        item = to_compare.pop()
+        if isinstance(item, Change):
+            changes.append(item)
+        else:
+            to_compare.extend(reversed(_compare(*item)))
+    return changes
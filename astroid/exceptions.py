@@ -77,6 +77,15 @@ class NoDefault(AstroidError):
         super(NoDefault, self).__init__(message, **kws)
 
 
+class SerializationError(AstroidError):
+    """Exception raised when a tree can't be encoded or decoded.
+
+    The standard attributes depend on the failure, for instance value
+    is the object which couldn't be encoded and version is the
+    unsupported version of the format of some encoded data.
+    """
+
+
 class NotSupportedError(AstroidError):
     """Exception raised whenever a capability is accessed on a node
     which doesn't provide it.
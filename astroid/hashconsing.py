@@ -0,0 +1,133 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""Sharing of the identical subtrees of the trees of modules.
+
+Generated code and vendored copies of libraries repeat the same
+statements and expressions many times, in one module or across
+modules.  A :class:`ConsTable` keeps a canonical copy of every subtree
+it's given and replaces the identical subtrees of the modules by it,
+so that a single object is kept in memory for all of them.
+
+A shared subtree is found at several places, so its nodes can't hold
+their positions: the modules given to a table must have a position
+table, see :func:`astroid.positions.add_position_table`, from which the
+zippers get the positions of the nodes.  Once shared, the nodes must
+not be changed in place, they're edited through zippers or
+transformed by :class:`astroid.transforms.TransformVisitor`, which
+copy them.  The copies don't inherit the structural hashes cached on
+the nodes they're made from.
+"""
+
+import collections
+
+from astroid import base
+from astroid import interning
+
+
+class ConsTable(object):
+    """Keeps a canonical copy of the subtrees of trees.
+
+    The same table is meant to be used for all the modules built in a
+    process, see the *cons_table* parameter of
+    :func:`astroid.builder.parse`.  It keeps the canonical subtrees
+    alive until it's cleared.
+
+    Two subtrees are identical when their nodes are of the same classes
+    and have identical fields but for their positions.  The values of
+    the fields are compared as by :class:`astroid.interning.Interner`,
+    so that for instance 1 and 1.0 aren't confused.
+    """
+
+    def __init__(self):
+        self._interner = interning.Interner()
+        # The canonical nodes and sequences, by the class of the node
+        # and the identities of its canonical values and children.
+        self._subtrees = {}
+        self.lookups = 0
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._subtrees)
+
+    def cons_tree(self, module):
+        """Replaces the subtrees of *module* by their canonical copies.
+
+        The positions of the nodes of *module*, but the module itself,
+        are cleared.
+
+        :raises ValueError: if *module* has no position table.
+        """
+        # pylint: disable=too-many-branches; the loop is inlined for speed
+        if module.position_table is None:
+            raise ValueError('The module {0} has no position table.'
+                             .format(module.name))
+        intern = self._interner.intern
+        subtrees = self._subtrees
+        lookups = hits = 0
+        # The tree is walked in postfix order, with an explicit stack
+        # for the canonical copies of the children.
+        canonicals = []
+        to_visit = [(value, False) for value in reversed(tuple(module))]
+        while to_visit:
+            value, visited = to_visit.pop()
+            if not visited:
+                if (value is base.Empty or
+                        not isinstance(value, (base.BaseNode, tuple))):
+                    canonicals.append(value)
+                else:
+                    to_visit.append((value, True))
+                    to_visit.extend((child, False)
+                                    for child in reversed(tuple(value)))
+                continue
+            if isinstance(value, base.BaseNode):
+                count = len(value._astroid_fields)
+            else:
+                count = len(value)
+            children = canonicals[len(canonicals) - count:]
+            del canonicals[len(canonicals) - count:]
+            if isinstance(value, base.BaseNode):
+                values = [intern(getattr(value, field))
+                          for field in value._other_fields]
+                key = (value.__class__, tuple([id(v) for v in values]),
+                       tuple([id(child) for child in children]))
+            else:
+                key = (tuple, tuple([id(child) for child in children]))
+            lookups += 1
+            canonical = subtrees.get(key)
+            if canonical is not None:
+                hits += 1
+            elif isinstance(value, base.BaseNode):
+                # The node becomes the canonical copy.
+                value.lineno = value.col_offset = value.end_lineno = None
+                for field, child in zip(value._other_fields, values):
+                    setattr(value, field, child)
+                for field, child in zip(value._astroid_fields, children):
+                    if getattr(value, field) is not child:
+                        setattr(value, field, child)
+                canonical = subtrees[key] = value
+            elif all(child is old for child, old in zip(children, value)):
+                canonical = subtrees[key] = value
+            else:
+                canonical = subtrees[key] = tuple(children)
+            canonicals.append(canonical)
+        for field, child in zip(module._astroid_fields, canonicals):
+            setattr(module, field, child)
+        self.lookups += lookups
+        self.hits += hits
+
+    def report(self):
+        """Gets the numbers of distinct subtrees kept, of subtrees looked
+        up and of subtrees replaced by a canonical copy.
+        """
+        return collections.OrderedDict([
+            ('subtrees', len(self)),
+            ('lookups', self.lookups),
+            ('hits', self.hits),
+        ])
+
+    def clear(self):
+        """Forgets the canonical subtrees, letting them be freed."""
+        self._subtrees.clear()
+        self._interner.clear()
+        self.lookups = self.hits = 0
@@ -0,0 +1,165 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""Sharing of the immutable values held by the trees of modules.
+
+Trees built from different modules, and even the nodes of a single
+tree, hold many equal but distinct values: string and number
+constants, line numbers and column offsets, the names of imports.  An
+:class:`Interner` replaces each of these values by a canonical copy,
+so that a single object is kept in memory for all the equal ones.
+"""
+
+import collections
+import functools
+import sys
+
+import six
+
+from astroid import base
+from astroid import node_classes
+
+
+# The classes of the values which are shared.  Tuples are shared once
+# their elements are.
+_SHARED_CLASSES = frozenset(
+    (six.text_type, six.binary_type, float, complex, frozenset)
+    + six.integer_types)
+
+_POSITIONS = ('lineno', 'col_offset')
+
+
+class Interner(object):
+    """Keeps a canonical copy of the immutable values of trees.
+
+    The same interner is meant to be used for all the modules built in
+    a process, see the *interner* parameter of
+    :func:`astroid.builder.parse`.  It keeps the canonical values alive
+    until it's cleared.
+    """
+
+    def __init__(self):
+        self._values = collections.defaultdict(dict)
+        self.lookups = 0
+        self.hits = 0
+        self.bytes_saved = 0
+
+    def __len__(self):
+        return sum(len(values) for values in self._values.values())
+
+    def intern(self, value):
+        """Gets the canonical copy of *value*.
+
+        Values which aren't immutable are returned unchanged.
+        """
+        cls = value.__class__
+        if cls is tuple:
+            value = tuple([self.intern(element) for element in value])
+            # The elements are canonical now, so their identities are
+            # enough to tell equal tuples, without confusing 0.0 and -0.0.
+            key = tuple([id(element) for element in value])
+        elif cls is float or cls is complex:
+            key = repr(value)
+        elif cls in _SHARED_CLASSES:
+            key = value
+        else:
+            return value
+        self.lookups += 1
+        # A table per class, since values of different classes can be
+        # equal, like 1 and 1.0.
+        canonical = self._values[cls].setdefault(key, value)
+        if canonical is not value:
+            self.hits += 1
+            self.bytes_saved += sys.getsizeof(value)
+        return canonical
+
+    def intern_tree(self, node):
+        """Replaces the values held by the tree rooted at *node* by their
+        canonical copies.
+
+        The fields of modules, their source code among others, are left
+        as they are.  Bodies which weren't built yet are interned when
+        they are built.
+        """
+        # pylint: disable=too-many-branches; the loop is inlined for speed
+        intern = self.intern
+        integers = self._values[int]
+        lookups = hits = bytes_saved = 0
+        if isinstance(node, node_classes.Module):
+            to_visit = [node.body]
+        else:
+            to_visit = [node]
+        while to_visit:
+            node = to_visit.pop()
+            if node.__class__ is list:
+                for index, value in enumerate(node):
+                    if isinstance(value, base.BaseNode):
+                        to_visit.append(value)
+                    else:
+                        node[index] = intern(value)
+                continue
+            if node.__class__ is tuple:
+                to_visit.extend(node)
+                continue
+            if node is base.Empty:
+                continue
+            # The positions are looked up directly in the table of the
+            # integers, as there are so many of them.
+            for field in _POSITIONS:
+                value = getattr(node, field)
+                if value is not None:
+                    lookups += 1
+                    canonical = integers.setdefault(value, value)
+                    if canonical is not value:
+                        hits += 1
+                        bytes_saved += sys.getsizeof(value)
+                        setattr(node, field, canonical)
+            for field in node._other_fields:
+                value = getattr(node, field)
+                if value.__class__ is list:
+                    to_visit.append(value)
+                elif value is not None:
+                    canonical = intern(value)
+                    if canonical is not value:
+                        setattr(node, field, canonical)
+            for field in node._astroid_fields:
+                if field == 'body' and isinstance(node, base.LazyBodyMixIn):
+                    try:
+                        lazy_body = object.__getattribute__(node,
+                                                            '_lazy_body')
+                    except AttributeError:
+                        pass
+                    else:
+                        node._lazy_body = base.LazyBody(functools.partial(
+                            self._build_body, lazy_body.build))
+                        continue
+                value = getattr(node, field)
+                if value.__class__ is tuple:
+                    to_visit.extend(value)
+                else:
+                    to_visit.append(value)
+        self.lookups += lookups
+        self.hits += hits
+        self.bytes_saved += bytes_saved
+
+    def _build_body(self, build):
+        body = build()
+        self.intern_tree(body)
+        return body
+
+    def report(self):
+        """Gets the numbers of distinct values kept, of values looked up
+        and of values replaced by a canonical copy, and the bytes saved
+        by the replacements.
+        """
+        return collections.OrderedDict([
+            ('values', len(self)),
+            ('lookups', self.lookups),
+            ('hits', self.hits),
+            ('bytes_saved', self.bytes_saved),
+        ])
+
+    def clear(self):
+        """Forgets the canonical values, letting them be freed."""
+        self._values.clear()
+        self.lookups = self.hits = self.bytes_saved = 0
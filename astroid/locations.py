@@ -0,0 +1,122 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""Indexes finding where the nodes of a module are in its tree.
+
+The nodes don't know their parents, only the zippers do, so a node
+held apart from a zipper, as by a transform, a report or a cache, can
+only be found again by walking the tree from its root.  A
+:class:`LocationIndex` walks it once, on its first lookup, and then
+gives the path from the root to any node of the tree, and a zipper for
+it, in time linear in the depth of the node.  :func:`locate` keeps the
+index of a module on the module itself.
+
+The nodes are known by their identities.  A node found at several
+places of the tree, like a subtree shared by hash-consing or a
+flyweight, is located at the first of them in prefix order, and Empty
+is never located.
+"""
+
+from astroid import base
+from astroid import zipper
+
+
+class LocationIndex(object):
+    """The parents of the nodes of a tree, by the identities of the
+    nodes.
+
+    The index is made for a tree which isn't changed in place: edits
+    through zippers make new trees, which need their own indexes.
+    """
+
+    __slots__ = ('root', '_parents')
+
+    def __init__(self, root):
+        self.root = root
+        self._parents = None
+
+    def __len__(self):
+        return len(self._get_parents())
+
+    def __contains__(self, node):
+        entry = self._get_parents().get(id(node))
+        return entry is not None and entry[0] is node
+
+    def _get_parents(self):
+        if self._parents is None:
+            self._parents = _index(self.root)
+        return self._parents
+
+    def path(self, node):
+        """Gets the indexes of the children to go down to from the root
+        to reach *node*, or None if it isn't in the tree.
+
+        The indexes of the sequences of nodes are included, as
+        :meth:`astroid.zipper.Zipper.down` counts them.
+        """
+        parents = self._get_parents()
+        entry = parents.get(id(node))
+        if entry is None or entry[0] is not node:
+            return None
+        steps = []
+        while entry[1] is not None:
+            steps.append(entry[2])
+            entry = parents[id(entry[1])]
+        indexes = []
+        for step in reversed(steps):
+            indexes.extend(step)
+        return tuple(indexes)
+
+    def zipper(self, node):
+        """Gets a zipper for *node*, or None if it isn't in the tree."""
+        return _follow(zipper.Zipper(self.root), self.path(node))
+
+    def cursor(self, node):
+        """Gets a cursor for *node*, or None if it isn't in the tree."""
+        return _follow(zipper.Cursor(self.root), self.path(node))
+
+
+def _index(root):
+    """Maps the identities of the nodes of the tree rooted at *root* to
+    the nodes, their parent nodes and their indexes in them.
+
+    Lazy bodies are built.
+    """
+    parents = {}
+    to_visit = [(root, None, ())]
+    while to_visit:
+        value, parent, indexes = to_visit.pop()
+        if isinstance(value, base.BaseNode):
+            if value is base.Empty or id(value) in parents:
+                # Already found, with its descendants, at another place.
+                continue
+            parents[id(value)] = (value, parent, indexes)
+            parent, indexes = value, ()
+        elif not isinstance(value, (list, tuple)):
+            continue
+        to_visit.extend((child, parent, indexes + (index,)) for index, child
+                        in reversed(list(enumerate(value))))
+    return parents
+
+
+def _follow(location, indexes):
+    if indexes is None:
+        return None
+    for index in indexes:
+        location = location.down(index)
+    return location
+
+
+def locate(module, node):
+    """Gets a zipper for *node* in the tree of *module*, or None if it
+    isn't in it.
+
+    The index of the module is made on the first call and kept as its
+    location_index.
+
+    :param module: The module, or a zipper for it.
+    """
+    module = getattr(module, '__wrapped__', module)
+    if module.location_index is None:
+        module.location_index = LocationIndex(module)
+    return module.location_index.zipper(node)
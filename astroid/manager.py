@@ -0,0 +1,181 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""The AstroidManager gives access to the trees of modules by their
+name or by their path.
+
+The trees it builds are kept in a cache, so that asking again for the
+same module doesn't parse it again, unless its file changed since.  The
+cache is bounded: when the modules it holds exceed a budget, counted
+either in nodes or in bytes, the least recently used ones are evicted.
+"""
+
+import collections
+import os
+import sys
+
+from astroid import base
+from astroid import builder
+from astroid import exceptions
+
+
+def _iter_values(module):
+    """Iterates over the nodes of a tree and the sequences holding them."""
+    to_visit = [module]
+    while to_visit:
+        value = to_visit.pop()
+        if isinstance(value, base.BaseNode):
+            if value is base.Empty:
+                continue
+            yield value
+            to_visit.extend(value)
+        elif isinstance(value, (list, tuple)):
+            yield value
+            to_visit.extend(value)
+
+
+def count_nodes(module):
+    """Counts the nodes in the tree of *module*."""
+    return sum(1 for value in _iter_values(module)
+               if isinstance(value, base.BaseNode))
+
+
+def estimate_size(module):
+    """Estimates the memory used by the tree of *module*, in bytes.
+
+    This is the size of the nodes, of their instance dictionaries and
+    of the sequences of children, but not of the values they share,
+    like names or constants.
+    """
+    size = 0
+    for value in _iter_values(module):
+        size += sys.getsizeof(value)
+        attributes = getattr(value, '__dict__', None)
+        if attributes is not None:
+            size += sys.getsizeof(attributes)
+    return size
+
+
+def find_module_file(modname, search_path=None):
+    """Finds the source file of the module *modname*.
+
+    :param str modname: The dotted name of the module.
+    :param search_path: The directories where to look for the module,
+        by default :data:`sys.path`.
+    :raises AstroidImportError: if there is no source file for the module.
+    """
+    parts = modname.split('.')
+    for directory in (sys.path if search_path is None else search_path):
+        base_path = os.path.join(directory or os.curdir, *parts)
+        for path in (base_path + '.py',
+                     os.path.join(base_path, '__init__.py')):
+            if os.path.isfile(path):
+                return path
+    raise exceptions.AstroidImportError(
+        'Failed to find the source of module {modname}.', modname=modname)
+
+
+_Entry = collections.namedtuple('_Entry', 'mtime size module cost')
+
+
+class AstroidManager(object):
+    """Builds the trees of modules and keeps the most recently used ones.
+
+    :param int max_nodes: The number of nodes above which modules are
+        evicted from the cache.
+    :param int max_bytes: The estimated size in bytes above which modules
+        are evicted from the cache, see :func:`estimate_size`.
+        Only one of *max_nodes* and *max_bytes* may be given; without
+        both, the cache is unbounded.
+    :param cache: A :class:`astroid.cache.ModuleCache` used when a module
+        has to be built.
+    :param interner: An :class:`astroid.interning.Interner` sharing the
+        values of all the modules built by the manager.
+    :param cons_table: An :class:`astroid.hashconsing.ConsTable` sharing
+        the identical subtrees of all the modules built by the manager.
+    """
+
+    def __init__(self, max_nodes=None, max_bytes=None, cache=None,
+                 interner=None, cons_table=None):
+        if max_nodes is not None and max_bytes is not None:
+            raise ValueError('Only one of max_nodes and max_bytes may be given.')
+        if max_bytes is not None:
+            self.budget = max_bytes
+            self._cost = estimate_size
+        elif max_nodes is not None:
+            self.budget = max_nodes
+            self._cost = count_nodes
+        else:
+            self.budget = None
+            self._cost = None
+        self.cache = cache
+        self.interner = interner
+        self.cons_table = cons_table
+        self.used = 0
+        self._modules = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._modules)
+
+    def __contains__(self, path):
+        return os.path.abspath(path) in self._modules
+
+    def ast_from_file(self, path, modname=None):
+        """Gets the zipper for the module in the file at *path*.
+
+        The tree is built again if the modification time or the size of
+        the file changed since it was cached.
+
+        :param str modname: The name of the module, by default the name
+            of the file without its extension.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self._modules.pop(path, None)
+        if entry is not None:
+            self.used -= entry.cost
+            if (entry.mtime, entry.size) != (stat.st_mtime, stat.st_size):
+                entry = None
+        if entry is None:
+            module = builder.parse_file(path, modname, cache=self.cache,
+                                        interner=self.interner,
+                                        cons_table=self.cons_table)
+            cost = self._cost(module.__wrapped__) if self._cost else 0
+            entry = _Entry(stat.st_mtime, stat.st_size, module, cost)
+        self._modules[path] = entry
+        self.used += entry.cost
+        self._evict()
+        return entry.module
+
+    def ast_from_module_name(self, modname, search_path=None):
+        """Gets the zipper for the module named *modname*.
+
+        :param search_path: The directories where to look for the module,
+            by default :data:`sys.path`.
+        :raises AstroidImportError: if the source of the module can't be found.
+        """
+        path = find_module_file(modname, search_path)
+        if os.path.basename(path) == '__init__.py':
+            # The builder recognizes packages by this suffix.
+            modname += '.__init__'
+        return self.ast_from_file(path, modname)
+
+    def invalidate(self, path):
+        """Removes the module in the file at *path* from the cache."""
+        entry = self._modules.pop(os.path.abspath(path), None)
+        if entry is not None:
+            self.used -= entry.cost
+
+    def clear_cache(self):
+        """Removes all the modules from the cache."""
+        self._modules.clear()
+        self.used = 0
+
+    def _evict(self):
+        # The most recently used module is kept even if it exceeds the
+        # budget by itself, since it was just asked for.
+        if self.budget is None:
+            return
+        while self.used > self.budget and len(self._modules) > 1:
+            _, entry = self._modules.popitem(last=False)
+            self.used -= entry.cost
@@ -4,6 +4,7 @@
 """Module for some node classes. More nodes in scoped_nodes.py
 """
 import abc
+import collections
 import functools
 import io
 import warnings
@@ -16,7 +17,11 @@ from astroid import base
 from astroid import util
 
 
-@six.add_metaclass(abc.ABCMeta)
+class _AbstractNodeMeta(base.NodeMeta, abc.ABCMeta):
+    """Metaclass of the abstract nodes."""
+
+
+@six.add_metaclass(_AbstractNodeMeta)
 class BaseContainer(base.BaseNode):
     """Base class for Set, FrozenSet, Tuple and List."""
 
@@ -84,9 +89,12 @@ class Arguments(base.BaseNode):
         self.kwarg = kwarg
         self.keyword_only = keyword_only
         self.positional_only = positional_only
-        self.positional_and_keyword = self.args + self.positional_only
         super(Arguments, self).__init__(None, None)
 
+    @property
+    def positional_and_keyword(self):
+        return self.args + self.positional_only
+
     @staticmethod
     def _format_args(args):
         values = []
@@ -285,6 +293,7 @@ class Comprehension(base.BaseNode):
         self.target = target
         self.iter = iter
         self.ifs = ifs
+        super(Comprehension, self).__init__(None, None)
 
 
 class Const(base.BaseNode):
@@ -750,6 +759,15 @@ class Module(base.BaseNode):
 
     fromlineno = 0
     lineno = 0
+    col_offset = None
+
+    # The astroid.positions.PositionTable of the module, if it has one,
+    # its astroid.positions.PositionIndex and its
+    # astroid.locations.LocationIndex, once made.
+    _private_fields = ('position_table', 'position_index', 'location_index')
+    position_table = None
+    position_index = None
+    location_index = None
 
     _other_fields = ('name', 'doc', 'file_encoding', 'package',
                      'pure_python', 'source_code', 'source_file')
@@ -900,22 +918,79 @@ else:
             super(_ListComp, self).__init__(lineno, col_offset)
 
 
+#: The facts about a function or a lambda which are found in one walk
+#: of its body: the names of its arguments, its numbers of yields and
+#: of awaits, whether it returns a value and its number of nested
+#: functions and lambdas.  The walk doesn't go into the bodies of the
+#: nested functions, whose facts are their own.
+FunctionFacts = collections.namedtuple(
+    'FunctionFacts', 'argnames yields awaits returns_value functions')
+
+
+def function_facts(function):
+    """Finds the FunctionFacts of *function* in one walk of its body."""
+    yields = awaits = functions = 0
+    returns_value = False
+    to_visit = [function.body]
+    while to_visit:
+        descendant = to_visit.pop()
+        if isinstance(descendant, LambdaFunctionMixin):
+            functions += 1
+            # Only the body of a nested function is its own, its
+            # decorators, defaults and annotations are evaluated here.
+            to_visit.extend(getattr(descendant, field)
+                            for field in descendant._astroid_fields
+                            if field != 'body')
+            continue
+        if isinstance(descendant, Yield):
+            yields += 1
+        elif isinstance(descendant, Await):
+            awaits += 1
+        elif isinstance(descendant, Return) and descendant.value:
+            returns_value = True
+        to_visit.extend(descendant)
+    return FunctionFacts(argument_names(function.args), yields, awaits,
+                         returns_value, functions)
+
+
+def argument_names(args):
+    """Gets the names of the arguments of an Arguments node, as a tuple."""
+    if args.positional_and_keyword: # maybe None with builtin functions
+        names = _rec_get_names(args.positional_and_keyword)
+    else:
+        names = []
+    if args.vararg:
+        names.append(args.vararg.name)
+    if args.kwarg:
+        names.append(args.kwarg.name)
+    if args.keyword_only:
+        names.extend([arg.name for arg in args.keyword_only])
+    return tuple(names)
+
+
 class LambdaFunctionMixin(base.BaseNode):
     """Common code for lambda and functions."""
 
+    _private_fields = ('_facts',)
+
+    @property
+    def facts(self):
+        """The FunctionFacts of the function.
+
+        The rebuilder counts them while it builds the body of a
+        function or of a lambda.  The facts of lazy bodies, and of the
+        functions made by transforms or zippers, which are new nodes,
+        are found on first access.
+        """
+        try:
+            return self._facts
+        except AttributeError:
+            self._facts = facts = function_facts(self)
+            return facts
+
     def argnames(self):
         """return a list of argument names"""
-        if self.args.positional_and_keyword: # maybe None with builtin functions
-            names = _rec_get_names(self.args.positional_and_keyword)
-        else:
-            names = []
-        if self.args.vararg:
-            names.append(self.args.vararg.name)
-        if self.args.kwarg:
-            names.append(self.args.kwarg.name)
-        if self.args.keyword_only:
-            names.extend([arg.name for arg in self.keyword_only])
-        return names
+        return list(self.facts.argnames)
 
 
 def _rec_get_names(args, names=None):
@@ -941,7 +1016,7 @@ class Lambda(LambdaFunctionMixin):
         super(Lambda, self).__init__(lineno, col_offset)
 
 
-class FunctionDef(LambdaFunctionMixin, Statement):
+class FunctionDef(base.LazyBodyMixIn, LambdaFunctionMixin, Statement):
 
     _astroid_fields = ('decorators', 'args', 'body', 'returns')
     _other_fields = ('name', 'doc')
@@ -950,7 +1025,7 @@ class FunctionDef(LambdaFunctionMixin, Statement):
         self.name = name
         self.doc = doc
         self.args = args
-        self.body = body
+        self._set_body(body)
         self.decorators = decorators
         self.returns = returns
         super(FunctionDef, self).__init__(lineno, col_offset)
@@ -979,22 +1054,14 @@ class FunctionDef(LambdaFunctionMixin, Statement):
 
     def is_generator(self):
         """return true if this is a generator function"""
-        to_visit = list(self)
-        to_visit.reverse()
-        while to_visit:
-            descendant = to_visit.pop()
-            if isinstance(descendant, (Yield, YieldFrom)):
-                return True
-            if not isinstance(descendant, (FunctionDef, Lambda)):
-                to_visit.extend(reversed(tuple(descendant)))
-        return False
+        return bool(self.facts.yields)
 
 
 class AsyncFunctionDef(FunctionDef):
     """Asynchronous function created with the `async` keyword."""
 
 
-class ClassDef(Statement):
+class ClassDef(base.LazyBodyMixIn, Statement):
 
     _astroid_fields = ('decorators', 'bases', 'body', 'keywords')
     _other_fields = ('name', 'doc')
@@ -1003,7 +1070,7 @@ class ClassDef(Statement):
         self.name = name
         self.doc = doc
         self.bases = bases
-        self.body = body
+        self._set_body(body)
         self.decorators = decorators
         self.keywords = keywords
         super(ClassDef, self).__init__(lineno, col_offset)
@@ -0,0 +1,390 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""Tables keeping the positions of the nodes of a module apart from them.
+
+A :class:`PositionTable` holds the line and column where each node of a
+module starts and the line where it ends, in arrays of machine integers indexed by the
+ordinal of the node.  The ordinals number the nodes, and the sequences
+holding them, in the prefix order in which zippers walk the tree.
+
+With a table, the leaves which have no field at all, like Pass or
+Break, can be shared by the whole module: :func:`add_position_table`
+replaces them by a single flyweight per class, whose positions are
+found in the table when they're asked to a zipper.
+
+A :class:`PositionIndex` answers the other question: which node, which
+statement or which scope is at a given line and column of a module.
+"""
+
+import array
+import bisect
+import collections
+import sys
+
+from astroid import base
+from astroid import node_classes
+from astroid import zipper
+
+
+# The ast module gives no end columns, so there are none.
+Position = collections.namedtuple('Position', 'lineno col_offset end_lineno')
+
+# The value standing for None in the arrays.
+_MISSING = -1
+
+_POSITIONS = Position._fields
+
+
+#: The shared instances of the node classes without fields.
+FLYWEIGHTS = {cls: cls() for cls in (node_classes.Break,
+                                     node_classes.Continue,
+                                     node_classes.DictUnpack,
+                                     node_classes.Ellipsis,
+                                     node_classes.Pass)}
+
+
+def _position(value):
+    """Gets the position of a node, or None for each field of the
+    position of a sequence."""
+    if isinstance(value, base.BaseNode):
+        # Only the nodes with blocks store their end lines.
+        return Position(value.lineno, value.col_offset, value.tolineno)
+    return Position(None, None, None)
+
+
+def _paired(old_children, children):
+    """Gets the index of the child of *old_children* whose place each
+    of *children* takes, or _MISSING, see PositionTable.carried."""
+    if len(old_children) == len(children):
+        return list(range(len(children)))
+    # The same node can be several children, like the flyweights, so
+    # each is paired with its first place after the previous pair.
+    indexes = collections.defaultdict(list)
+    for index, child in enumerate(old_children):
+        indexes[id(child)].append(index)
+    pairs = []
+    start = 0
+    for child in children:
+        candidates = indexes.get(id(child), ())
+        found = bisect.bisect_left(candidates, start)
+        if found < len(candidates):
+            start = candidates[found] + 1
+            pairs.append(candidates[found])
+        else:
+            pairs.append(_MISSING)
+    anchors = [(index, old_index) for index, old_index in enumerate(pairs)
+               if old_index != _MISSING]
+    anchors.append((len(children), len(old_children)))
+    previous_index = previous_old_index = -1
+    for index, old_index in anchors:
+        gap = index - previous_index - 1
+        if gap and gap == old_index - previous_old_index - 1:
+            for offset in range(1, gap + 1):
+                pairs[previous_index + offset] = previous_old_index + offset
+        previous_index, previous_old_index = index, old_index
+    return pairs
+
+
+class PositionTable(object):
+    """The positions of the nodes of a module, indexed by their ordinals.
+
+    The positions which are unknown, like those of the sequences of
+    nodes, are None.
+    """
+
+    __slots__ = _POSITIONS + ('_offsets', '_children')
+
+    def __init__(self):
+        for field in _POSITIONS:
+            setattr(self, field, array.array('i'))
+        # The ordinals of the children of each node follow each other
+        # in _children, from the offset of the node.
+        self._offsets = array.array('i')
+        self._children = array.array('i')
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, ordinal):
+        values = []
+        for field in _POSITIONS:
+            value = getattr(self, field)[ordinal]
+            values.append(None if value == _MISSING else value)
+        return Position(*values)
+
+    @classmethod
+    def from_tree(cls, node):
+        """Builds the table of the tree rooted at *node*.
+
+        Lazy bodies are built to number their nodes.
+        """
+        return cls._build(node)
+
+    def carried(self, root, new_root):
+        """Builds the table of *new_root*, a tree made by editing *root*,
+        whose table this is.
+
+        The nodes of the new tree which have no position of their own,
+        like the flyweights, the nodes shared by hash-consing and their
+        copies, take the positions of the nodes whose places they took.
+        A node takes the place of the node at the same index among its
+        siblings if there are as many siblings as before, and else of
+        the same node among them, the nodes between two such nodes
+        taking the places of as many nodes in order.  This takes time
+        linear in the size of the new tree.
+        """
+        return self._build(new_root, self, root)
+
+    @classmethod
+    def _build(cls, node, previous=None, previous_root=None):
+        table = cls()
+        columns = [getattr(table, field) for field in _POSITIONS]
+        offsets, ordinals = table._offsets, table._children
+        # The stack holds the nodes to number, with the index where
+        # their ordinal goes in the ordinals of their siblings, and the
+        # node of the previous tree whose place they take, if any, with
+        # its ordinal.
+        to_visit = [(node, _MISSING, previous_root, 0)]
+        while to_visit:
+            value, slot, old, old_ordinal = to_visit.pop()
+            ordinal = len(offsets)
+            if slot != _MISSING:
+                ordinals[slot] = ordinal
+            offsets.append(len(ordinals))
+            if old is None:
+                position = _position(value)
+            elif value is old:
+                position = previous[old_ordinal]
+            else:
+                position = [own if own is not None else carried
+                            for own, carried in zip(_position(value),
+                                                    previous[old_ordinal])]
+            for field, column in zip(position, columns):
+                column.append(_MISSING if field is None else field)
+            if isinstance(value, (base.BaseNode, list, tuple)):
+                children = list(value)
+                first = len(ordinals)
+                ordinals.extend([_MISSING] * len(children))
+                if old is not None and (
+                        value.__class__ is old.__class__
+                        or not isinstance(value, base.BaseNode)
+                        and not isinstance(old, base.BaseNode)):
+                    old_children = list(old)
+                    old_first = previous._offsets[old_ordinal]
+                    pairs = [(old_children[index],
+                              previous._children[old_first + index])
+                             if index != _MISSING else (None, 0)
+                             for index in _paired(old_children, children)]
+                else:
+                    pairs = [(None, 0)] * len(children)
+                to_visit.extend(
+                    (child, first + index) + pairs[index]
+                    for index, child in reversed(list(enumerate(children))))
+        return table
+
+    def ordinal(self, location):
+        """Gets the ordinal of the focus of the zipper *location*, whose
+        root is the root of the table, in time linear in its depth.
+
+        Returns None if the tree was edited on the way to the focus.
+        """
+        paths = []
+        path = location._self_path
+        while path:
+            if path.changed:
+                return None
+            paths.append(path)
+            path = path.parent_path
+        ordinal = 0
+        offsets, ordinals = self._offsets, self._children
+        for path in reversed(paths):
+            ordinal = ordinals[offsets[ordinal] + path.index]
+        return ordinal
+
+
+def add_position_table(module):
+    """Gives *module* the table of the positions of its nodes.
+
+    The nodes without fields are replaced by flyweights, shared by all
+    the modules, whose positions are in the table.  Lazy bodies are
+    built.
+    """
+    table = PositionTable.from_tree(module)
+    to_visit = [module]
+    while to_visit:
+        node = to_visit.pop()
+        if isinstance(node, list):
+            for index, child in enumerate(node):
+                if child.__class__ in FLYWEIGHTS:
+                    node[index] = FLYWEIGHTS[child.__class__]
+                else:
+                    to_visit.append(child)
+            continue
+        for field in node._astroid_fields:
+            child = getattr(node, field)
+            if child.__class__ in FLYWEIGHTS:
+                setattr(node, field, FLYWEIGHTS[child.__class__])
+            elif isinstance(child, tuple):
+                if any(element.__class__ in FLYWEIGHTS for element in child):
+                    setattr(node, field, tuple(
+                        FLYWEIGHTS.get(element.__class__, element)
+                        for element in child))
+                to_visit.extend(child)
+            else:
+                to_visit.append(child)
+    module.position_table = table
+    return table
+
+
+class PositionIndex(object):
+    """The spans of the nodes of a tree, sorted by their starts, to find
+    the innermost node at a position in logarithmic time.
+
+    The span of a node goes from its line and column to the end of its
+    end line, the first line of its last descendant, as the ast module
+    doesn't give the end columns.  The innermost node at a position is
+    the node starting last at or before it, or its first ancestor whose
+    span holds the position: finding it takes time logarithmic in the
+    number of nodes and at worst linear in the depth of the tree.
+
+    The positions of the nodes which have none are looked up in the
+    position table of the root, if it has one.  Lazy bodies are built.
+    """
+
+    __slots__ = ('root', '_nodes', '_parents', '_indexes', '_lines',
+                 '_columns', '_ends', '_starts', '_firsts')
+
+    def __init__(self, root):
+        self.root = root
+        table = getattr(root, 'position_table', None)
+        # The nodes, in prefix order, with the index of their parent
+        # node, their indexes in it and their positions.
+        self._nodes = nodes = []
+        self._parents = parents = array.array('i')
+        self._indexes = indexes = []
+        self._lines = lines = array.array('i')
+        self._columns = columns = array.array('i')
+        self._ends = ends = array.array('i')
+        starts = []
+        # The first node starting on each line, in prefix order.
+        self._firsts = firsts = {}
+        # The ordinals follow the prefix order of the position tables.
+        ordinal = 0
+        to_visit = [(root, _MISSING, (), 0)]
+        while to_visit:
+            value, parent, path, depth = to_visit.pop()
+            ordinal += 1
+            if isinstance(value, base.BaseNode):
+                entry = len(nodes)
+                nodes.append(value)
+                parents.append(parent)
+                indexes.append(path)
+                lineno, col_offset, end_lineno = _span(value, ordinal - 1,
+                                                       table)
+                lines.append(_MISSING if lineno is None else lineno)
+                columns.append(col_offset or 0)
+                ends.append(_MISSING if end_lineno is None else end_lineno)
+                if lineno is not None and value is not base.Empty:
+                    starts.append((lineno, col_offset or 0, depth, entry))
+                    if value.lineno is not None:
+                        # Functions start on their def line, not on
+                        # their decorators'.
+                        lineno = value.fromlineno
+                    firsts.setdefault(lineno, entry)
+                parent, path, depth = entry, (), depth + 1
+            to_visit.extend((child, parent, path + (index,), depth)
+                            for index, child in reversed(list(enumerate(value))))
+        # The deepest of the nodes starting at the same position sorts
+        # last.
+        starts.sort()
+        self._starts = starts
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _innermost(self, line, col_offset):
+        if col_offset is None:
+            col_offset = sys.maxsize
+        start = bisect.bisect_right(self._starts,
+                                    (line, col_offset, sys.maxsize)) - 1
+        if start < 0:
+            return _MISSING
+        entry = self._starts[start][3]
+        lines, columns, ends = self._lines, self._columns, self._ends
+        while entry != _MISSING:
+            lineno = lines[entry]
+            if (lineno != _MISSING and ends[entry] >= line
+                    and (lineno, columns[entry]) <= (line, col_offset)):
+                break
+            entry = self._parents[entry]
+        return entry
+
+    def _zipper(self, entry):
+        if entry == _MISSING:
+            return None
+        paths = []
+        while entry != _MISSING:
+            paths.append(self._indexes[entry])
+            entry = self._parents[entry]
+        location = zipper.Zipper(self.root)
+        for path in reversed(paths):
+            for index in path:
+                location = location.down(index)
+        return location
+
+    def node_at(self, line, col_offset=None):
+        """Gets a zipper for the innermost node at a position, or None
+        if no node holds it.
+
+        :param int line: The line of the position.
+        :param col_offset: The column of the position, None for the end
+            of the line.
+        """
+        return self._zipper(self._innermost(line, col_offset))
+
+    def statement_at(self, line, col_offset=None):
+        """Gets a zipper for the innermost statement at a position, or
+        for the module, see :meth:`node_at`."""
+        entry = self._innermost(line, col_offset)
+        while (entry != _MISSING and not isinstance(
+                self._nodes[entry],
+                (node_classes.Statement, node_classes.Module))):
+            entry = self._parents[entry]
+        return self._zipper(entry)
+
+    def first_at(self, line):
+        """Gets a zipper for the first node in prefix order starting on
+        *line*, or None if no node starts on it.
+
+        This takes constant time.  A decorated function starts on its
+        def line here, see :attr:`astroid.node_classes.FunctionDef.fromlineno`.
+        """
+        return self._zipper(self._firsts.get(line, _MISSING))
+
+    def scope_at(self, line, col_offset=None):
+        """Gets a zipper for the innermost scope at a position, see
+        :meth:`node_at`."""
+        location = self.node_at(line, col_offset)
+        return location and location.scope()
+
+
+def _span(node, ordinal, table):
+    """Gets the line, the column and the end line of a node."""
+    if node.lineno is None:
+        if table is None:
+            return None, None, None
+        position = table[ordinal]
+        return position.lineno, position.col_offset, position.end_lineno
+    return node.lineno, node.col_offset, node.tolineno
+
+
+def add_position_index(module):
+    """Gives *module* the index of the positions of its nodes, kept as
+    its position_index.
+
+    :param module: The module, or a zipper for it.
+    """
+    module = getattr(module, '__wrapped__', module)
+    module.position_index = index = PositionIndex(module)
+    return index
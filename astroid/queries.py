@@ -0,0 +1,356 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""Queries evaluated over the columns of encoded trees, with NumPy.
+
+A query is a predicate on the items of a
+:class:`astroid.columnar.ColumnarModule`, evaluated for all of them at
+once as a boolean mask over the columns, instead of by visiting the
+nodes one after the other.  Queries are combined with ``&``, ``|`` and
+``~``.  For instance, the calls of eval, exec or print are::
+
+    Kind(nodes.Call) & Field('func', Kind(nodes.Name)
+                                     & Named('eval', 'exec', 'print'))
+
+and the functions more than three items deep with more than ten
+statements are::
+
+    Kind(nodes.FunctionDef) & Depth(minimum=4) & Field('body',
+                                                       Children(minimum=11))
+
+A :class:`Corpus` concatenates the trees of many modules, so that a
+query is evaluated once for all of them.  Zippers are only built for
+the matches.
+
+This module needs NumPy.
+"""
+
+import numpy
+
+from astroid import columnar
+from astroid import zipper
+
+
+class Query(object):
+    """A predicate on the items of encoded trees."""
+
+    def mask(self, tree):
+        """Gets the boolean mask of the items of *tree* matching the query."""
+        raise NotImplementedError
+
+    def indices(self, tree):
+        """Gets the indices of the items of *tree* matching the query."""
+        return numpy.flatnonzero(self.mask(tree))
+
+    def count(self, tree):
+        """Counts the items of *tree* matching the query."""
+        return int(numpy.count_nonzero(self.mask(tree)))
+
+    def __and__(self, other):
+        return _And(self, other)
+
+    def __or__(self, other):
+        return _Or(self, other)
+
+    def __invert__(self):
+        return _Not(self)
+
+
+class _And(Query):
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def mask(self, tree):
+        return self.left.mask(tree) & self.right.mask(tree)
+
+    def __repr__(self):
+        return '({0!r} & {1!r})'.format(self.left, self.right)
+
+
+class _Or(Query):
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def mask(self, tree):
+        return self.left.mask(tree) | self.right.mask(tree)
+
+    def __repr__(self):
+        return '({0!r} | {1!r})'.format(self.left, self.right)
+
+
+class _Not(Query):
+
+    def __init__(self, query):
+        self.query = query
+
+    def mask(self, tree):
+        return ~self.query.mask(tree)
+
+    def __repr__(self):
+        return '~{0!r}'.format(self.query)
+
+
+class Kind(Query):
+    """Matches the items which are instances of one of *classes*.
+
+    The sequences of nodes are matched by list and tuple.
+    """
+
+    def __init__(self, *classes):
+        self.classes = classes
+        self._kinds = numpy.array(
+            [kind for kind, cls in enumerate(columnar.KINDS)
+             if issubclass(cls, classes)], dtype='B')
+
+    def mask(self, tree):
+        return numpy.isin(tree.kind, self._kinds)
+
+    def __repr__(self):
+        return 'Kind({0})'.format(
+            ', '.join(cls.__name__ for cls in self.classes))
+
+
+class Named(Query):
+    """Matches the nodes whose identifier is one of *names*, see
+    :data:`astroid.columnar.IDENTIFIER_FIELDS`."""
+
+    def __init__(self, *names):
+        self.names = names
+
+    def mask(self, tree):
+        ids = [tree.name_id(name) for name in self.names]
+        ids = [index for index in ids if index != columnar._MISSING]
+        return numpy.isin(tree.name, ids)
+
+    def __repr__(self):
+        return 'Named({0})'.format(', '.join(repr(name)
+                                             for name in self.names))
+
+
+class _Range(Query):
+    """Matches the items whose value in a column is between *minimum*
+    and *maximum*, both included."""
+
+    def __init__(self, minimum=None, maximum=None):
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def _values(self, tree):
+        raise NotImplementedError
+
+    def mask(self, tree):
+        values = self._values(tree)
+        mask = numpy.ones(len(values), dtype=bool)
+        if self.minimum is not None:
+            mask &= values >= self.minimum
+        if self.maximum is not None:
+            mask &= values <= self.maximum
+        return mask
+
+    def __repr__(self):
+        return '{0}(minimum={1!r}, maximum={2!r})'.format(
+            type(self).__name__, self.minimum, self.maximum)
+
+
+class Depth(_Range):
+    """Matches the items at a depth between *minimum* and *maximum*.
+
+    The root is at depth 0, and the sequences of nodes count as a
+    level: the statements of a module are at depth 2.
+    """
+
+    def _values(self, tree):
+        return tree.depth
+
+
+class Children(_Range):
+    """Matches the items with a number of children between *minimum*
+    and *maximum*, like the bodies with that many statements."""
+
+    def _values(self, tree):
+        parents = tree.parent[tree.parent != columnar._MISSING]
+        return numpy.bincount(parents, minlength=len(tree))
+
+
+class Field(Query):
+    """Matches the nodes whose child in the field named *field* matches
+    *query*.
+
+    The nodes of the classes without such a field don't match.
+    """
+
+    def __init__(self, field, query):
+        self.field = field
+        self.query = query
+        # The position of the field among the children of each kind.
+        self._positions = numpy.array(
+            [cls._astroid_fields.index(field)
+             if field in getattr(cls, '_astroid_fields', ()) else -1
+             for cls in columnar.KINDS])
+
+    def mask(self, tree):
+        child_mask = self.query.mask(tree)
+        mask = numpy.zeros(len(tree), dtype=bool)
+        positions = self._positions[tree.kind]
+        parents = numpy.flatnonzero(positions != -1)
+        positions = positions[parents]
+        children = tree.first_child[parents]
+        # The children are reached by following the siblings as many
+        # times as the position of the field.
+        for step in range(positions.max() if len(positions) else 0):
+            selected = positions > step
+            children[selected] = tree.next_sibling[children[selected]]
+        found = children != columnar._MISSING
+        mask[parents[found]] = child_mask[children[found]]
+        return mask
+
+    def __repr__(self):
+        return 'Field({0!r}, {1!r})'.format(self.field, self.query)
+
+
+class Parent(Query):
+    """Matches the items whose parent matches *query*."""
+
+    def __init__(self, query):
+        self.query = query
+
+    def mask(self, tree):
+        parent_mask = self.query.mask(tree)
+        has_parent = tree.parent != columnar._MISSING
+        mask = numpy.zeros(len(tree), dtype=bool)
+        mask[has_parent] = parent_mask[tree.parent[has_parent]]
+        return mask
+
+    def __repr__(self):
+        return 'Parent({0!r})'.format(self.query)
+
+
+def _concatenate(trees):
+    """Encodes several trees as a single one, with a root per tree.
+
+    Returns the encoding and the index of the root of each tree in it.
+    """
+    starts = numpy.cumsum([0] + [len(tree) for tree in trees])[:-1]
+    names, name_ids = [], {}
+    values = []
+    columns = {field: [] for field in columnar.COLUMNS}
+    for tree, start in zip(trees, starts):
+        renames = []
+        for name in tree.names:
+            if name not in name_ids:
+                name_ids[name] = len(names)
+                names.append(name)
+            renames.append(name_ids[name])
+        # The index -1 of a missing name stays -1.
+        renames = numpy.array(renames + [columnar._MISSING], dtype='i')
+        for field in columnar.COLUMNS:
+            column = numpy.asarray(getattr(tree, field))
+            if field in ('parent', 'first_child', 'next_sibling', 'value'):
+                offset = len(values) if field == 'value' else start
+                column = numpy.where(column == columnar._MISSING, column,
+                                     column + offset).astype('i')
+            elif field == 'name':
+                column = renames[column]
+            columns[field].append(column)
+        values.extend(tree.values)
+    tree = columnar.ColumnarModule(
+        [numpy.concatenate(columns[field]) if trees
+         else numpy.zeros(0, dtype=columnar._TYPECODES.get(field, 'i'))
+         for field in columnar.COLUMNS],
+        names, values)
+    return tree, starts
+
+
+class Corpus(object):
+    """The encoded trees of several modules, queried at once.
+
+    :param trees: The :class:`astroid.columnar.ColumnarModule` of each
+        module.
+    :param modules: The zippers of the modules the trees were encoded
+        from, in the same order, where the matches are found.  By
+        default, the modules are built back from the trees when a match
+        is found in them.
+    """
+
+    def __init__(self, trees, modules=None):
+        self.tree, self.starts = _concatenate(list(trees))
+        if modules is None:
+            modules = [None] * len(self.starts)
+        self.modules = list(modules)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def from_modules(cls, modules):
+        """Encodes the trees of *modules*, as zippers or as nodes."""
+        modules = [module if isinstance(module, zipper.Zipper)
+                   else zipper.Zipper(module) for module in modules]
+        return cls([columnar.ColumnarModule.from_module(module)
+                    for module in modules], modules)
+
+    def count(self, query):
+        """Counts the items of all the trees matching *query*."""
+        return query.count(self.tree)
+
+    def find(self, query):
+        """Iterates over the zippers on the items matching *query*, in
+        the order of the trees and in prefix order in each tree."""
+        return self._locations(query.indices(self.tree))
+
+    def location(self, index):
+        """Gets the zipper on the item *index* of the concatenated trees."""
+        return next(self._locations([index]))
+
+    def _root(self, index):
+        number = int(numpy.searchsorted(self.starts, index, 'right')) - 1
+        if self.modules[number] is None:
+            self.modules[number] = zipper.Zipper(
+                self.tree.to_module(int(self.starts[number])))
+        return self.modules[number]
+
+    def _locations(self, indices):
+        """Iterates over the zippers on the items *indices*, in
+        increasing order.
+
+        The moves of the zippers are shared between an item and the
+        previous one: the path to the previous item is kept, as pairs of
+        an index and a zipper, and the path to the next item starts from
+        the deepest common ancestor, or from a left sibling.
+        """
+        tree = self.tree
+        parents, next_siblings = tree.parent, tree.next_sibling
+        path = []
+        for index in indices:
+            ancestors = [int(index)]
+            while parents[ancestors[-1]] != columnar._MISSING:
+                ancestors.append(int(parents[ancestors[-1]]))
+            ancestors.reverse()
+            if not path or path[0][0] != ancestors[0]:
+                path = [(ancestors[0], self._root(ancestors[0]))]
+            for depth in range(1, len(ancestors)):
+                item = ancestors[depth]
+                if depth < len(path):
+                    if path[depth][0] == item:
+                        continue
+                    if parents[path[depth][0]] == ancestors[depth - 1]:
+                        # A left sibling is on the previous path.
+                        sibling, location = path[depth]
+                        del path[depth:]
+                    else:
+                        del path[depth:]
+                        sibling = int(tree.first_child[ancestors[depth - 1]])
+                        location = path[-1][1].down()
+                else:
+                    sibling = int(tree.first_child[ancestors[depth - 1]])
+                    location = path[-1][1].down()
+                while sibling != item:
+                    sibling = int(next_siblings[sibling])
+                    location = location.right()
+                path.append((item, location))
+            del path[len(ancestors):]
+            yield path[-1][1]
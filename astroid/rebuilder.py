@@ -7,9 +7,15 @@ order to get a single Astroid representation
 
 import ast
 import collections
+import functools
+import inspect
 import sys
 
+import six
+
 import astroid
+from astroid import base
+from astroid import node_classes
 from astroid import nodes
 
 _BIN_OP_CLASSES = {
@@ -102,6 +108,47 @@ def _visit_or_empty(node, attr, visitor, visit='visit', **kws):
         return nodes.Empty
 
 
+# The classes of the nodes with blocks, whose end lines are set as
+# they are built.
+_BLOCK_CLASSES = (nodes.Module, nodes.FunctionDef, nodes.ClassDef,
+                  nodes.If, nodes.For, nodes.AsyncFor, nodes.While,
+                  nodes.With, nodes.AsyncWith, nodes.TryExcept,
+                  nodes.TryFinally, nodes.ExceptHandler)
+
+
+def _set_end_lineno(node):
+    """Sets the end_lineno of *node*, a node with a block, once its
+    children are built.
+
+    The end line of a node is the first line of its last descendant,
+    found from its last child: the end of a child with a block is
+    already set, and the other statements end in a few nodes.  The end
+    of a node ending with a body which isn't built yet is left to be
+    found on demand, as are the ends of the nodes without blocks.
+    """
+    if getattr(node, '_lazy_body', None) is not None:
+        return
+    for field in reversed(node._astroid_fields):
+        child = getattr(node, field)
+        if child.__class__ is tuple:
+            child = child[-1] if child else None
+        if child:
+            break
+    else:
+        node.end_lineno = node.lineno
+        return
+    try:
+        node.end_lineno = child.end_lineno
+    except AttributeError:
+        if not isinstance(child, _BLOCK_CLASSES):
+            node.end_lineno = child.tolineno
+
+
+# The indexes of the counts of the facts of a function being built,
+# see node_classes.FunctionFacts.
+_YIELDS, _AWAITS, _RETURNS, _FUNCTIONS = range(4)
+
+
 def _get_context(node):
     return CONTEXTS.get(type(node.ctx), astroid.Load)
 
@@ -156,11 +203,51 @@ class ParameterVisitor(object):
 
 
 class TreeRebuilder(object):
-    """Rebuilds the ast tree to become an Astroid tree"""
+    """Rebuilds the ast tree to become an Astroid tree
+
+    The bodies of the nodes of the classes in *lazy*, among FunctionDef
+    and ClassDef, keep the ast statements and are only rebuilt when
+    they are first accessed.
+    """
 
-    def __init__(self):
+    def __init__(self, lazy=()):
         self._global_names = []
+        # The counts of the facts of the functions and lambdas being
+        # built, innermost last.
+        self._facts = []
         self._visit_meths = {}
+        self._lazy = tuple(lazy)
+
+    def _count(self, fact):
+        """Counts a fact of the innermost function being built."""
+        if self._facts:
+            self._facts[-1][fact] += 1
+
+    def _set_facts(self, node, counts):
+        """Gives *node* the facts counted while its body was built.
+
+        With lazy bodies, the counts may miss the bodies built later,
+        so the facts are left to be found on demand.
+        """
+        if not self._lazy:
+            node._facts = node_classes.FunctionFacts(
+                node_classes.argument_names(node.args), counts[_YIELDS],
+                counts[_AWAITS], bool(counts[_RETURNS]), counts[_FUNCTIONS])
+
+    def _visit_body(self, cls, statements):
+        if issubclass(cls, self._lazy):
+            return base.LazyBody(functools.partial(self._visit_lazy_body,
+                                                   cls, statements))
+        return tuple([self.visit(child) for child in statements])
+
+    def _visit_lazy_body(self, cls, statements):
+        # The names declared global are tracked per function.
+        if issubclass(cls, nodes.FunctionDef):
+            self._global_names.append({})
+        body = tuple([self.visit(child) for child in statements])
+        if issubclass(cls, nodes.FunctionDef):
+            self._global_names.pop()
+        return body
 
     def visit_module(self, node, modname, modpath, package):
         """visit a Module node by returning a fresh instance of it"""
@@ -172,7 +259,8 @@ class TreeRebuilder(object):
                                pure_python=True,
                                source_code='???',
                                source_file=modpath,
-                               body=[self.visit(child) for child in node.body])
+                               body=tuple([self.visit(child) for child in node.body]))
+        _set_end_lineno(newnode)
         return newnode
 
     def visit(self, node):
@@ -233,16 +321,19 @@ class TreeRebuilder(object):
             param_visitor = ParameterVisitor(self)
             for parameter in params:
                 default = defaults.popleft()
+                # Keyword-only arguments without defaults have None.
                 if default:
                     default = self.visit(default)
+                else:
+                    default = nodes.Empty
 
                 for param in param_visitor.visit(parameter, default):
                     yield param
 
         # Build the arguments list.
-        positional_args = list(_build_args(node.args, node.defaults))
-        kwonlyargs = list(_build_args(getattr(node, 'kwonlyargs', ()),
-                                      getattr(node, 'kw_defaults', ())))
+        positional_args = tuple(_build_args(node.args, node.defaults))
+        kwonlyargs = tuple(_build_args(getattr(node, 'kwonlyargs', ()),
+                                       getattr(node, 'kw_defaults', ())))
         # Build vararg and kwarg.
         vararg = _build_variadic('vararg')
         kwarg = _build_variadic('kwarg')
@@ -251,7 +342,7 @@ class TreeRebuilder(object):
                                   vararg=vararg,
                                   kwarg=kwarg,
                                   keyword_only=kwonlyargs,
-                                  positional_only=[])
+                                  positional_only=())
         return newnode
 
     def visit_assert(self, node):
@@ -269,7 +360,7 @@ class TreeRebuilder(object):
     def visit_assign(self, node):
         """visit a Assign node by returning a fresh instance of it"""
         newnode = nodes.Assign(
-            targets=[self.visit(child) for child in node.targets],
+            targets=tuple([self.visit(child) for child in node.targets]),
             value=self.visit(node.value),
             lineno=node.lineno,
             col_offset=node.col_offset)
@@ -312,7 +403,7 @@ class TreeRebuilder(object):
         """visit a BoolOp node by returning a fresh instance of it"""
         newnode = nodes.BoolOp(
             op=_BOOL_OP_CLASSES[type(node.op)],
-            values=[self.visit(child) for child in node.values],
+            values=tuple([self.visit(child) for child in node.values]),
             lineno=node.lineno,
             col_offset=node.col_offset)
         return newnode
@@ -326,26 +417,20 @@ class TreeRebuilder(object):
         """visit a CallFunc node by returning a fresh instance of it"""
         starargs = _visit_or_empty(node, 'starargs', self)
         kwargs = _visit_or_empty(node, 'kwargs', self)
-        args = [self.visit(child) for child in node.args]
-
-        if node.keywords:
-            keywords = [self.visit(child) for child in node.keywords]
-        else:
-            keywords = ()
+        args = tuple([self.visit(child) for child in node.args])
+        keywords = tuple([self.visit(child) for child in node.keywords])
         if starargs:
             new_starargs = nodes.Starred(value=starargs,
-                                         ctx=starargs.col_offset,
-                                         lineno=starargs.lineno)
-            args.append(new_starargs)
+                                         ctx=astroid.Load,
+                                         lineno=starargs.lineno,
+                                         col_offset=starargs.col_offset)
+            args += (new_starargs,)
         if kwargs:
             new_kwargs = nodes.Keyword(arg=None,
                                        value=kwargs,
-                                       lineno=kwargs.col_offset,
-                                       col_offset=kwargs.lineno)
-            if keywords:
-                keywords.append(new_kwargs)
-            else:
-                keywords = [new_kwargs]
+                                       lineno=kwargs.lineno,
+                                       col_offset=kwargs.col_offset)
+            keywords += (new_kwargs,)
 
         newnode = nodes.Call(func=self.visit(node.func),
                              args=args,
@@ -358,23 +443,24 @@ class TreeRebuilder(object):
         """visit a ClassDef node to become astroid"""
         node, doc = _get_doc(node)
         if PY3:
-            keywords = [self.visit_keyword(keyword)
-                        for keyword in node.keywords]
+            keywords = tuple([self.visit_keyword(keyword)
+                              for keyword in node.keywords])
         else:
-            keywords = []
+            keywords = ()
         if node.decorator_list:
             decorators = self.visit_decorators(node)
         else:
-            decorators = []
+            decorators = ()
         newnode = nodes.ClassDef(
             name=node.name,
             doc=doc,
-            bases=[self.visit(child) for child in node.bases],
-            body=[self.visit(child) for child in node.body],
+            bases=tuple([self.visit(child) for child in node.bases]),
+            body=self._visit_body(nodes.ClassDef, node.body),
             decorators=decorators,
             keywords=keywords,
             lineno=node.lineno,
             col_offset=node.col_offset)
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_const(self, node):
@@ -391,9 +477,9 @@ class TreeRebuilder(object):
     def visit_compare(self, node):
         """visit a Compare node by returning a fresh instance of it"""
         newnode = nodes.Compare(
-            ops=[_CMP_OP_CLASSES[type(op)] for op in node.ops],
+            ops=tuple([_CMP_OP_CLASSES[type(op)] for op in node.ops]),
             left=self.visit(node.left),
-            comparators=[self.visit(expr) for expr in node.comparators],
+            comparators=tuple([self.visit(expr) for expr in node.comparators]),
             lineno=node.lineno,
             col_offset=node.col_offset)
         return newnode
@@ -403,7 +489,7 @@ class TreeRebuilder(object):
         newnode = nodes.Comprehension(
             target=self.visit(node.target),
             iter=self.visit(node.iter),
-            ifs=[self.visit(child) for child in node.ifs])
+            ifs=tuple([self.visit(child) for child in node.ifs]))
         return newnode
 
     def visit_decorators(self, node):
@@ -411,7 +497,7 @@ class TreeRebuilder(object):
         # /!\ node is actually a ast.FunctionDef node while
         # parent is a astroid.nodes.FunctionDef node
         newnode = nodes.Decorators(
-            nodes=[self.visit(child) for child in node.decorator_list],
+            nodes=tuple([self.visit(child) for child in node.decorator_list]),
             lineno=node.lineno,
             col_offset=node.col_offset)
         return newnode
@@ -419,7 +505,7 @@ class TreeRebuilder(object):
     def visit_delete(self, node):
         """visit a Delete node by returning a fresh instance of it"""
         newnode = nodes.Delete(
-            targets=[self.visit(child) for child in node.targets],
+            targets=tuple([self.visit(child) for child in node.targets]),
             lineno=node.lineno,
             col_offset=node.col_offset)
         return newnode
@@ -442,7 +528,7 @@ class TreeRebuilder(object):
         if items:
             keys, values = zip(*items)
         else:
-            keys, values = [], []
+            keys, values = (), ()
         newnode = nodes.Dict(keys=keys,
                              values=values,
                              lineno=node.lineno,
@@ -452,7 +538,7 @@ class TreeRebuilder(object):
     def visit_dictcomp(self, node):
         """visit a DictComp node by returning a fresh instance of it"""
         newnode = nodes.DictComp(
-            generators=[self.visit(child) for child in node.generators],
+            generators=tuple([self.visit(child) for child in node.generators]),
             key=self.visit(node.key),
             value=self.visit(node.value),
             lineno=node.lineno,
@@ -477,9 +563,10 @@ class TreeRebuilder(object):
         newnode = nodes.ExceptHandler(
             type=_visit_or_empty(node, 'type', self),
             name=_visit_or_empty(node, 'name', self),
-            body=[self.visit(child) for child in node.body],
+            body=tuple([self.visit(child) for child in node.body]),
             lineno=node.lineno,
             col_offset=node.col_offset)
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_exec(self, node):
@@ -493,17 +580,18 @@ class TreeRebuilder(object):
 
     def visit_extslice(self, node):
         """visit an ExtSlice node by returning a fresh instance of it"""
-        newnode = nodes.ExtSlice(dims=[self.visit(dim) for dim in node.dims])
+        newnode = nodes.ExtSlice(dims=tuple([self.visit(dim) for dim in node.dims]))
         return newnode
 
     def _visit_for(self, cls, node):
         """visit a For node by returning a fresh instance of it"""
         newnode = cls(target=self.visit(node.target),
                       iter=self.visit(node.iter),
-                      body=[self.visit(child) for child in node.body],
-                      orelse=[self.visit(child) for child in node.orelse],
+                      body=tuple([self.visit(child) for child in node.body]),
+                      orelse=tuple([self.visit(child) for child in node.orelse]),
                       lineno=node.lineno,
                       col_offset=node.col_offset)
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_for(self, node):
@@ -511,7 +599,7 @@ class TreeRebuilder(object):
 
     def visit_importfrom(self, node):
         """visit an ImportFrom node by returning a fresh instance of it"""
-        names = [(alias.name, alias.asname) for alias in node.names]
+        names = tuple([(alias.name, alias.asname) for alias in node.names])
         newnode = nodes.ImportFrom(
             modname=node.module or '',
             names=names,
@@ -522,8 +610,11 @@ class TreeRebuilder(object):
 
     def _visit_functiondef(self, cls, node):
         """visit an FunctionDef node to become astroid"""
+        self._count(_FUNCTIONS)
         self._global_names.append({})
         node, doc = _get_doc(node)
+        # The decorators, the defaults and the annotations are
+        # evaluated in the enclosing function, whose facts they are.
         if node.decorator_list:
             decorators = self.visit_decorators(node)
         else:
@@ -532,15 +623,20 @@ class TreeRebuilder(object):
             returns = self.visit(node.returns)
         else:
             returns = nodes.Empty
+        args = self.visit(node.args)
+        self._facts.append([0, 0, 0, 0])
+        body = self._visit_body(cls, node.body)
         newnode = cls(name=node.name,
                       doc=doc,
-                      args=self.visit(node.args),
-                      body=[self.visit(child) for child in node.body],
+                      args=args,
+                      body=body,
                       decorators=decorators,
                       returns=returns,
                       lineno=node.lineno,
                       col_offset=node.col_offset)
+        self._set_facts(newnode, self._facts.pop())
         self._global_names.pop()
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_functiondef(self, node):
@@ -549,7 +645,7 @@ class TreeRebuilder(object):
     def visit_generatorexp(self, node):
         """visit a GeneratorExp node by returning a fresh instance of it"""
         newnode = nodes.GeneratorExp(
-            generators=[self.visit(child) for child in node.generators],
+            generators=tuple([self.visit(child) for child in node.generators]),
             elt=self.visit(node.elt),
             lineno=node.lineno,
             col_offset=node.col_offset)
@@ -579,7 +675,7 @@ class TreeRebuilder(object):
 
     def visit_global(self, node):
         """visit a Global node to become astroid"""
-        newnode = nodes.Global(names=node.names,
+        newnode = nodes.Global(names=tuple(node.names),
                                lineno=getattr(node, 'lineno', None),
                                col_offset=getattr(node, 'col_offset', None))
         if self._global_names:  # global at the module level, no effect
@@ -590,10 +686,11 @@ class TreeRebuilder(object):
     def visit_if(self, node):
         """visit an If node by returning a fresh instance of it"""
         newnode = nodes.If(test=self.visit(node.test),
-                           body=[self.visit(child) for child in node.body],
-                           orelse=[self.visit(child) for child in node.orelse],
+                           body=tuple([self.visit(child) for child in node.body]),
+                           orelse=tuple([self.visit(child) for child in node.orelse]),
                            lineno=node.lineno,
                            col_offset=node.col_offset)
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_ifexp(self, node):
@@ -607,7 +704,7 @@ class TreeRebuilder(object):
 
     def visit_import(self, node):
         """visit a Import node by returning a fresh instance of it"""
-        names = [(alias.name, alias.asname) for alias in node.names]
+        names = tuple([(alias.name, alias.asname) for alias in node.names])
         newnode = nodes.Import(names=names,
                                lineno=getattr(node, 'lineno', None),
                                col_offset=getattr(node, 'col_offset', None))
@@ -625,17 +722,21 @@ class TreeRebuilder(object):
 
     def visit_lambda(self, node):
         """visit a Lambda node by returning a fresh instance of it"""
-        newnode = nodes.Lambda(args=self.visit(node.args),
+        self._count(_FUNCTIONS)
+        args = self.visit(node.args)
+        self._facts.append([0, 0, 0, 0])
+        newnode = nodes.Lambda(args=args,
                                body=self.visit(node.body),
                                lineno=node.lineno,
                                col_offset=node.col_offset)
+        self._set_facts(newnode, self._facts.pop())
         return newnode
 
     def visit_list(self, node):
         """visit a List node by returning a fresh instance of it"""
         context = _get_context(node)
         newnode = nodes.List(ctx=context,
-                             elts=[self.visit(child) for child in node.elts],
+                             elts=tuple([self.visit(child) for child in node.elts]),
                              lineno=node.lineno,
                              col_offset=node.col_offset)
         return newnode
@@ -643,7 +744,7 @@ class TreeRebuilder(object):
     def visit_listcomp(self, node):
         """visit a ListComp node by returning a fresh instance of it"""
         newnode = nodes.ListComp(
-            generators=[self.visit(child) for child in node.generators],
+            generators=tuple([self.visit(child) for child in node.generators]),
             elt=self.visit(node.elt),
             lineno=node.lineno,
             col_offset=node.col_offset)
@@ -697,7 +798,7 @@ class TreeRebuilder(object):
         newnode = nodes.Print(
             nl=node.nl,
             dest=_visit_or_empty(node, 'dest', self),
-            values=[self.visit(child) for child in node.values],
+            values=tuple([self.visit(child) for child in node.values]),
             lineno=node.lineno,
             col_offset=node.col_offset)
         return newnode
@@ -713,6 +814,8 @@ class TreeRebuilder(object):
 
     def visit_return(self, node):
         """visit a Return node by returning a fresh instance of it"""
+        if node.value:
+            self._count(_RETURNS)
         newnode = nodes.Return(value=_visit_or_empty(node, 'value', self),
                                lineno=node.lineno,
                                col_offset=node.col_offset)
@@ -720,7 +823,7 @@ class TreeRebuilder(object):
 
     def visit_set(self, node):
         """visit a Set node by returning a fresh instance of it"""
-        newnode = nodes.Set(elts=[self.visit(child) for child in node.elts],
+        newnode = nodes.Set(elts=tuple([self.visit(child) for child in node.elts]),
                             lineno=node.lineno,
                             col_offset=node.col_offset)
         return newnode
@@ -728,7 +831,7 @@ class TreeRebuilder(object):
     def visit_setcomp(self, node):
         """visit a SetComp node by returning a fresh instance of it"""
         newnode = nodes.SetComp(
-            generators=[self.visit(child) for child in node.generators],
+            generators=tuple([self.visit(child) for child in node.generators]),
             elt=self.visit(node.elt),
             lineno=node.lineno,
             col_offset=node.col_offset)
@@ -754,27 +857,29 @@ class TreeRebuilder(object):
     def visit_tryexcept(self, node):
         """visit a TryExcept node by returning a fresh instance of it"""
         newnode = nodes.TryExcept(
-            body=[self.visit(child) for child in node.body],
-            handlers=[self.visit(child) for child in node.handlers],
-            orelse=[self.visit(child) for child in node.orelse],
+            body=tuple([self.visit(child) for child in node.body]),
+            handlers=tuple([self.visit(child) for child in node.handlers]),
+            orelse=tuple([self.visit(child) for child in node.orelse]),
             lineno=node.lineno,
             col_offset=node.col_offset)
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_tryfinally(self, node):
         """visit a TryFinally node by returning a fresh instance of it"""
         newnode = nodes.TryFinally(
-            body=[self.visit(child) for child in node.body],
-            finalbody=[self.visit(n) for n in node.finalbody],
+            body=tuple([self.visit(child) for child in node.body]),
+            finalbody=tuple([self.visit(n) for n in node.finalbody]),
             lineno=node.lineno,
             col_offset=node.col_offset)
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_tuple(self, node):
         """visit a Tuple node by returning a fresh instance of it"""
         context = _get_context(node)
         newnode = nodes.Tuple(ctx=context,
-                              elts=[self.visit(child) for child in node.elts],
+                              elts=tuple([self.visit(child) for child in node.elts]),
                               lineno=node.lineno,
                               col_offset=node.col_offset)
         return newnode
@@ -791,10 +896,11 @@ class TreeRebuilder(object):
         """visit a While node by returning a fresh instance of it"""
         newnode = nodes.While(
             test=self.visit(node.test),
-            body=[self.visit(child) for child in node.body],
-            orelse=[self.visit(child) for child in node.orelse],
+            body=tuple([self.visit(child) for child in node.body]),
+            orelse=tuple([self.visit(child) for child in node.orelse]),
             lineno=node.lineno,
             col_offset=node.col_offset)
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_with(self, node):
@@ -804,14 +910,16 @@ class TreeRebuilder(object):
                                    optional_vars=optional_vars,
                                    lineno=node.context_expr.lineno,
                                    col_offset=node.context_expr.col_offset)
-        newnode = nodes.With(items=[with_item],
-                             body=[self.visit(child) for child in node.body],
+        newnode = nodes.With(items=(with_item,),
+                             body=tuple([self.visit(child) for child in node.body]),
                              lineno=node.lineno,
                              col_offset=node.col_offset)
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_yield(self, node):
         """visit a Yield node by returning a fresh instance of it"""
+        self._count(_YIELDS)
         newnode = nodes.Yield(value=_visit_or_empty(node, 'value', self),
                               lineno=node.lineno,
                               col_offset=node.col_offset)
@@ -836,14 +944,15 @@ class TreeRebuilder3(TreeRebuilder):
         newnode = nodes.ExceptHandler(
             type=_visit_or_empty(node, 'type', self),
             name=name,
-            body=[self.visit(child) for child in node.body],
+            body=tuple([self.visit(child) for child in node.body]),
             lineno=node.lineno,
             col_offset=node.col_offset)
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_nonlocal(self, node):
         """visit a Nonlocal node and return a new instance of it"""
-        return nodes.Nonlocal(names=node.names,
+        return nodes.Nonlocal(names=tuple(node.names),
                               lineno=getattr(node, 'lineno', None),
                               col_offset=getattr(node, 'col_offset', None))
 
@@ -870,23 +979,25 @@ class TreeRebuilder3(TreeRebuilder):
         # TryFinally/TryExcept nodes
         if node.finalbody:
             if node.handlers:
-                body = [self.visit_tryexcept(node)]
+                body = (self.visit_tryexcept(node),)
             else:
-                body = [self.visit(child) for child in node.body]
+                body = tuple([self.visit(child) for child in node.body])
             newnode = nodes.TryFinally(
                 body=body,
-                finalbody=[self.visit(n) for n in node.finalbody],
+                finalbody=tuple([self.visit(n) for n in node.finalbody]),
                 lineno=node.lineno,
                 col_offset=node.col_offset)
+            _set_end_lineno(newnode)
             return newnode
         elif node.handlers:
             return self.visit_tryexcept(node)
 
     def visit_with(self, node, constructor=nodes.With):
-        newnode = constructor(items=[self.visit(item) for item in node.items],
-                              body=[self.visit(child) for child in node.body],
+        newnode = constructor(items=tuple([self.visit(item) for item in node.items]),
+                              body=tuple([self.visit(child) for child in node.body]),
                               lineno=node.lineno,
                               col_offset=node.col_offset)
+        _set_end_lineno(newnode)
         return newnode
 
     def visit_withitem(self, node):
@@ -899,6 +1010,7 @@ class TreeRebuilder3(TreeRebuilder):
         return newnode
 
     def visit_yieldfrom(self, node):
+        self._count(_YIELDS)
         newnode = nodes.YieldFrom(value=_visit_or_empty(node, 'value', self),
                                   lineno=node.lineno,
                                   col_offset=node.col_offset)
@@ -912,6 +1024,7 @@ class TreeRebuilder3(TreeRebuilder):
         return self._visit_for(nodes.AsyncFor, node)
 
     def visit_await(self, node):
+        self._count(_AWAITS)
         newnode = nodes.Await(value=self.visit(node.value),
                               lineno=node.lineno,
                               col_offset=node.col_offset)
@@ -923,3 +1036,262 @@ class TreeRebuilder3(TreeRebuilder):
 
 if sys.version_info >= (3, 0):
     TreeRebuilder = TreeRebuilder3
+
+
+# The visitors of FastTreeRebuilder are generated from the following
+# specifications, which give for an ast class the name of the astroid
+# class it becomes and the expressions for the arguments of its
+# constructor, in terms of the ast node being visited.  The children
+# are visited by looking their visitor up directly in the dispatch
+# table of the rebuilder, without going through visit().  The nodes
+# counted in the facts of functions, lambdas, returns, yields and
+# awaits, keep the visitors of TreeRebuilder.
+
+def _child(field):
+    return ('_dispatch[node.{0}.__class__](self, node.{0})'.format(field))
+
+
+def _children(field):
+    return ('tuple([_dispatch[child.__class__](self, child) '
+            'for child in node.{0}])'.format(field))
+
+
+def _optional_child(field):
+    return '({0} if node.{1} else Empty)'.format(_child(field), field)
+
+
+def _field(field):
+    return 'node.' + field
+
+
+_CONTEXT = '_CONTEXTS.get(node.ctx.__class__, Load)'
+
+_FAST_VISITORS = {
+    'Assert': ('Assert', {'test': _child('test'),
+                          'fail': _optional_child('msg')}),
+    'Assign': ('Assign', {'targets': _children('targets'),
+                          'value': _child('value')}),
+    'AugAssign': ('AugAssign', {
+        'op': "_BIN_OP_CLASSES[node.op.__class__] + '='",
+        'target': _child('target'),
+        'value': _child('value')}),
+    'AsyncFor': ('AsyncFor', {'target': _child('target'),
+                              'iter': _child('iter'),
+                              'body': _children('body'),
+                              'orelse': _children('orelse')}),
+    'BinOp': ('BinOp', {'op': '_BIN_OP_CLASSES[node.op.__class__]',
+                        'left': _child('left'),
+                        'right': _child('right')}),
+    'BoolOp': ('BoolOp', {'op': '_BOOL_OP_CLASSES[node.op.__class__]',
+                          'values': _children('values')}),
+    'Break': ('Break', {}),
+    'Bytes': ('Const', {'value': _field('s')}),
+    'Compare': ('Compare', {
+        'ops': 'tuple([_CMP_OP_CLASSES[op.__class__] for op in node.ops])',
+        'left': _child('left'),
+        'comparators': _children('comparators')}),
+    'comprehension': ('Comprehension', {'target': _child('target'),
+                                        'iter': _child('iter'),
+                                        'ifs': _children('ifs')}),
+    'Continue': ('Continue', {}),
+    'Delete': ('Delete', {'targets': _children('targets')}),
+    'DictComp': ('DictComp', {'generators': _children('generators'),
+                              'key': _child('key'),
+                              'value': _child('value')}),
+    'Ellipsis': ('Ellipsis', {}),
+    'Exec': ('Exec', {'expr': _child('body'),
+                      'globals': _optional_child('globals'),
+                      'locals': _optional_child('locals')}),
+    'Expr': ('Expr', {'value': _child('value')}),
+    'ExtSlice': ('ExtSlice', {'dims': _children('dims')}),
+    'For': ('For', {'target': _child('target'),
+                    'iter': _child('iter'),
+                    'body': _children('body'),
+                    'orelse': _children('orelse')}),
+    'GeneratorExp': ('GeneratorExp', {'generators': _children('generators'),
+                                      'elt': _child('elt')}),
+    'If': ('If', {'test': _child('test'),
+                  'body': _children('body'),
+                  'orelse': _children('orelse')}),
+    'IfExp': ('IfExp', {'test': _child('test'),
+                        'body': _child('body'),
+                        'orelse': _child('orelse')}),
+    'Import': ('Import', {
+        'names': 'tuple([(alias.name, alias.asname) '
+                 'for alias in node.names])'}),
+    'ImportFrom': ('ImportFrom', {
+        'modname': "node.module or ''",
+        'names': 'tuple([(alias.name, alias.asname) '
+                 'for alias in node.names])',
+        'level': 'node.level or None'}),
+    'Index': ('Index', {'value': _child('value')}),
+    'keyword': ('Keyword', {'value': _child('value'), 'arg': _field('arg')}),
+    'List': ('List', {'ctx': _CONTEXT, 'elts': _children('elts')}),
+    'ListComp': ('ListComp', {'generators': _children('generators'),
+                              'elt': _child('elt')}),
+    'NameConstant': ('NameConstant', {'value': _field('value')}),
+    'Nonlocal': ('Nonlocal', {'names': 'tuple(node.names)'}),
+    'Num': ('Const', {'value': _field('n')}),
+    'Pass': ('Pass', {}),
+    'Print': ('Print', {'nl': _field('nl'),
+                        'dest': _optional_child('dest'),
+                        'values': _children('values')}),
+    'Repr': ('Repr', {'value': _child('value')}),
+    'Set': ('Set', {'elts': _children('elts')}),
+    'SetComp': ('SetComp', {'generators': _children('generators'),
+                            'elt': _child('elt')}),
+    'Slice': ('Slice', {'lower': _optional_child('lower'),
+                        'upper': _optional_child('upper'),
+                        'step': _optional_child('step')}),
+    'Starred': ('Starred', {'ctx': _CONTEXT, 'value': _child('value')}),
+    'Str': ('Const', {'value': _field('s')}),
+    'Subscript': ('Subscript', {'ctx': _CONTEXT,
+                                'value': _child('value'),
+                                'slice': _child('slice')}),
+    'TryExcept': ('TryExcept', {'body': _children('body'),
+                                'handlers': _children('handlers'),
+                                'orelse': _children('orelse')}),
+    'TryFinally': ('TryFinally', {'body': _children('body'),
+                                  'finalbody': _children('finalbody')}),
+    'Tuple': ('Tuple', {'ctx': _CONTEXT, 'elts': _children('elts')}),
+    'UnaryOp': ('UnaryOp', {'op': '_UNARY_OP_CLASSES[node.op.__class__]',
+                            'operand': _child('operand')}),
+    'While': ('While', {'test': _child('test'),
+                        'body': _children('body'),
+                        'orelse': _children('orelse')}),
+}
+if sys.version_info >= (3, 5):
+    # Before, calls have starred and double starred arguments apart.
+    _FAST_VISITORS['Call'] = ('Call', {
+        'func': _child('func'),
+        'args': _children('args'),
+        'keywords': _children('keywords')})
+if PY3:
+    _FAST_VISITORS['Raise'] = ('Raise', {'exc': _optional_child('exc'),
+                                         'cause': _optional_child('cause'),
+                                         'traceback': 'Empty'})
+else:
+    _FAST_VISITORS['Raise'] = ('Raise', {'exc': _optional_child('type'),
+                                         'cause': _optional_child('inst'),
+                                         'traceback': _optional_child('tback')})
+
+
+def _visitor_name(ast_class_name):
+    return 'visit_' + REDIRECT.get(ast_class_name, ast_class_name).lower()
+
+
+# getargspec is deprecated where getfullargspec exists.
+_getargspec = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
+
+
+def _generate_visitor(ast_class, class_name, arguments, namespace):
+    """Generates the source of a visitor from its specification."""
+    cls = getattr(nodes, class_name)
+    parameters = _getargspec(cls.__init__).args[1:]
+    arguments = dict(arguments)
+    if 'lineno' in parameters:
+        if 'lineno' in ast_class._attributes:
+            arguments['lineno'] = 'node.lineno'
+            arguments['col_offset'] = 'node.col_offset'
+        else:
+            arguments['lineno'] = arguments['col_offset'] = 'None'
+    if set(arguments) != set(parameters):
+        raise ValueError('The arguments {0} given for {1} differ from its '
+                         'parameters {2}.'.format(sorted(arguments),
+                                                  class_name, parameters))
+    values = [arguments[parameter] for parameter in parameters]
+    namespace[class_name] = cls
+    if issubclass(cls, _BLOCK_CLASSES):
+        return ('def {name}(self, node):\n'
+                '    newnode = {cls}({values})\n'
+                '    _set_end_lineno(newnode)\n'
+                '    return newnode\n').format(
+                    name=_visitor_name(ast_class.__name__),
+                    cls=class_name,
+                    values=', '.join(values))
+    return ('def {name}(self, node):\n'
+            '    return {cls}({values})\n').format(
+                name=_visitor_name(ast_class.__name__),
+                cls=class_name,
+                values=', '.join(values))
+
+
+def _generate_visitors():
+    """Generates the visitors of FastTreeRebuilder.
+
+    Only the visitors of the ast classes of the running Python are
+    generated.
+    """
+    namespace = {
+        '_dispatch': {},
+        '_BIN_OP_CLASSES': _BIN_OP_CLASSES,
+        '_BOOL_OP_CLASSES': _BOOL_OP_CLASSES,
+        '_CMP_OP_CLASSES': _CMP_OP_CLASSES,
+        '_CONTEXTS': CONTEXTS,
+        '_UNARY_OP_CLASSES': _UNARY_OP_CLASSES,
+        '_set_end_lineno': _set_end_lineno,
+        'Empty': nodes.Empty,
+        'Load': astroid.Load,
+    }
+    sources = [_generate_visitor(getattr(ast, name), class_name,
+                                 arguments, namespace)
+               for name, (class_name, arguments)
+               in sorted(_FAST_VISITORS.items()) if hasattr(ast, name)]
+    six.exec_(compile('\n'.join(sources), '<astroid fast rebuilder>',
+                      'exec'), namespace)
+    visitors = {name: value for name, value in namespace.items()
+                if name.startswith('visit_')}
+    return visitors, namespace['_dispatch']
+
+
+class FastTreeRebuilder(TreeRebuilder):
+    """A faster rebuilder, building the same trees as TreeRebuilder.
+
+    The visitors of most nodes are generated at import time, as
+    straight-line code calling the constructors of the node classes
+    with positional arguments.  The visitors of all the ast classes are
+    found in a dispatch table, built once.
+    """
+
+    def visit(self, node):
+        try:
+            visit_method = _FAST_DISPATCH[node.__class__]
+        except KeyError:
+            return super(FastTreeRebuilder, self).visit(node)
+        return visit_method(self, node)
+
+    def visit_name(self, node):
+        """visit a Name node by returning a fresh instance of it"""
+        context = node.ctx.__class__
+        if context is ast.Load:
+            if node.id in BUILTIN_NAMES:
+                return nodes.NameConstant(BUILTIN_NAMES[node.id],
+                                          node.lineno, node.col_offset)
+            return nodes.Name(node.id, node.lineno, node.col_offset)
+        return super(FastTreeRebuilder, self).visit_name(node)
+
+    def visit_attribute(self, node):
+        """visit an Attribute node by returning a fresh instance of it"""
+        if node.ctx.__class__ is ast.Load:
+            return nodes.Attribute(node.attr,
+                                   _FAST_DISPATCH[node.value.__class__](
+                                       self, node.value),
+                                   node.lineno, node.col_offset)
+        return super(FastTreeRebuilder, self).visit_attribute(node)
+
+
+def _build_dispatch_table():
+    visitors, dispatch = _generate_visitors()
+    for name, visitor in visitors.items():
+        setattr(FastTreeRebuilder, name, visitor)
+    for ast_class in vars(ast).values():
+        if isinstance(ast_class, type) and issubclass(ast_class, ast.AST):
+            visitor = getattr(FastTreeRebuilder,
+                              _visitor_name(ast_class.__name__), None)
+            if visitor is not None:
+                # Plain functions, so that they're called the same way
+                # on Python 2 and 3.
+                dispatch[ast_class] = six.get_unbound_function(visitor)
+    return dispatch
+
+_FAST_DISPATCH = _build_dispatch_table()
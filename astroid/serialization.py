@@ -0,0 +1,330 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""A compact binary serialization format for astroid trees.
+
+The encoding of a node is driven by its class's ``_astroid_fields``
+and ``_other_fields``: a tree is written in postfix order, the values
+of a node's fields followed by a record naming its class, so that it
+can be read back with a stack of values.  Both directions work with
+explicit stacks, so the depth of a tree isn't bounded by the
+recursion limit.
+
+An encoded tree starts with the version of the format and the sizes
+of its sections, each of which is read at once: the names of the node
+classes used in it, the strings, a one-byte tag per value and the
+integers and floats of the values, in flat arrays.  Strings are
+written once and then referred to by their index.  The positions of a
+node are among the integers of its record, and the record is decoded
+by a constructor generated for its class, so that decoding takes one
+step per value and one call per node.
+"""
+
+import struct
+
+import six
+
+import astroid
+from astroid import exceptions
+from astroid import nodes
+
+
+MAGIC = b'ASTR'
+VERSION = 2
+
+# The attributes written for every node, in its record.
+POSITIONS = ('lineno', 'col_offset')
+
+(_NONE, _TRUE, _FALSE, _INT, _BIG_INT, _FLOAT, _COMPLEX, _TEXT, _BYTES,
+ _ELLIPSIS, _NOT_IMPLEMENTED, _EMPTY, _LOAD, _STORE, _DEL, _LIST, _TUPLE,
+ _NODE) = range(18)
+
+_CONTEXTS = (astroid.Load, astroid.Store, astroid.Del)
+_CONTEXT_TAGS = {context: _LOAD + code for code, context in enumerate(_CONTEXTS)}
+_CONTEXT_TYPE = type(astroid.Load)
+_NODE_CLASSES = {cls.__name__: cls for cls in nodes.ALL_NODE_CLASSES
+                 if isinstance(cls, type)}
+
+# The sizes of the sections: the names of the classes, the lengths of
+# the texts and the texts, the lengths of the byte strings and the
+# byte strings, the tags, the integers and the floats.
+_SECTIONS = struct.Struct('<8I')
+_HEADER_SIZE = len(MAGIC) + 1 + _SECTIONS.size
+
+# The integers are 32 bits wide, the larger ones are written as text.
+_MIN_INT, _MAX_INT = -2 ** 31, 2 ** 31 - 1
+# The integer standing for a missing position.
+_NO_POSITION = _MIN_INT
+
+# Markers on the encoder's stack, for the end of a container.
+_END_NODE = object()
+_END_SEQUENCE = object()
+
+# The constructors of the records of the node classes, by class name.
+_MAKERS = {}
+
+
+def _pack(code, values):
+    return struct.pack('<%d%s' % (len(values), code), *values)
+
+
+def _unpack(code, data):
+    return struct.unpack('<%d%s' % (len(data) // struct.calcsize(code), code),
+                         data)
+
+
+class _Writer(object):
+    """Writes the values of a tree in the sections of the format."""
+
+    def __init__(self):
+        self.tags = bytearray()
+        self.ints = []
+        self.floats = []
+        self.texts = []
+        self.binaries = []
+        self.strings = {}
+        self.classes = {}
+
+    def write_node(self, node):
+        self.tags.append(_NODE)
+        lineno, col_offset = node.lineno, node.col_offset
+        self.ints.extend((
+            self.classes.setdefault(node.__class__, len(self.classes)),
+            _NO_POSITION if lineno is None else lineno,
+            _NO_POSITION if col_offset is None else col_offset))
+
+    def write_string(self, tag, value, table):
+        key = (type(value), value)
+        index = self.strings.get(key)
+        if index is None:
+            index = self.strings[key] = len(table)
+            table.append(value)
+        self.tags.append(tag)
+        self.ints.append(index)
+
+    def write_value(self, value):
+        # pylint: disable=too-many-branches
+        tags = self.tags
+        if value is None:
+            tags.append(_NONE)
+        elif value is True:
+            tags.append(_TRUE)
+        elif value is False:
+            tags.append(_FALSE)
+        elif isinstance(value, six.integer_types):
+            if _MIN_INT <= value <= _MAX_INT:
+                tags.append(_INT)
+                self.ints.append(value)
+            else:
+                self.write_string(_BIG_INT, six.text_type(value), self.texts)
+        elif isinstance(value, float):
+            tags.append(_FLOAT)
+            self.floats.append(value)
+        elif isinstance(value, complex):
+            tags.append(_COMPLEX)
+            self.floats.extend((value.real, value.imag))
+        elif isinstance(value, six.text_type):
+            self.write_string(_TEXT, value, self.texts)
+        elif isinstance(value, six.binary_type):
+            self.write_string(_BYTES, value, self.binaries)
+        elif value is Ellipsis:
+            tags.append(_ELLIPSIS)
+        elif value is NotImplemented:
+            tags.append(_NOT_IMPLEMENTED)
+        elif isinstance(value, _CONTEXT_TYPE):
+            tags.append(_CONTEXT_TAGS[value])
+        else:
+            raise exceptions.SerializationError(
+                'Cannot serialize {value!r}.', value=value)
+
+    def sections(self):
+        classes = self.classes
+        return (b'\0'.join(cls.__name__.encode('ascii')
+                            for cls in sorted(classes, key=classes.get)),
+                _pack('I', [len(text) for text in self.texts]),
+                # Lone surrogates are valid in strings but not in UTF-8.
+                u''.join(self.texts).encode('utf-8', 'surrogatepass'),
+                _pack('I', [len(binary) for binary in self.binaries]),
+                b''.join(self.binaries),
+                bytes(self.tags),
+                _pack('i', self.ints),
+                _pack('d', self.floats))
+
+
+def dumps(node):
+    """Encode the tree rooted at *node* as bytes."""
+    writer = _Writer()
+    tags = writer.tags
+    to_visit = [node]
+    while to_visit:
+        value = to_visit.pop()
+        if value is _END_NODE:
+            writer.write_node(to_visit.pop())
+        elif value is _END_SEQUENCE:
+            tags.append(to_visit.pop())
+            writer.ints.append(to_visit.pop())
+        elif value is nodes.Empty:
+            tags.append(_EMPTY)
+        elif isinstance(value, nodes.BaseNode):
+            to_visit.extend((value, _END_NODE))
+            fields = value._astroid_fields + value._other_fields
+            to_visit.extend(getattr(value, field) for field in reversed(fields))
+        elif isinstance(value, (list, tuple)):
+            to_visit.extend((len(value),
+                             _LIST if isinstance(value, list) else _TUPLE,
+                             _END_SEQUENCE))
+            to_visit.extend(reversed(value))
+        else:
+            writer.write_value(value)
+    try:
+        sections = writer.sections()
+    except struct.error:
+        raise exceptions.SerializationError(
+            'A position is out of the range of the format.')
+    return b''.join((MAGIC, six.int2byte(VERSION),
+                     _SECTIONS.pack(*[len(section) for section in sections]))
+                    + sections)
+
+
+def _maker(name):
+    """Gets the constructor of the records of the node class *name*, and
+    the number of its fields."""
+    try:
+        return _MAKERS[name]
+    except KeyError:
+        pass
+    cls = _NODE_CLASSES.get(name)
+    if cls is None:
+        raise exceptions.SerializationError(
+            'Unknown node class {name}.', name=name)
+    fields = cls._astroid_fields + cls._other_fields
+    lines = ['def make(values, lineno, col_offset):',
+             '    node = new(cls)',
+             '    node.lineno = None if lineno == NO_POSITION else lineno',
+             '    node.col_offset = (None if col_offset == NO_POSITION',
+             '                       else col_offset)']
+    if fields:
+        lines.append('    {0}, = values'.format(
+            ', '.join('node.' + field for field in fields)))
+    lines.append('    return node')
+    namespace = {'new': cls.__new__, 'cls': cls, 'NO_POSITION': _NO_POSITION}
+    six.exec_(compile('\n'.join(lines), '<astroid record of %s>' % name,
+                      'exec'), namespace)
+    maker = _MAKERS[name] = (namespace['make'], len(fields))
+    return maker
+
+
+def _split(data, lengths):
+    parts = []
+    start = 0
+    for length in lengths:
+        parts.append(data[start:start + length])
+        start += length
+    if start != len(data):
+        raise IndexError(start)
+    return parts
+
+
+def _iterate(values):
+    iterator = iter(values)
+    return iterator, iterator.__next__ if six.PY3 else iterator.next
+
+
+def _decode(tags, makers, texts, binaries, ints, floats):
+    """Decodes the values of a tree, given the sections of its encoding."""
+    # pylint: disable=too-many-branches,too-many-statements
+    empty = nodes.Empty
+    load, store, delete = _CONTEXTS
+    ints, next_int = _iterate(ints)
+    floats, next_float = _iterate(floats)
+    stack = []
+    push = stack.append
+    for tag in tags:
+        if tag == _NODE:
+            make, count = makers[next_int()]
+            lineno = next_int()
+            col_offset = next_int()
+            if count:
+                values = stack[-count:]
+                del stack[-count:]
+            else:
+                values = ()
+            push(make(values, lineno, col_offset))
+        elif tag == _TEXT:
+            push(texts[next_int()])
+        elif tag == _TUPLE:
+            count = next_int()
+            if count:
+                values = tuple(stack[-count:])
+                del stack[-count:]
+            else:
+                values = ()
+            push(values)
+        elif tag == _EMPTY:
+            push(empty)
+        elif tag == _LOAD:
+            push(load)
+        elif tag == _NONE:
+            push(None)
+        elif tag == _INT:
+            push(next_int())
+        elif tag == _STORE:
+            push(store)
+        elif tag == _LIST:
+            count = next_int()
+            if count:
+                values = stack[-count:]
+                del stack[-count:]
+            else:
+                values = []
+            push(values)
+        elif tag == _TRUE:
+            push(True)
+        elif tag == _FALSE:
+            push(False)
+        elif tag == _FLOAT:
+            push(next_float())
+        elif tag == _BYTES:
+            push(binaries[next_int()])
+        elif tag == _DEL:
+            push(delete)
+        elif tag == _BIG_INT:
+            push(int(texts[next_int()]))
+        elif tag == _COMPLEX:
+            push(complex(next_float(), next_float()))
+        elif tag == _ELLIPSIS:
+            push(Ellipsis)
+        elif tag == _NOT_IMPLEMENTED:
+            push(NotImplemented)
+        else:
+            raise exceptions.SerializationError('Unknown tag {tag}.', tag=tag)
+    if (len(stack) != 1 or next(ints, None) is not None
+            or next(floats, None) is not None):
+        raise exceptions.SerializationError('Truncated or corrupted data.')
+    return stack[0]
+
+
+def loads(data):
+    """Decode a tree encoded by :func:`dumps`."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise exceptions.SerializationError('Not an encoded tree.')
+    try:
+        version = six.indexbytes(data, len(MAGIC))
+        if version != VERSION:
+            raise exceptions.SerializationError(
+                'Unsupported format version {version}.', version=version)
+        sizes = _SECTIONS.unpack_from(data, len(MAGIC) + 1)
+        if _HEADER_SIZE + sum(sizes) != len(data):
+            raise IndexError(len(data))
+        sections = _split(data[_HEADER_SIZE:], sizes)
+        (names, text_lengths, text, binary_lengths, binary, tags, ints,
+         floats) = sections
+        makers = [_maker(name.decode('ascii'))
+                  for name in (names.split(b'\0') if names else ())]
+        return _decode(bytearray(tags), makers,
+                       _split(text.decode('utf-8', 'surrogatepass'),
+                              _unpack('I', text_lengths)),
+                       _split(binary, _unpack('I', binary_lengths)),
+                       _unpack('i', ints), _unpack('d', floats))
+    except (IndexError, StopIteration, struct.error, UnicodeDecodeError):
+        raise exceptions.SerializationError('Truncated or corrupted data.')
@@ -0,0 +1,60 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the benchmark suite"""
+
+import json
+import unittest
+
+import six
+
+from astroid import benchmarks
+
+
+class BenchmarksTest(unittest.TestCase):
+
+    def test_run(self):
+        sources = [benchmarks.deep_source(5, 5), benchmarks.wide_source(5),
+                   benchmarks.Source('invalid', 'def (')]
+        results = benchmarks.run(sources, repeat=2)
+        self.assertEqual(results['corpus']['modules'], ['deep', 'wide'])
+        self.assertEqual(results['corpus']['skipped'], ['invalid'])
+        self.assertIn('parse', results['benchmarks'])
+        self.assertIn('rebuild', results['benchmarks'])
+        memory = results['memory']
+        self.assertGreater(memory['nodes'], 0)
+        self.assertGreater(memory['estimated_size'], memory['nodes'])
+        if six.PY2:
+            self.assertIsNone(memory['retained'])
+        else:
+            self.assertGreater(memory['retained'], 0)
+        for result in results['benchmarks'].values():
+            self.assertEqual(len(result['times']), 2)
+            self.assertGreater(result['operations'], 0)
+            if six.PY2:
+                self.assertIsNone(result['peak_memory'])
+            else:
+                self.assertGreater(result['peak_memory'], 0)
+        json.dumps(results)
+
+    def test_names(self):
+        results = benchmarks.run([benchmarks.wide_source(2)], repeat=1,
+                                 names=['scope', 'frame'])
+        self.assertEqual(sorted(results['benchmarks']), ['frame', 'scope'])
+
+    def test_setup(self):
+        calls = []
+        times = benchmarks._time(lambda: calls.append('run'),
+                                 lambda: calls.append('setup'), 2, 3)
+        self.assertEqual(len(times), 2)
+        self.assertEqual(calls, ['setup', 'run'] * 6)
+
+    def test_stdlib_sources(self):
+        sources = benchmarks.stdlib_sources(2)
+        self.assertEqual(len(sources), 2)
+        for source in sources:
+            self.assertIsInstance(source.code, six.text_type)
+
+
+if __name__ == '__main__':
+    unittest.main()
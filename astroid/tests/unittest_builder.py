@@ -4,7 +4,9 @@
 """tests for the astroid builder and rebuilder module"""
 
 import os
+import shutil
 import sys
+import tempfile
 import unittest
 
 import six
@@ -12,6 +14,7 @@ import six
 from astroid import builder
 from astroid import exceptions
 from astroid import nodes
+from astroid import rebuilder
 from astroid import test_utils
 from astroid.tests import resources
 
@@ -263,6 +266,41 @@ class FromToLineNoTest(unittest.TestCase):
         self.assertEqual(with_.tolineno, 4)
         self.assertEqual(with_.blockstart_tolineno, 3)
 
+    @staticmethod
+    def _last_descendant_lineno(node):
+        while node:
+            children = [child for child in node if child]
+            if not children:
+                break
+            node = children[-1]
+        return node.lineno
+
+    def test_stored_end_linenos(self):
+        blocks = (nodes.Module, nodes.FunctionDef, nodes.ClassDef, nodes.If,
+                  nodes.For, nodes.While, nodes.With, nodes.TryExcept,
+                  nodes.TryFinally, nodes.ExceptHandler)
+        for location in self.astroid.preorder_descendants():
+            if location and isinstance(location, blocks):
+                self.assertEqual(location.__wrapped__.end_lineno,
+                                 self._last_descendant_lineno(location))
+        for location in self.astroid.preorder_descendants():
+            if location and isinstance(location, nodes.BaseNode):
+                self.assertEqual(location.tolineno,
+                                 self._last_descendant_lineno(location))
+                self.assertEqual(location.end_lineno, location.tolineno)
+
+    def test_lazy_end_linenos(self):
+        module = builder.parse('''
+            def function(a):
+                return (a +
+                        1)
+            ''', lazy=(nodes.FunctionDef,))
+        function = module.body[0]
+        self.assertFalse(hasattr(function, 'end_lineno'))
+        self.assertEqual(function.tolineno, 4)
+        self.assertEqual(function.end_lineno, 4)
+        self.assertEqual(function.body[0].end_lineno, 4)
+
 
 class BuilderTest(unittest.TestCase):
 
@@ -332,6 +370,301 @@ class BuilderTest(unittest.TestCase):
         self.assertEqual(chain.value, 'None')
 
 
+class ParseManyTest(unittest.TestCase):
+
+    SOURCES = [('def f(a, b=1, *args, **kwargs):\n    del a.b\n', 'first'),
+               ('x = [i for i in range(3) if i]\n', 'second'),
+               ('class A(object):\n    """doc"""\n', 'third', 'third.py')]
+
+    def test_ordered(self):
+        expected = [builder.parse(*source) for source in self.SOURCES]
+        for workers in (1, 2):
+            modules = list(builder.parse_many(self.SOURCES, workers=workers))
+            self.assertEqual(modules, expected)
+            self.assertEqual([m.name for m in modules],
+                             ['first', 'second', 'third'])
+
+    def test_unordered(self):
+        modules = builder.parse_many(self.SOURCES, workers=2, ordered=False)
+        self.assertEqual(sorted(m.name for m in modules),
+                         ['first', 'second', 'third'])
+
+    def test_paths(self):
+        path = resources.find('data/module2.py')
+        module, = builder.parse_many([path], workers=2)
+        self.assertEqual(module.name, 'module2')
+        self.assertEqual(module.source_file, os.path.abspath(path))
+        with open(path) as stream:
+            self.assertEqual(module.body, builder.parse(stream.read()).body)
+
+    def test_syntax_error(self):
+        modules = builder.parse_many([('x = (', 'broken')], workers=2)
+        with self.assertRaises(exceptions.AstroidSyntaxError):
+            list(modules)
+
+
+class ParseFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _write(self, data, name='mod.py'):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as stream:
+            stream.write(data)
+        return path
+
+    def test_source(self):
+        path = resources.find('data/module.py')
+        module = builder.parse_file(path)
+        with open(path, 'rb') as stream:
+            data = stream.read()
+        self.assertEqual(module.name, 'module')
+        self.assertEqual(module.source_file, os.path.abspath(path))
+        self.assertEqual(module.source_code, data)
+        self.assertEqual(module.stream().read(), data)
+        with open(path) as stream:
+            self.assertEqual(module.body, builder.parse(stream.read()).body)
+
+    def test_declared_encoding(self):
+        path = self._write(u'# -*- coding: latin-1 -*-\n'
+                           u'x = u"\xe9t\xe9"\n'.encode('latin-1'))
+        module = builder.parse_file(path, 'data.mod')
+        self.assertEqual(module.name, 'data.mod')
+        self.assertEqual(module.file_encoding.lower().replace('_', '-'),
+                         'iso-8859-1' if six.PY3 else 'latin-1')
+        self.assertEqual(module.body[0].value.value, u'\xe9t\xe9')
+
+    def test_default_encoding(self):
+        module = builder.parse_file(self._write(b'x = 1'))
+        self.assertEqual(module.file_encoding, 'utf-8' if six.PY3 else 'ascii')
+        module = builder.parse_file(self._write(b'\xef\xbb\xbfx = 1\n'))
+        self.assertEqual(module.file_encoding,
+                         'utf-8-sig' if six.PY3 else 'utf-8')
+
+    def test_package(self):
+        module = builder.parse_file(resources.find('data/__init__.py'))
+        self.assertTrue(module.package)
+
+    def test_syntax_error(self):
+        for data in (b'x = (\n', b'x = 1\0\n'):
+            with self.assertRaises(exceptions.AstroidSyntaxError):
+                builder.parse_file(self._write(data))
+
+
+class LazyBodyTest(unittest.TestCase):
+
+    CODE = '''
+    x = 1
+
+    def function(a):
+        """docstring"""
+        global x
+        def inner():
+            return a
+        x = inner
+
+    class A(object):
+        def method(self):
+            return [b for b in self]
+    '''
+
+    def _is_built(self, node):
+        return not hasattr(node, '_lazy_body')
+
+    def test_functions(self):
+        module = builder.parse(self.CODE, lazy=(nodes.FunctionDef,))
+        function = module.body[1]
+        self.assertFalse(self._is_built(function))
+        self.assertTrue(self._is_built(module.body[2]))
+        self.assertFalse(self._is_built(module.body[2].body[0]))
+        self.assertEqual(function.doc, 'docstring')
+        self.assertEqual(function.argnames(), ['a'])
+        self.assertIsInstance(function.body[0], nodes.Global)
+        self.assertTrue(self._is_built(function))
+        self.assertFalse(self._is_built(function.body[1]))
+        self.assertIs(function.body, function.body)
+
+    def test_classes(self):
+        module = builder.parse(self.CODE,
+                               lazy=(nodes.FunctionDef, nodes.ClassDef))
+        cls = module.body[2]
+        self.assertFalse(self._is_built(cls))
+        self.assertEqual(cls.body[0].name, 'method')
+        self.assertFalse(self._is_built(cls.body[0]))
+
+    def test_same_tree(self):
+        expected = builder.parse(self.CODE)
+        for lazy in ((nodes.FunctionDef,), (nodes.ClassDef,),
+                     (nodes.FunctionDef, nodes.ClassDef)):
+            module = builder.parse(self.CODE, lazy=lazy)
+            self.assertEqual(
+                [n.__class__ for n in module.preorder_descendants()],
+                [n.__class__ for n in expected.preorder_descendants()])
+            self.assertEqual(builder.parse(self.CODE, lazy=lazy), expected)
+
+    def test_missing_attribute(self):
+        function = builder.parse(self.CODE, lazy=(nodes.FunctionDef,)).body[1]
+        with self.assertRaises(AttributeError):
+            function.missing
+
+
+class FastTreeRebuilderTest(unittest.TestCase):
+
+    def assertSameTree(self, code, **kws):
+        expected = builder.parse(code, **kws)
+        module = builder.parse(
+            code, rebuilder_class=rebuilder.FastTreeRebuilder, **kws)
+        self.assertEqual(module, expected)
+        self.assertEqual(
+            [(n.__class__, n.lineno, n.col_offset)
+             for n in module.preorder_descendants()
+             if isinstance(n, nodes.BaseNode)],
+            [(n.__class__, n.lineno, n.col_offset)
+             for n in expected.preorder_descendants()
+             if isinstance(n, nodes.BaseNode)])
+
+    def test_files(self):
+        directory = os.path.dirname(os.path.dirname(__file__))
+        names = [os.path.join(directory, name)
+                 for name in os.listdir(directory) if name.endswith('.py')]
+        names.append(resources.find('data/module.py'))
+        for name in names:
+            with open(name) as stream:
+                self.assertSameTree(stream.read())
+
+    def test_contexts(self):
+        self.assertSameTree('''
+        a, [b, c] = d[1:2, ...] = e.f = None, True, g
+        del a.b, c[d], e
+        a.b += not -c if d in e else (f for f in g if f)
+        ''')
+
+    @unittest.skipIf(sys.version_info < (3, 5), "needs Python 3.5")
+    def test_python3(self):
+        self.assertSameTree('''
+        async def f(*args, a: int = 1, **kwargs) -> None:
+            nonlocal x
+            async for a in b:
+                await c(*a, *b, d=1, **e)
+            raise f from g
+        print(*[*a, *b], {**c, 'd': 1}, {a, *b})
+        ''')
+
+    def test_lazy(self):
+        with open(resources.find('data/module.py')) as stream:
+            self.assertSameTree(stream.read(),
+                                lazy=(nodes.FunctionDef, nodes.ClassDef))
+
+    def test_tuples(self):
+        with open(resources.find('data/module.py')) as stream:
+            code = stream.read()
+        for rebuilder_class in (rebuilder.TreeRebuilder,
+                                rebuilder.FastTreeRebuilder):
+            module = builder.parse(code, rebuilder_class=rebuilder_class)
+            for location in module.preorder_descendants():
+                self.assertNotIsInstance(location, list)
+                for field in getattr(location, '_other_fields', ()):
+                    self.assertNotIsInstance(getattr(location, field), list)
+
+
+class ReparseTest(unittest.TestCase):
+
+    CODE = '''"""docstring"""
+import os
+
+def function(a, b=None):
+    """docstring"""
+    x = a + 1
+    # comment
+    if b:
+        return x
+
+    return [y for y in os.listdir(a)]
+
+class A(object):
+    @staticmethod
+    def method(c):
+        return c
+
+    attribute = 1; other = 2
+
+z = function(1)
+'''
+
+    def _edit(self, start_line, end_line, lines):
+        """Replaces lines of CODE and reparses the result."""
+        old_lines = self.CODE.splitlines(True)
+        new_code = ''.join(old_lines[:start_line - 1] + lines
+                           + old_lines[end_line:])
+        old = builder.parse(self.CODE, 'mod', 'mod.py')
+        new = builder.reparse(old, self.CODE, new_code, start_line, end_line)
+        expected = builder.parse(new_code, 'mod', 'mod.py')
+        self.assertEqual(new, expected)
+        self.assertEqual(
+            [(type(n), n.lineno, n.col_offset)
+             for n in new.preorder_descendants()
+             if isinstance(n, nodes.BaseNode)],
+            [(type(n), n.lineno, n.col_offset)
+             for n in expected.preorder_descendants()
+             if isinstance(n, nodes.BaseNode)])
+        return old, new
+
+    def test_nested_edit(self):
+        old, new = self._edit(6, 6, ['    x = a + 2\n'])
+        self.assertIs(new.body[0], old.body[0])
+        function = new.body[1]
+        self.assertIsNot(function, old.body[1])
+        self.assertIs(function.args, old.body[1].args)
+        self.assertIsNot(function.body[0],
+                         old.body[1].body[0])
+        self.assertIs(function.body[1],
+                      old.body[1].body[1])
+        self.assertIs(new.body[2], old.body[2])
+
+    def test_added_lines(self):
+        old, new = self._edit(10, 10, ['\n', '    del x\n', '\n'])
+        self.assertIs(new.body[1].body[0],
+                      old.body[1].body[0])
+        self.assertEqual(new.body[-1].lineno, old.body[-1].lineno + 2)
+
+    def test_removed_lines(self):
+        self._edit(7, 9, ['    return x\n'])
+        self._edit(13, 17, [])
+
+    def test_method_edit(self):
+        old, new = self._edit(16, 16, ['        return c * 2\n'])
+        self.assertIs(new.body[2].body[1],
+                      old.body[2].body[1])
+
+    def test_shared_line(self):
+        self._edit(18, 18, ['    attribute = 3; other = 4\n'])
+
+    def test_top_level_edit(self):
+        old, new = self._edit(20, 20, ['z = function(2)\n', 'w = z\n'])
+        self.assertIs(new.body[1], old.body[1])
+
+    def test_structural_edits(self):
+        # Dedenting a statement out of its function.
+        self._edit(11, 11, ['return [y for y in os.listdir(a)]\n'])
+        # Editing a function's header or docstring.
+        self._edit(4, 4, ['def function(a, b=None, c=None):\n'])
+        self._edit(5, 5, ['    """other docstring"""\n'])
+        # Adding a docstring.
+        self._edit(2, 2, ['"""docstring"""\n'])
+        self._edit(13, 14, ['class A(object):\n', '    "doc"\n',
+                            '    @staticmethod\n'])
+        # Adding a future import.
+        self._edit(1, 1, ['from __future__ import division\n'])
+
+    def test_syntax_error(self):
+        module = builder.parse(self.CODE)
+        with self.assertRaises(exceptions.AstroidSyntaxError):
+            builder.reparse(module, self.CODE,
+                            self.CODE.replace('x = a + 1', 'x = (a + 1'), 6, 6)
+
+
 class FileBuildTest(unittest.TestCase):
     def setUp(self):
         self.module, self.nodes = resources.module()
@@ -0,0 +1,137 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the persistent cache of built modules"""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from astroid import builder
+from astroid import cache
+from astroid import exceptions
+from astroid import nodes
+from astroid import serialization
+
+
+CODE = '''
+def function(a, b=None, *args, **kwargs):
+    """docstring"""
+    del a.attr
+    return [x for x in args if x] + (b or [])
+'''
+
+
+class ModuleCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = cache.ModuleCache(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _forbid_building(self):
+        def _parse(string):
+            raise AssertionError('the module was built again')
+        original = builder._parse
+        builder._parse = _parse
+        self.addCleanup(setattr, builder, '_parse', original)
+
+    def _forbid_serializing(self):
+        def dumps(node):
+            raise exceptions.SerializationError('Cannot serialize.')
+        original = serialization.dumps
+        serialization.dumps = dumps
+        self.addCleanup(setattr, serialization, 'dumps', original)
+
+    def _warnings(self):
+        """Gets the list where the warnings of the cache are recorded."""
+        records = []
+        handler = logging.Handler(logging.WARNING)
+        handler.emit = records.append
+        logger = logging.getLogger('astroid.cache')
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        return records
+
+    def test_hit(self):
+        module = builder.parse(CODE, 'mod', 'mod.py', cache=self.cache)
+        self._forbid_building()
+        cached = builder.parse(CODE, 'mod', 'mod.py', cache=self.cache)
+        self.assertEqual(cached, module)
+        self.assertIsNot(cached.__wrapped__, module.__wrapped__)
+        self.assertIs(cached.body[0].returns, nodes.Empty)
+
+    def test_key(self):
+        key = self.cache.key(CODE, 'mod', 'mod.py')
+        self.assertEqual(key, self.cache.key(CODE, 'mod', 'mod.py'))
+        self.assertNotEqual(key, self.cache.key(CODE + 'x = 1', 'mod', 'mod.py'))
+        self.assertNotEqual(key, self.cache.key(CODE, 'other', 'mod.py'))
+        self.assertNotEqual(key, self.cache.key(CODE, 'mod', 'other.py'))
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get(self.cache.key(CODE, 'mod', None)))
+        builder.parse(CODE, 'mod', cache=self.cache)
+        self.assertIsNone(self.cache.get(self.cache.key(CODE, 'other', None)))
+
+    def test_corrupted_entry(self):
+        key = self.cache.key(CODE, 'mod', None)
+        builder.parse(CODE, 'mod', cache=self.cache)
+        with open(os.path.join(self.directory, key[:2], key[2:]), 'wb') as stream:
+            stream.write(b'garbage')
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(builder.parse(CODE, 'mod', cache=self.cache),
+                         builder.parse(CODE, 'mod'))
+
+    def test_failed_write(self):
+        # A directory which can't be made, under a file.
+        blocker = os.path.join(self.directory, 'file')
+        open(blocker, 'w').close()
+        failing = cache.ModuleCache(os.path.join(blocker, 'cache'))
+        warnings = self._warnings()
+        module = builder.parse(CODE, 'mod', cache=failing)
+        self.assertEqual(len(warnings), 1)
+        self.assertEqual(module, builder.parse(CODE, 'mod'))
+        self.assertIsNone(failing.get(failing.key(CODE, 'mod', None)))
+
+    def test_failed_serialization(self):
+        expected = builder.parse(CODE, 'mod')
+        self._forbid_serializing()
+        warnings = self._warnings()
+        self.assertEqual(builder.parse(CODE, 'mod', cache=self.cache),
+                         expected)
+        self.assertEqual(len(warnings), 1)
+        self.assertIsNone(self.cache.get(self.cache.key(CODE, 'mod', None)))
+        sources = [(CODE, 'mod'), ('import os\n', 'other')]
+        for workers in (1, 2):
+            modules = list(builder.parse_many(sources, workers=workers,
+                                              cache=self.cache))
+            self.assertEqual(modules[0], expected)
+            self.assertEqual(modules[1], builder.parse('import os\n', 'other'))
+
+    def test_key_format_version(self):
+        key = self.cache.key(CODE, 'mod', 'mod.py')
+        version = serialization.VERSION
+        serialization.VERSION += 1
+        self.addCleanup(setattr, serialization, 'VERSION', version)
+        self.assertNotEqual(key, self.cache.key(CODE, 'mod', 'mod.py'))
+
+    def test_clear(self):
+        builder.parse(CODE, 'mod', cache=self.cache)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(self.cache.key(CODE, 'mod', None)))
+
+    def test_parse_many(self):
+        sources = [(CODE, 'first'), ('import os\n', 'second')]
+        expected = list(builder.parse_many(sources, workers=2, cache=self.cache))
+        self._forbid_building()
+        self.assertEqual(list(builder.parse_many(sources, workers=1,
+                                                 cache=self.cache)),
+                         expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
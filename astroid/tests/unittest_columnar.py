@@ -0,0 +1,168 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the columnar encoding of trees"""
+
+import unittest
+
+from astroid import builder
+from astroid import columnar
+from astroid import nodes
+from astroid import zipper
+
+
+CODE = '''
+import os.path as path
+from . import a, b as c
+
+def function(a, b=1, *args, **kwargs):
+    """docstring"""
+    x = a.b.c(b, -0.0, 'text', b'bytes')
+    for y in args:
+        if y:
+            continue
+    return [z for z in x if z] or kwargs
+
+class Class(Base):
+    attribute = {'key': (1, 2.0, None), 'other': [y]}
+
+    def method(self):
+        pass
+'''
+
+
+def _positions(location):
+    if isinstance(location, nodes.BaseNode):
+        return (location.lineno, location.col_offset)
+    return None
+
+
+def _cursor_positions(cursor):
+    if issubclass(cursor.node_class, nodes.BaseNode):
+        return (cursor.lineno, cursor.col_offset)
+    return None
+
+
+class ColumnarModuleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.module = builder.parse(CODE)
+        self.tree = columnar.ColumnarModule.from_module(self.module)
+
+    def test_round_trip(self):
+        module = self.tree.to_module()
+        self.assertIsInstance(module, nodes.Module)
+        self.assertEqual(module, self.module.__wrapped__)
+        built = zipper.Zipper(module).preorder_descendants()
+        self.assertEqual(
+            [_positions(location) for location in built],
+            [_positions(location)
+             for location in self.module.preorder_descendants()])
+
+    def test_columns(self):
+        locations = list(self.module.preorder_descendants())
+        self.assertEqual(len(self.tree), len(locations))
+        for index, location in enumerate(locations):
+            self.assertIs(columnar.KINDS[self.tree.kind[index]],
+                          location.__class__)
+        self.assertEqual(self.tree.parent[0], -1)
+        self.assertEqual(self.tree.depth[0], 0)
+        self.assertIn('function', self.tree.names)
+        self.assertEqual(self.tree.names.count('a'), 1)
+        self.assertEqual(self.tree.name_id('missing'), -1)
+        self.assertEqual(self.tree.names[self.tree.name_id('Class')], 'Class')
+
+    def test_subtree(self):
+        function = next(self.module.find_descendants_of_type(
+            nodes.FunctionDef))
+        cursor = next(self.tree.cursor().find_descendants_of_type(
+            nodes.FunctionDef))
+        self.assertEqual(cursor.node, function.__wrapped__)
+        self.assertEqual(self.tree.to_module(cursor.index),
+                         function.__wrapped__)
+
+    def test_count_kinds(self):
+        counts = self.tree.count_kinds()
+        self.assertEqual(counts[nodes.FunctionDef], 2)
+        self.assertEqual(counts[nodes.ClassDef], 1)
+        self.assertEqual(sum(counts.values()), len(self.tree))
+
+    def test_end(self):
+        ends = [self.tree.end(index) for index in range(len(self.tree))]
+        for index, end in enumerate(ends):
+            depth = self.tree.depth[index]
+            self.assertTrue(all(self.tree.depth[descendant] > depth
+                                for descendant in range(index + 1, end)))
+            self.assertTrue(end == len(self.tree)
+                            or self.tree.depth[end] <= depth)
+        self.assertEqual(ends[0], len(self.tree))
+
+    def test_nbytes(self):
+        self.assertGreater(self.tree.nbytes(), len(self.tree))
+
+    def test_unknown_class(self):
+        with self.assertRaises(TypeError):
+            columnar.ColumnarModule.from_module([object()])
+
+
+class ColumnarCursorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.module = builder.parse(CODE)
+        self.tree = columnar.ColumnarModule.from_module(self.module)
+
+    def test_preorder_descendants(self):
+        locations = list(self.module.preorder_descendants())
+        cursors = list(self.tree.cursor().preorder_descendants())
+        self.assertEqual([location.__class__ for location in locations],
+                         [cursor.node_class for cursor in cursors])
+        self.assertEqual([_positions(location) for location in locations],
+                         [_cursor_positions(cursor) for cursor in cursors])
+
+    def test_dont_recurse_on(self):
+        locations = list(self.module.preorder_descendants(nodes.FunctionDef))
+        cursors = list(self.tree.cursor().preorder_descendants(
+            nodes.FunctionDef))
+        self.assertEqual([location.__class__ for location in locations],
+                         [cursor.node_class for cursor in cursors])
+        self.assertFalse(any(issubclass(cursor.node_class, nodes.Return)
+                             for cursor in cursors))
+
+    def test_moves(self):
+        root = self.tree.cursor()
+        self.assertIs(root.node_class, nodes.Module)
+        self.assertIsNone(root.up())
+        self.assertIsNone(root.right())
+        body = root.down()
+        self.assertIs(body.node_class, tuple)
+        first = body.down()
+        self.assertIs(first.node_class, nodes.Import)
+        self.assertEqual(first.up(), body)
+        self.assertIsNone(first.left())
+        second = first.right()
+        self.assertIs(second.node_class, nodes.ImportFrom)
+        self.assertEqual(second.left(), first)
+        self.assertEqual(second.modname, '')
+        self.assertEqual(second.level, 1)
+        self.assertEqual(second.root(), root)
+        self.assertEqual([child.node_class for child in body.children()],
+                         [nodes.Import, nodes.ImportFrom, nodes.FunctionDef,
+                          nodes.ClassDef])
+
+    def test_attributes(self):
+        names = [cursor.name for cursor in
+                 self.tree.cursor().find_descendants_of_type(nodes.Name)]
+        self.assertIn('kwargs', names)
+        constants = [cursor.value for cursor in
+                     self.tree.cursor().find_descendants_of_type(nodes.Const)]
+        self.assertIn('text', constants)
+        self.assertIn(2.0, constants)
+        cursor = next(self.tree.cursor().nodes_of_class(nodes.Attribute))
+        self.assertEqual(cursor.attrname, 'c')
+        self.assertEqual(cursor.lineno, 7)
+        with self.assertRaises(AttributeError):
+            cursor.missing
+
+
+if __name__ == '__main__':
+    unittest.main()
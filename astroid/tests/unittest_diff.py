@@ -0,0 +1,81 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the structural differences between trees"""
+
+import unittest
+
+from astroid import builder
+from astroid import diff
+from astroid import nodes
+
+
+CODE = '''
+import os
+
+def first(a):
+    return a + 1
+
+def second(b):
+    if b:
+        return b * 2
+    return None
+
+class Third(object):
+    def method(self):
+        pass
+'''
+
+
+def _summary(changes):
+    return [(change.kind,
+             change.old and change.old.as_string(),
+             change.new and change.new.as_string())
+            for change in changes]
+
+
+class DiffTest(unittest.TestCase):
+
+    def diff(self, new_code):
+        return diff.diff_modules(builder.parse(CODE), builder.parse(new_code))
+
+    def test_identical(self):
+        self.assertEqual(self.diff(CODE), [])
+
+    def test_moved_lines(self):
+        self.assertEqual(self.diff('\n\n' + CODE), [])
+
+    def test_modified(self):
+        changes = self.diff(CODE.replace('b * 2', 'b * 3'))
+        self.assertEqual(_summary(changes), [(diff.MODIFIED, '2', '3')])
+        self.assertEqual(changes[0].old.frame().name, 'second')
+        self.assertEqual(changes[0].new.lineno, 9)
+
+    def test_renamed(self):
+        changes = self.diff(CODE.replace('def first', 'def other'))
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].kind, diff.MODIFIED)
+        self.assertIsInstance(changes[0].old, nodes.FunctionDef)
+        self.assertEqual(changes[0].new.name, 'other')
+
+    def test_inserted_and_deleted(self):
+        new_code = CODE.replace('import os\n', '').replace(
+            '    return None\n', '    print(b)\n    return None\n')
+        changes = self.diff(new_code)
+        self.assertEqual(_summary(changes),
+                         [(diff.DELETED, 'import os', None),
+                          (diff.INSERTED, None, 'print(b)')])
+        self.assertIsNone(changes[0].new)
+        self.assertIsNone(changes[1].old)
+
+    def test_reparsed(self):
+        old = builder.parse(CODE)
+        new_code = CODE.replace('pass', 'return self')
+        new = builder.reparse(old, CODE, new_code, 14, 14)
+        changes = diff.diff_modules(old, new)
+        self.assertEqual(_summary(changes),
+                         [(diff.MODIFIED, 'pass', 'return self')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the structural hashes and the sharing of subtrees"""
+
+import sys
+import unittest
+
+from astroid import builder
+from astroid import hashconsing
+from astroid import nodes
+from astroid import transforms
+from astroid import zipper
+
+
+CODE = '''
+import os.path
+def function(argument, default=1.5):
+    """Documentation."""
+    if argument:
+        return argument.attribute + 1
+    return argument.attribute + 1
+'''
+
+
+class StructuralHashTest(unittest.TestCase):
+
+    def test_positions_ignored(self):
+        first = builder.parse(CODE)
+        second = builder.parse('\n\n' + CODE)
+        self.assertEqual(first.body[1].structural_hash,
+                         second.body[1].structural_hash)
+        function = first.body[1]
+        self.assertEqual(function.body[0].body[0].structural_hash,
+                         function.body[1].structural_hash)
+        self.assertNotEqual(function.body[0].structural_hash,
+                            function.body[1].structural_hash)
+
+    def test_values(self):
+        integer, real = builder.parse('1; 1.0').body
+        self.assertNotEqual(integer.structural_hash, real.structural_hash)
+
+    def test_deep_tree(self):
+        # Deeper than the rebuilder or a recursive walk could go.
+        node = nodes.Const(1)
+        for _ in range(sys.getrecursionlimit() * 2):
+            node = nodes.UnaryOp('-', node)
+        self.assertIsInstance(node.structural_hash, int)
+
+
+class ConsTableTest(unittest.TestCase):
+
+    def test_shared_between_modules(self):
+        table = hashconsing.ConsTable()
+        first = builder.parse(CODE, 'first', cons_table=table)
+        second = builder.parse('\n' + CODE, 'second', cons_table=table)
+        self.assertIs(first.body[1], second.body[1])
+        self.assertEqual(first.body, builder.parse(CODE).body)
+        report = table.report()
+        self.assertEqual(report['subtrees'], len(table))
+        self.assertGreater(report['hits'], 0)
+        table.clear()
+        self.assertEqual(len(table), 0)
+
+    def test_shared_in_module(self):
+        module = builder.parse(CODE, cons_table=hashconsing.ConsTable())
+        function = module.body[1]
+        self.assertIs(function.body[0].body[0], function.body[1])
+
+    def test_positions(self):
+        expected = builder.parse(CODE)
+        module = builder.parse(CODE, cons_table=hashconsing.ConsTable())
+        self.assertEqual(
+            [(n.__class__, n.lineno, n.col_offset)
+             for n in module.preorder_descendants()
+             if isinstance(n, nodes.BaseNode)],
+            [(n.__class__, n.lineno, n.col_offset)
+             for n in expected.preorder_descendants()
+             if isinstance(n, nodes.BaseNode)])
+
+    def test_line_properties(self):
+        expected = builder.parse(CODE)
+        module = builder.parse(CODE, cons_table=hashconsing.ConsTable())
+        for location, other in zip(module.preorder_descendants(),
+                                   expected.preorder_descendants()):
+            if isinstance(other, nodes.BaseNode):
+                self.assertEqual(location.fromlineno, other.fromlineno)
+                self.assertEqual(location.tolineno, other.tolineno)
+                self.assertEqual(location.block_range(other.fromlineno),
+                                 other.block_range(other.fromlineno))
+        location = next(module.find_descendants_of_type(nodes.If))
+        self.assertIsNone(location.__wrapped__.fromlineno)
+        self.assertIn(' l.5 ', repr(location))
+
+    def test_positions_kept_by_edits(self):
+        module = builder.parse(CODE, cons_table=hashconsing.ConsTable())
+        function = module.down().down().right()
+        edited = function.edit(name='other').root().down().down().right()
+        self.assertEqual(edited.name, 'other')
+        self.assertEqual((edited.lineno, edited.tolineno), (3, 7))
+        batch = zipper.Batch(module)
+        batch.replace(module.down().down(), nodes.Pass())
+        committed = batch.commit().down().down().right()
+        self.assertEqual((committed.lineno, committed.tolineno), (3, 7))
+
+    def test_positions_kept_by_transforms(self):
+        module = builder.parse(CODE, cons_table=hashconsing.ConsTable())
+        visitor = transforms.TransformVisitor()
+        visitor.register_transform(nodes.Const,
+                                   lambda node: node.copy(value=2))
+        transformed = zipper.Zipper(visitor.visit(module.__wrapped__))
+        self.assertIsNot(transformed.__wrapped__, module.__wrapped__)
+        constant = next(transformed.find_descendants_of_type(nodes.Const))
+        self.assertEqual(constant.value, 2)
+        self.assertEqual((constant.lineno, constant.col_offset), (3, 31))
+        self.assertEqual(transformed.down().down().right().tolineno, 7)
+
+    def test_reparse(self):
+        module = builder.parse(CODE, cons_table=hashconsing.ConsTable())
+        new_code = CODE.replace('argument.attribute + 1\n', 'argument\n')
+        reparsed = builder.reparse(module, CODE, new_code, 7, 7)
+        expected = builder.parse(new_code)
+        self.assertEqual(reparsed.body, expected.body)
+        self.assertIsNotNone(reparsed.position_table)
+        self.assertEqual(reparsed.down().down().right().tolineno, 7)
+
+    def test_common_ancestor(self):
+        module = builder.parse(CODE, cons_table=hashconsing.ConsTable())
+        first, second = module.find_descendants_of_type(nodes.Return)
+        inner = next(first.find_descendants_of_type(nodes.Const))
+        outer = next(second.find_descendants_of_type(nodes.Const))
+        self.assertIs(inner.__wrapped__, outer.__wrapped__)
+        ancestor = inner.common_ancestor(outer)
+        self.assertIsInstance(ancestor, tuple)
+        self.assertIsInstance(ancestor.up(), nodes.FunctionDef)
+
+    def test_position_table_required(self):
+        module = builder.parse(CODE)
+        table = hashconsing.ConsTable()
+        with self.assertRaises(ValueError):
+            table.cons_tree(module.__wrapped__)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the sharing of the values of trees"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from astroid import builder
+from astroid import interning
+from astroid import manager
+from astroid import nodes
+
+
+CODE = '''
+import os.path
+from collections import OrderedDict as Ordered
+def function(argument, default=1.5, text='a long string constant'):
+    """Documentation."""
+    return argument.attribute + 1000 + 0.0 + -0.0 + (1, 2.5)
+'''
+
+
+class InternerTest(unittest.TestCase):
+
+    def test_values(self):
+        interner = interning.Interner()
+        value = ''.join(['abc', 'def'])
+        self.assertIs(interner.intern(value), value)
+        self.assertIs(interner.intern(''.join(['abc', 'def'])), value)
+        number = int('12345678')
+        self.assertIs(interner.intern(number), number)
+        self.assertIs(interner.intern(int('12345678')), number)
+        # Equal values of different classes aren't confused.
+        self.assertIsInstance(interner.intern(12345678.0), float)
+        self.assertEqual(repr(interner.intern(0.0)), '0.0')
+        self.assertEqual(repr(interner.intern(-0.0)), '-0.0')
+        self.assertEqual(interner.intern((1, -0.0)), (1, -0.0))
+        self.assertEqual(repr(interner.intern((1, 0.0))), '(1, 0.0)')
+        mutable = [1]
+        self.assertIs(interner.intern(mutable), mutable)
+        report = interner.report()
+        self.assertGreaterEqual(report['hits'], 2)
+        self.assertGreater(report['bytes_saved'], 0)
+        self.assertEqual(report['values'], len(interner))
+        interner.clear()
+        self.assertEqual(len(interner), 0)
+        self.assertEqual(interner.report()['lookups'], 0)
+
+    def test_shared_between_modules(self):
+        interner = interning.Interner()
+        first = builder.parse(CODE, 'first', interner=interner)
+        second = builder.parse(CODE, 'second', interner=interner)
+        self.assertEqual(first.body, builder.parse(CODE).body)
+        pairs = zip(first.preorder_descendants(),
+                    second.preorder_descendants())
+        for node, other in pairs:
+            # The fields of modules aren't shared.
+            if (not isinstance(node, nodes.BaseNode)
+                    or isinstance(node, nodes.Module)):
+                continue
+            self.assertIs(node.lineno, other.lineno)
+            for field in node._other_fields:
+                value, other_value = getattr(node, field), getattr(other, field)
+                if isinstance(value, list):
+                    # Lists are mutable, only their elements are shared.
+                    for element, other_element in zip(value, other_value):
+                        self.assertIs(element, other_element)
+                else:
+                    self.assertIs(value, other_value)
+        self.assertGreater(interner.report()['bytes_saved'], 0)
+
+    def test_lazy_bodies(self):
+        interner = interning.Interner()
+        first = builder.parse(CODE, interner=interner,
+                              lazy=(nodes.FunctionDef,))
+        second = builder.parse(CODE, interner=interner,
+                               lazy=(nodes.FunctionDef,))
+        first_value = first.body[2].body[0].value.left.left.left.right
+        second_value = second.body[2].body[0].value.left.left.left.right
+        self.assertEqual(first_value.value, 1000)
+        self.assertIs(first_value.value, second_value.value)
+
+    def test_manager(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for name in ('first.py', 'second.py'):
+            with open(os.path.join(directory, name), 'w') as stream:
+                stream.write(CODE)
+        interner = interning.Interner()
+        astroid_manager = manager.AstroidManager(interner=interner)
+        first, second = [
+            astroid_manager.ast_from_file(os.path.join(directory, name))
+            for name in ('first.py', 'second.py')]
+        self.assertIs(first.body[2].doc, second.body[2].doc)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the indexes of the locations of the nodes"""
+
+import unittest
+
+from astroid import builder
+from astroid import hashconsing
+from astroid import locations
+from astroid import nodes
+
+
+CODE = '''
+def function(a):
+    values = [i for i in a]
+    return values
+
+class Class(object):
+    def method(self):
+        return 1
+    def other(self):
+        return 1
+'''
+
+
+class LocationIndexTest(unittest.TestCase):
+
+    def test_all_nodes(self):
+        module = builder.parse(CODE)
+        index = locations.LocationIndex(module.__wrapped__)
+        count = 0
+        for location in module.preorder_descendants():
+            node = location.__wrapped__
+            if not isinstance(node, nodes.BaseNode) or node is nodes.Empty:
+                continue
+            count += 1
+            found = index.zipper(node)
+            self.assertIs(found.__wrapped__, node)
+            self.assertIs(found.frame().__wrapped__,
+                          location.frame().__wrapped__)
+            self.assertIs(found.parent and found.parent.__wrapped__,
+                          location.parent and location.parent.__wrapped__)
+            self.assertIs(index.cursor(node).node, node)
+            self.assertIn(node, index)
+        self.assertEqual(len(index), count)
+
+    def test_path(self):
+        module = builder.parse(CODE)
+        index = locations.LocationIndex(module.__wrapped__)
+        method = module.body[1].body[0]
+        self.assertEqual(index.path(module.__wrapped__), ())
+        # The body of the module, the class, its body, the method.
+        self.assertEqual(index.path(method), (0, 1, 2, 0))
+
+    def test_missing(self):
+        module = builder.parse(CODE)
+        index = locations.LocationIndex(module.__wrapped__)
+        self.assertIsNone(index.path(nodes.Pass()))
+        self.assertIsNone(index.zipper(builder.parse(CODE).body[0]))
+        self.assertIsNone(index.cursor(nodes.Empty))
+        self.assertNotIn(nodes.Empty, index)
+
+    def test_shared(self):
+        module = builder.parse(CODE, cons_table=hashconsing.ConsTable())
+        _, first, second = module.find_descendants_of_type(nodes.Return)
+        self.assertIs(first.__wrapped__, second.__wrapped__)
+        found = locations.locate(module, second.__wrapped__)
+        self.assertEqual(found.frame().name, 'method')
+
+    def test_locate(self):
+        module = builder.parse(CODE, lazy=(nodes.FunctionDef,))
+        self.assertIsNone(module.location_index)
+        name = module.body[1].body[1].body[0].value
+        location = locations.locate(module, name)
+        self.assertEqual(location.frame().name, 'other')
+        index = module.location_index
+        self.assertIsInstance(index, locations.LocationIndex)
+        locations.locate(module, module.body[0])
+        self.assertIs(module.location_index, index)
+
+
+if __name__ == '__main__':
+    unittest.main()
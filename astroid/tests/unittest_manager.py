@@ -0,0 +1,113 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the manager of built modules"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from astroid import builder
+from astroid import exceptions
+from astroid import manager
+from astroid.tests import resources
+
+
+class AstroidManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _write(self, name, code):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as stream:
+            stream.write(code)
+        return path
+
+    def _touch(self, path, mtime):
+        os.utime(path, (mtime, mtime))
+
+    def test_cached(self):
+        path = self._write('mod.py', 'a = 1\n')
+        astroid_manager = manager.AstroidManager()
+        module = astroid_manager.ast_from_file(path)
+        self.assertEqual(module.name, 'mod')
+        self.assertIs(astroid_manager.ast_from_file(path), module)
+        self.assertIn(path, astroid_manager)
+
+    def test_invalidated_on_change(self):
+        path = self._write('mod.py', 'a = 1\n')
+        self._touch(path, 1000)
+        astroid_manager = manager.AstroidManager()
+        module = astroid_manager.ast_from_file(path)
+        # Same size, different modification time.
+        self._write('mod.py', 'b = 2\n')
+        self._touch(path, 2000)
+        changed = astroid_manager.ast_from_file(path)
+        self.assertIsNot(changed, module)
+        self.assertEqual(changed.body[0].targets[0].name, 'b')
+        # Same modification time, different size.
+        self._write('mod.py', 'c = 30\n')
+        self._touch(path, 2000)
+        self.assertEqual(
+            astroid_manager.ast_from_file(path).body[0].targets[0].name, 'c')
+
+    def test_invalidate(self):
+        path = self._write('mod.py', 'a = 1\n')
+        astroid_manager = manager.AstroidManager()
+        module = astroid_manager.ast_from_file(path)
+        astroid_manager.invalidate(path)
+        self.assertNotIn(path, astroid_manager)
+        self.assertIsNot(astroid_manager.ast_from_file(path), module)
+        astroid_manager.clear_cache()
+        self.assertEqual(len(astroid_manager), 0)
+        self.assertEqual(astroid_manager.used, 0)
+
+    def test_module_name(self):
+        astroid_manager = manager.AstroidManager()
+        directory = os.path.dirname(resources.find('data'))
+        module = astroid_manager.ast_from_module_name('data.module',
+                                                      [directory])
+        self.assertEqual(module.name, 'data.module')
+        self.assertFalse(module.package)
+        package = astroid_manager.ast_from_module_name('data', [directory])
+        self.assertEqual(package.name, 'data')
+        self.assertTrue(package.package)
+        with self.assertRaises(exceptions.AstroidImportError):
+            astroid_manager.ast_from_module_name('data.missing', [directory])
+
+    def test_node_budget(self):
+        paths = [self._write('mod%d.py' % i, 'a = [1, 2, 3]\n')
+                 for i in range(3)]
+        cost = manager.count_nodes(builder.parse('a = [1, 2, 3]\n'))
+        astroid_manager = manager.AstroidManager(max_nodes=2 * cost)
+        for path in paths:
+            astroid_manager.ast_from_file(path)
+        self.assertEqual(astroid_manager.used, 2 * cost)
+        self.assertNotIn(paths[0], astroid_manager)
+        # Using a module makes it the most recently used one.
+        astroid_manager.ast_from_file(paths[1])
+        astroid_manager.ast_from_file(paths[0])
+        self.assertIn(paths[1], astroid_manager)
+        self.assertNotIn(paths[2], astroid_manager)
+
+    def test_byte_budget(self):
+        small = self._write('small.py', 'a = 1\n')
+        large = self._write('large.py', 'a = 1\n' * 100)
+        astroid_manager = manager.AstroidManager(max_bytes=1)
+        astroid_manager.ast_from_file(small)
+        astroid_manager.ast_from_file(large)
+        # The last module is kept even though it exceeds the budget.
+        self.assertNotIn(small, astroid_manager)
+        self.assertIn(large, astroid_manager)
+        self.assertGreater(astroid_manager.used, 0)
+
+    def test_single_budget(self):
+        with self.assertRaises(ValueError):
+            manager.AstroidManager(max_nodes=1, max_bytes=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
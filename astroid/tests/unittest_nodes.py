@@ -15,8 +15,10 @@ import six
 import astroid
 from astroid import builder
 from astroid import exceptions
+from astroid import node_classes
 from astroid import nodes
 from astroid import parse
+from astroid import rebuilder
 from astroid import scope
 from astroid import test_utils
 from astroid.tests import resources
@@ -779,6 +781,89 @@ class FunctionNodeTest(unittest.TestCase):
         f = astroid.down().down()
         self.assertEqual(f.argnames(), ['a', 'b', 'c', 'args', 'kwargs'])
 
+    @test_utils.require_version('3.3')
+    def test_facts(self):
+        astroid = builder.parse('''
+            def f(a, *, b):
+                def nested():
+                    yield
+                    return 1
+                class Inner(object):
+                    x = lambda: (yield)
+                yield from b
+                yield b
+                return
+            ''', __name__)
+        f = astroid.body[0]
+        self.assertTrue(hasattr(f, '_facts'))
+        self.assertEqual(f.facts, node_classes.FunctionFacts(
+            argnames=('a', 'b'), yields=2, awaits=0, returns_value=False,
+            functions=2))
+        self.assertTrue(f.is_generator())
+        self.assertEqual(f.argnames(), ['a', 'b'])
+        self.assertEqual(f.body[0].facts, node_classes.FunctionFacts(
+            argnames=(), yields=1, awaits=0, returns_value=True,
+            functions=0))
+        self.assertEqual(f.body[1].body[0].value.facts.yields, 1)
+
+    @test_utils.require_version('3.5')
+    def test_coroutine_facts(self):
+        astroid = builder.parse('''
+            async def f(a):
+                await a
+                return await a
+            ''', __name__)
+        facts = astroid.body[0].facts
+        self.assertEqual((facts.awaits, facts.yields, facts.returns_value),
+                         (2, 0, True))
+
+    def test_counted_facts(self):
+        with open(resources.find('data/module2.py')) as stream:
+            code = stream.read()
+        for rebuilder_class in (rebuilder.TreeRebuilder,
+                                rebuilder.FastTreeRebuilder):
+            module = builder.parse(code, rebuilder_class=rebuilder_class)
+            functions = list(module.find_descendants_of_type(
+                (nodes.FunctionDef, nodes.Lambda)))
+            self.assertTrue(functions)
+            for function in functions:
+                self.assertEqual(function.facts,
+                                 node_classes.function_facts(function))
+
+    @test_utils.require_version('3.0')
+    def test_facts_of_enclosing_functions(self):
+        code = textwrap.dedent('''
+            def outer():
+                def inner(x=(yield)) -> (yield):
+                    pass
+            @dec(lambda f: f)
+            def decorated():
+                pass
+            def gen():
+                f = lambda x=(yield): 0
+            ''')
+        for lazy in ((), (nodes.FunctionDef,)):
+            module = builder.parse(code, lazy=lazy)
+            functions = {function.name: function for function
+                         in module.find_descendants_of_type(nodes.FunctionDef)}
+            self.assertEqual(functions['outer'].facts.yields, 2)
+            self.assertEqual(functions['outer'].facts.functions, 1)
+            self.assertFalse(functions['inner'].is_generator())
+            self.assertEqual(functions['decorated'].facts.functions, 0)
+            self.assertTrue(functions['gen'].is_generator())
+            for function in module.find_descendants_of_type(
+                    (nodes.FunctionDef, nodes.Lambda)):
+                self.assertEqual(function.facts,
+                                 node_classes.function_facts(function))
+
+    def test_lazy_facts(self):
+        astroid = builder.parse('def f(a):\n    yield a\n',
+                                lazy=(nodes.FunctionDef,))
+        f = astroid.body[0]
+        self.assertFalse(hasattr(f, '_facts'))
+        self.assertTrue(f.is_generator())
+        self.assertEqual(f.facts.argnames, ('a',))
+
 
 
 class ClassNodeTest(unittest.TestCase):
@@ -860,5 +945,45 @@ class ParameterTest(unittest.TestCase):
                                     kwarg_lineno=2, kwarg_col_offset=18)
 
 
+class SlotsTest(unittest.TestCase):
+
+    def test_no_instance_dictionaries(self):
+        module = builder.parse('''
+        @decorator
+        def function(a, b=1, *args, **kwargs):
+            return [x for x in a if x] or (lambda: b)
+        class Class(Base):
+            attribute = {1: 'a'}
+        ''', lazy=(nodes.ClassDef,))
+        for node in module.preorder_descendants():
+            if isinstance(node, nodes.BaseNode):
+                self.assertFalse(hasattr(node.__wrapped__, '__dict__'),
+                                 node.__class__.__name__)
+        with self.assertRaises(AttributeError):
+            module.body[0].undefined_attribute = None
+
+    def test_slots_match_fields(self):
+        for cls in vars(nodes).values():
+            if isinstance(cls, type) and issubclass(cls, nodes.BaseNode):
+                slots = set()
+                for klass in cls.__mro__:
+                    slots.update(klass.__dict__.get('__slots__', ()))
+                self.assertTrue(slots.issuperset(cls._astroid_fields
+                                                 + cls._other_fields),
+                                cls.__name__)
+
+    def test_class_defaults(self):
+        module = builder.parse('f = lambda: 1')
+        self.assertEqual(module.lineno, 0)
+        self.assertEqual(module.fromlineno, 0)
+        self.assertIsNone(module.col_offset)
+        self.assertEqual(nodes.Module.lineno, 0)
+        self.assertEqual(module.body[0].value.name, '<lambda>')
+        self.assertIsNone(nodes.Empty.lineno)
+        module.lineno = 1
+        self.assertEqual(module.lineno, 1)
+        self.assertEqual(nodes.Module.lineno, 0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,190 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the tables of the positions of nodes"""
+
+import unittest
+
+from astroid import builder
+from astroid import nodes
+from astroid import positions
+from astroid import transforms
+from astroid import zipper
+
+
+CODE = '''
+def function(a):
+    pass
+    for b in a:
+        if b:
+            break
+        continue
+    return a[...]
+pass
+'''
+
+
+class PositionTableTest(unittest.TestCase):
+
+    def test_table(self):
+        expected = builder.parse(CODE)
+        module = builder.parse(CODE, position_table=True)
+        table = module.position_table
+        self.assertIsInstance(table, positions.PositionTable)
+        self.assertIsNone(expected.position_table)
+        self.assertEqual(module.body, expected.body)
+        locations = list(module.preorder_descendants())
+        self.assertEqual(len(table), len(locations))
+        for ordinal, (location, other) in enumerate(
+                zip(locations, expected.preorder_descendants())):
+            self.assertEqual(table.ordinal(location), ordinal)
+            position = table[ordinal]
+            if isinstance(other, nodes.BaseNode):
+                self.assertEqual(position.lineno, other.lineno)
+                self.assertEqual(position.col_offset, other.col_offset)
+                self.assertEqual(location.lineno, other.lineno)
+                self.assertEqual(location.col_offset, other.col_offset)
+                self.assertEqual(position.end_lineno, other.tolineno)
+            else:
+                self.assertIsNone(position.lineno)
+                self.assertIsNone(position.end_lineno)
+
+    def test_flyweights(self):
+        module = builder.parse(CODE, position_table=True)
+        other = builder.parse(CODE, position_table=True)
+        first_pass, last_pass = module.body[0].body[0], module.body[1]
+        self.assertIs(first_pass, last_pass)
+        self.assertIs(first_pass, other.body[1])
+        self.assertIs(first_pass, positions.FLYWEIGHTS[nodes.Pass])
+        self.assertIsNone(first_pass.lineno)
+        locations = [location for location in module.preorder_descendants()
+                     if isinstance(location, nodes.Pass)]
+        self.assertEqual([(location.lineno, location.col_offset)
+                          for location in locations], [(3, 4), (9, 0)])
+        for cls in (nodes.Break, nodes.Continue, nodes.Ellipsis):
+            location, = module.find_descendants_of_type(cls)
+            self.assertIs(location.__wrapped__, positions.FLYWEIGHTS[cls])
+        self.assertEqual(next(module.find_descendants_of_type(
+            nodes.Break)).lineno, 6)
+
+    def test_edited(self):
+        module = builder.parse(CODE, position_table=True)
+        location = next(module.find_descendants_of_type(nodes.Pass))
+        self.assertEqual(location.lineno, 3)
+        edited = location.replace(nodes.Pass())
+        self.assertIsNone(edited.lineno)
+
+    def test_line_properties(self):
+        expected = builder.parse(CODE)
+        module = builder.parse(CODE, position_table=True)
+        for location, other in zip(module.preorder_descendants(),
+                                   expected.preorder_descendants()):
+            if isinstance(other, nodes.BaseNode):
+                self.assertEqual(location.fromlineno, other.fromlineno)
+                self.assertEqual(location.tolineno, other.tolineno)
+                self.assertEqual(location.block_range(other.fromlineno),
+                                 other.block_range(other.fromlineno))
+        location = next(module.find_descendants_of_type(nodes.Pass))
+        self.assertEqual((location.fromlineno, location.tolineno), (3, 3))
+        self.assertEqual(location.cursor().block_range(3), (3, 3))
+
+    def test_positions_kept_by_edits(self):
+        module = builder.parse(CODE, position_table=True)
+        location = next(module.find_descendants_of_type(nodes.Break))
+        edited = location.up().up().edit(test=nodes.Name('c')).root()
+        location = next(edited.find_descendants_of_type(nodes.Break))
+        self.assertEqual(location.lineno, 6)
+        self.assertEqual(edited.down().down().tolineno, 8)
+        batch = zipper.Batch(module)
+        batch.remove(module.down().down().right())
+        location = next(batch.commit().find_descendants_of_type(nodes.Pass))
+        self.assertEqual((location.lineno, location.col_offset), (3, 4))
+
+    def test_positions_kept_by_transforms(self):
+        module = builder.parse(CODE, position_table=True)
+        visitor = transforms.TransformVisitor()
+        visitor.register_transform(nodes.Name,
+                                   lambda node: node.copy(name='c'))
+        transformed = zipper.Zipper(visitor.visit(module.__wrapped__))
+        locations = list(transformed.find_descendants_of_type(nodes.Pass))
+        self.assertEqual([location.fromlineno for location in locations],
+                         [3, 9])
+        self.assertEqual(next(transformed.find_descendants_of_type(
+            nodes.Break)).lineno, 6)
+
+    def test_reparse(self):
+        module = builder.parse('pass\nx = 1\n', position_table=True)
+        reparsed = builder.reparse(module, 'pass\nx = 1\n',
+                                   'pass\nx = 2\n', 2, 2)
+        self.assertEqual(reparsed.body,
+                         builder.parse('pass\nx = 2\n').body)
+        self.assertEqual(reparsed.down().down().tolineno, 1)
+        self.assertEqual(reparsed.down().down().right().lineno, 2)
+
+    def test_lazy_bodies(self):
+        module = builder.parse(CODE, lazy=(nodes.FunctionDef,),
+                               position_table=True)
+        expected = builder.parse(CODE, position_table=True)
+        self.assertEqual(len(module.position_table),
+                         len(expected.position_table))
+
+
+INDEXED_CODE = '''
+import os
+
+def f(a, b=1):
+    values = [i for i in a
+              if i]
+    return values
+
+@dec
+class C(object):
+    def g(self): pass
+'''
+
+
+class PositionIndexTest(unittest.TestCase):
+
+    def _check_lookups(self, module):
+        index = positions.add_position_index(module)
+        self.assertIs(module.position_index, index)
+        parameter = index.node_at(4, 9)
+        self.assertIsInstance(parameter, nodes.Parameter)
+        self.assertIsInstance(index.statement_at(4, 9), nodes.FunctionDef)
+        self.assertEqual(index.scope_at(4, 9).name, 'f')
+        self.assertIsInstance(index.node_at(5, 14), nodes.Name)
+        self.assertIsInstance(index.statement_at(5, 14), nodes.Assign)
+        self.assertIsInstance(index.scope_at(5, 14), nodes.ListComp)
+        self.assertIsInstance(index.node_at(8, 0), nodes.Module)
+        self.assertIsInstance(index.statement_at(9, 1), nodes.ClassDef)
+        self.assertIsInstance(index.scope_at(9, 1), nodes.Module)
+        self.assertIsInstance(index.node_at(11), nodes.Pass)
+        self.assertEqual(index.scope_at(11).name, 'g')
+        self.assertIsNone(index.node_at(12, 0))
+        self.assertIsNone(index.statement_at(12))
+
+    def test_lookups(self):
+        self._check_lookups(builder.parse(INDEXED_CODE))
+
+    def test_position_table(self):
+        self._check_lookups(builder.parse(INDEXED_CODE, position_table=True))
+
+    def test_first_at(self):
+        index = positions.PositionIndex(builder.parse(INDEXED_CODE))
+        self.assertIsInstance(index.first_at(2), nodes.Import)
+        self.assertIsInstance(index.first_at(9), nodes.ClassDef)
+        self.assertIsNone(index.first_at(8))
+        index = positions.PositionIndex(builder.parse('@dec\ndef f(): pass'))
+        self.assertIsInstance(index.first_at(1), nodes.Decorators)
+        self.assertIsInstance(index.first_at(2), nodes.FunctionDef)
+
+    def test_zippers(self):
+        module = builder.parse(INDEXED_CODE)
+        index = positions.PositionIndex(module.__wrapped__)
+        location = index.node_at(7, 11)
+        self.assertEqual(location.name, 'values')
+        self.assertEqual(location.frame().name, 'f')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the queries over encoded trees"""
+
+import unittest
+
+from astroid import builder
+from astroid import columnar
+from astroid import nodes
+
+try:
+    from astroid import queries
+except ImportError:
+    # NumPy isn't installed.
+    queries = None
+
+
+CODE = '''
+def function(a, b):
+    print(a)
+    eval(b)
+    a.print(b)
+    for c in a:
+        if c:
+            exec(c, len(c))
+
+class Class(object):
+    def method(self):
+        self.a = 1
+        self.b = 2
+        return print
+'''
+
+OTHER_CODE = '''
+print(eval)
+'''
+
+
+@unittest.skipIf(queries is None, "needs NumPy")
+class QueryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.module = builder.parse(CODE)
+        self.tree = columnar.ColumnarModule.from_module(self.module)
+
+    def _walk(self, predicate):
+        return [location.__wrapped__
+                for location in self.module.preorder_descendants()
+                if predicate(location)]
+
+    def _find(self, query):
+        corpus = queries.Corpus([self.tree], [self.module])
+        return [location.__wrapped__ for location in corpus.find(query)]
+
+    def test_calls(self):
+        query = queries.Kind(nodes.Call) & queries.Field(
+            'func', queries.Kind(nodes.Name) & queries.Named('eval', 'exec',
+                                                             'print'))
+        expected = self._walk(
+            lambda location: isinstance(location, nodes.Call)
+            and isinstance(location.func, nodes.Name)
+            and location.func.name in ('eval', 'exec', 'print'))
+        self.assertEqual(len(expected), 3)
+        found = self._find(query)
+        self.assertEqual(len(found), 3)
+        for node, other in zip(found, expected):
+            self.assertIs(node, other)
+        self.assertEqual(query.count(self.tree), 3)
+
+    def test_depth_and_children(self):
+        query = (queries.Kind(nodes.FunctionDef) & queries.Depth(minimum=4)
+                 & queries.Field('body', queries.Children(minimum=3)))
+        found = self._find(query)
+        self.assertEqual([node.name for node in found], ['method'])
+        query = queries.Kind(nodes.FunctionDef) & queries.Field(
+            'body', queries.Children(maximum=2))
+        self.assertEqual(self._find(query), [])
+
+    def test_combinations(self):
+        names = queries.Kind(nodes.Name, nodes.Attribute)
+        printed = queries.Named('print')
+        self.assertEqual(len(self._find(names & printed)), 3)
+        self.assertEqual(len(self._find(names & ~printed)),
+                         len(self._find(names)) - 3)
+        self.assertEqual(len(self._find(queries.Kind(nodes.Return)
+                                        | queries.Kind(nodes.For))), 2)
+        self.assertEqual(self._find(queries.Named('missing')), [])
+
+    def test_parent(self):
+        query = queries.Kind(nodes.Const) & queries.Parent(
+            queries.Kind(nodes.Assign))
+        self.assertEqual([node.value for node in self._find(query)], [1, 2])
+
+    def test_corpus(self):
+        other = builder.parse(OTHER_CODE)
+        corpus = queries.Corpus.from_modules([self.module, other])
+        self.assertEqual(len(corpus), 2)
+        query = queries.Kind(nodes.Name) & queries.Named('eval')
+        found = list(corpus.find(query))
+        self.assertEqual(len(found), 2)
+        self.assertEqual(found[0].root(), self.module)
+        self.assertIs(found[1].__wrapped__, other.body[0].value.args[0])
+        self.assertEqual(corpus.count(queries.Named('print')), 4)
+
+    def test_corpus_without_modules(self):
+        other = columnar.ColumnarModule.from_module(builder.parse(OTHER_CODE))
+        corpus = queries.Corpus([self.tree, other])
+        found = list(corpus.find(queries.Kind(nodes.Call)
+                                 & queries.Depth(maximum=3)))
+        self.assertEqual([location.as_string() for location in found],
+                         ['print(eval)'])
+        location = corpus.location(len(self.tree))
+        self.assertIsInstance(location, nodes.Module)
+        self.assertEqual(location.body[0].as_string(), 'print(eval)')
+
+
+if __name__ == '__main__':
+    unittest.main()
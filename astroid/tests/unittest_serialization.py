@@ -0,0 +1,125 @@
+# Licensed under the LGPL: https://www.gnu.org/licenses/old-licenses/lgpl-2.1.en.html
+# For details: https://github.com/PyCQA/astroid/blob/master/COPYING.LESSER
+
+"""tests for the binary serialization of trees"""
+
+import os
+import unittest
+
+import six
+
+import astroid
+from astroid import builder
+from astroid import exceptions
+from astroid import nodes
+from astroid import serialization
+from astroid import zipper
+from astroid.tests import resources
+
+
+class SerializationTest(unittest.TestCase):
+
+    def assertRoundTrips(self, node):
+        data = serialization.dumps(node)
+        self.assertIsInstance(data, bytes)
+        copy = serialization.loads(data)
+        self.assertEqual(copy, node)
+        return copy
+
+    def test_files(self):
+        names = [resources.find('data/module.py'),
+                 resources.find('data/module2.py')]
+        directory = os.path.dirname(os.path.dirname(__file__))
+        names.extend(os.path.join(directory, name)
+                     for name in os.listdir(directory)
+                     if name.endswith('.py'))
+        for name in names:
+            with open(name) as stream:
+                module = builder.parse(stream.read(), 'module', name)
+            copy = self.assertRoundTrips(module)
+            self.assertEqual(copy.source_code, module.source_code)
+
+    def test_positions(self):
+        module = builder.parse('''
+        def function(a,
+                     b=1):
+            return a + b
+        ''')
+        copy = serialization.loads(serialization.dumps(module))
+        for expected, node in zip(module.preorder_descendants(),
+                                  zipper.Zipper(copy).preorder_descendants()):
+            if not isinstance(node, nodes.BaseNode):
+                continue
+            self.assertEqual(node.lineno, expected.lineno)
+            self.assertEqual(node.col_offset, expected.col_offset)
+
+    def test_missing_positions(self):
+        copy = self.assertRoundTrips(nodes.Const(1))
+        self.assertIsNone(copy.lineno)
+        self.assertIsNone(copy.col_offset)
+        copy = self.assertRoundTrips(nodes.Const(1, 3, -1))
+        self.assertEqual((copy.lineno, copy.col_offset), (3, -1))
+
+    def test_values(self):
+        values = [None, True, False, 0, 1, -1, 2 ** 31, -(2 ** 31),
+                  2 ** 70, -(2 ** 70), 1.5,
+                  float('inf'), 1 - 2j, u'text \u2019', b'bytes', Ellipsis,
+                  NotImplemented]
+        for value in values:
+            copy = self.assertRoundTrips(nodes.Const(value, 1, 0))
+            self.assertIs(type(copy.value), type(value))
+
+    def test_lone_surrogates(self):
+        module = self.assertRoundTrips(builder.parse(u"x = '\\ud800'\n"))
+        self.assertEqual(module.body[0].value.value, u'\ud800')
+        copy = self.assertRoundTrips(nodes.Const(u'a\udc00\ud800b', 1, 0))
+        self.assertEqual(copy.value, u'a\udc00\ud800b')
+
+    def test_containers(self):
+        node = nodes.Tuple(astroid.Store,
+                           [nodes.AssignName('a', 1, 0), nodes.Empty],
+                           1, 0)
+        copy = self.assertRoundTrips(
+            nodes.ImportFrom('module', [('a', None), ('b', 'c')], 2, 1, 0))
+        self.assertEqual(copy.names, [('a', None), ('b', 'c')])
+        copy = self.assertRoundTrips(node)
+        self.assertIs(copy.ctx, astroid.Store)
+        self.assertIsInstance(copy.elts, list)
+        self.assertIs(copy.elts[1], nodes.Empty)
+        copy = self.assertRoundTrips(nodes.Set((nodes.Const(1),), 1, 0))
+        self.assertIsInstance(copy.elts, tuple)
+
+    def test_shared_strings(self):
+        names = nodes.List(astroid.Load,
+                           [nodes.Name('identifier', i, 0) for i in range(100)])
+        data = serialization.dumps(names)
+        self.assertEqual(data.count(b'identifier'), 1)
+        copy = serialization.loads(data)
+        self.assertIs(copy.elts[0].name, copy.elts[-1].name)
+
+    def test_deep_tree(self):
+        depth = 10000
+        node = nodes.Const(0, 1, 0)
+        for _ in range(depth):
+            node = nodes.UnaryOp('-', node, 1, 0)
+        copy = serialization.loads(serialization.dumps(node))
+        for _ in range(depth):
+            self.assertIsInstance(copy, nodes.UnaryOp)
+            copy = copy.operand
+        self.assertEqual(copy.value, 0)
+
+    def test_unsupported_value(self):
+        with self.assertRaises(exceptions.SerializationError):
+            serialization.dumps(nodes.Const(object()))
+
+    def test_corrupted_data(self):
+        data = serialization.dumps(builder.parse('a = b.c(1, "d")'))
+        for corrupted in (b'', b'XXXX' + data[4:], data[:-3],
+                          data[:4] + six.int2byte(0) + data[5:],
+                          data + six.int2byte(255)):
+            with self.assertRaises(exceptions.SerializationError):
+                serialization.loads(corrupted)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,9 +7,12 @@ from __future__ import print_function
 import contextlib
 import unittest
 
+from astroid import diff
+from astroid import hashconsing
 from astroid import nodes
 from astroid import parse
 from astroid import transforms
+from astroid import zipper
 
 
 @contextlib.contextmanager
@@ -30,6 +33,106 @@ class TestTransforms(unittest.TestCase):
         module = parse(code, apply_transforms=False)
         return self.transformer.visit(module)
 
+    def test_shared_sequences(self):
+        def transform_pass(node):
+            return nodes.Continue(node.lineno, node.col_offset)
+
+        self.transformer.register_transform(nodes.Pass, transform_pass)
+        module = parse('''
+        def f():
+            pass
+        def g():
+            return 1
+        ''').__wrapped__
+        f, g = module.body
+        transformed = self.transformer.visit(module)
+        self.assertIsNot(transformed, module)
+        self.assertIs(transformed.body[1], g)
+        self.assertIs(transformed.body[0].args, f.args)
+        self.assertIsInstance(transformed.body, tuple)
+        self.assertIsInstance(transformed.body[0].body[0], nodes.Continue)
+        self.assertEqual(transformed.body[0].lineno, f.lineno)
+        # The tree given is left unchanged.
+        self.assertIs(module.body[0], f)
+        self.assertIsInstance(f.body[0], nodes.Pass)
+
+    def test_unchanged(self):
+        self.transformer.register_transform(nodes.Pass, lambda node: None)
+        module = parse('def f():\n    pass').__wrapped__
+        self.assertIs(self.transformer.visit(module), module)
+
+    def test_shared_subtrees(self):
+        def transform_pass(node):
+            return nodes.Continue(node.lineno, node.col_offset)
+
+        self.transformer.register_transform(nodes.Pass, transform_pass)
+        table = hashconsing.ConsTable()
+        code = '''
+        def f():
+            pass
+        '''
+        first = parse(code, 'a', cons_table=table).__wrapped__
+        second = parse(code, 'b', cons_table=table).__wrapped__
+        self.assertIs(first.body[0], second.body[0])
+        transformed = self.transformer.visit(first)
+        self.assertIsInstance(transformed.body[0].body[0], nodes.Continue)
+        self.assertIsInstance(first.body[0].body[0], nodes.Pass)
+        self.assertIsInstance(second.body[0].body[0], nodes.Pass)
+
+    def test_changes_in_place(self):
+        def rename(node):
+            node.name = 'renamed'
+
+        def add_name(node):
+            node.names += (('b', None),)
+
+        self.transformer.register_transform(nodes.FunctionDef, rename)
+        self.transformer.register_transform(nodes.Import, add_name)
+        self.transformer.register_transform(nodes.Import, lambda node: None)
+        table = hashconsing.ConsTable()
+        code = '''
+        def f():
+            import a
+        '''
+        first = parse(code, 'a', cons_table=table).__wrapped__
+        second = parse(code, 'b', cons_table=table).__wrapped__
+        function = first.body[0]
+        hash_before = first.structural_hash
+        transformed = self.transformer.visit(first)
+        self.assertEqual(transformed.body[0].name, 'renamed')
+        self.assertEqual(transformed.body[0].body[0].names,
+                         (('a', None), ('b', None)))
+        for module in (first, second):
+            self.assertIs(module.body[0], function)
+            self.assertEqual(function.name, 'f')
+            self.assertEqual(function.body[0].names, (('a', None),))
+        self.assertEqual(first.structural_hash, hash_before)
+        self.assertNotEqual(transformed.structural_hash, hash_before)
+        changes = diff.diff_modules(zipper.Zipper(second),
+                                    zipper.Zipper(transformed))
+        self.assertEqual([change.kind for change in changes], [diff.MODIFIED])
+
+    def test_lists_changed_in_place(self):
+        self.transformer.register_transform(
+            nodes.Global, lambda node: node.names.append('b'))
+        node = nodes.Global(['a'])
+        transformed = self.transformer.visit(node)
+        self.assertEqual(transformed.names, ['a', 'b'])
+        self.assertEqual(node.names, ['a'])
+
+    def test_function_facts(self):
+        def transform_pass(node):
+            return nodes.Expr(nodes.Yield(nodes.Empty, node.lineno,
+                                          node.col_offset),
+                              node.lineno, node.col_offset)
+
+        self.transformer.register_transform(nodes.Pass, transform_pass)
+        module = parse('def f():\n    pass').__wrapped__
+        self.assertFalse(module.body[0].is_generator())
+        transformed = self.transformer.visit(module)
+        self.assertTrue(transformed.body[0].is_generator())
+        self.assertFalse(module.body[0].is_generator())
+
     # TODO: figure out what should happen to these tests that depend
     # on inference.
 
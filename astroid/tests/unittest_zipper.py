@@ -19,6 +19,7 @@ from hypothesis import strategies
 import astroid
 from astroid import nodes
 from astroid import base
+from astroid import transforms
 from astroid import zipper
 
 
@@ -197,8 +198,9 @@ class TestZipper(unittest.TestCase):
         self.assertIsInstance(position._self_path, (zipper.Path, type(None)))
         if position._self_path:
             self.assertIsInstance(position._self_path.parent_path, (zipper.Path, type(None)))
-            self.check_linked_list(position._self_path.right)
-            self.check_linked_list(position._self_path.left)
+            self.assertIsInstance(position._self_path.siblings, tuple)
+            self.assertIs(position._self_path.siblings[position._self_path.index],
+                          position.__wrapped__)
             self.check_linked_list(position._self_path.parent_nodes)
             self.assertIsInstance(position._self_path.changed, bool)
     
@@ -236,6 +238,14 @@ class TestZipper(unittest.TestCase):
             self.assertIs(node.__wrapped__, ast[label].node)
         for node, label in zip(random_node.get_children(), get_children(random_label, ast)):
             self.assertIs(node.__wrapped__, ast[label].node)
+        self.assertEqual(
+            [node.__wrapped__ for node in random_node.find_descendants_of_type(node_type)],
+            [node.__wrapped__ for node in random_node.preorder_descendants()
+             if isinstance(node, node_type)])
+        self.assertEqual(
+            [node.__wrapped__ for node in random_node.find_descendants_of_type(base.BaseNode, node_type)],
+            [node.__wrapped__ for node in random_node.preorder_descendants(node_type)
+             if isinstance(node, base.BaseNode)])
 
     @hypothesis.settings(perform_health_check=False)
     @hypothesis.given(ast_strategy, strategies.choices())
@@ -277,5 +287,301 @@ class TestZipper(unittest.TestCase):
         self.assertIsNone(random_node11.common_ancestor(random_node22))
         self.assertIsNone(random_node12.common_ancestor(random_node21))
 
+
+class TestCursor(unittest.TestCase):
+    '''The cursors are checked against the zippers.'''
+
+    @hypothesis.settings(perform_health_check=False)
+    @hypothesis.given(ast_strategy, strategies.integers(min_value=0, max_value=100), strategies.choices())
+    def test_traversal(self, ast, length, choice):
+        label = 1
+        cursor = zipper.Cursor(ast[1].node)
+        for _ in range(length):
+            label, move = choice(ast[label].edges)
+            cursor = getattr(cursor, move.__name__)()
+            self.assertIsInstance(cursor, zipper.Cursor)
+            self.assertIs(cursor.node, ast[label].node)
+        self.assertIs(cursor.zipper().__wrapped__, cursor.node)
+        self.assertIs(cursor.zipper()._self_path, cursor.path)
+
+    @hypothesis.settings(perform_health_check=False)
+    @hypothesis.given(ast_strategy, strategies.choices(), node_types_strategy)
+    def test_iterators(self, ast, choice, node_type):
+        location = traverse_to_node(choice(tuple(ast)), ast,
+                                    zipper.Zipper(ast[1].node))
+        cursor = location.cursor()
+        for method, arguments in (('children', ()),
+                                  ('preorder_descendants', ()),
+                                  ('preorder_descendants', (node_type,)),
+                                  ('postorder_descendants', ()),
+                                  ('postorder_descendants', (node_type,)),
+                                  ('find_descendants_of_type', (node_type,)),
+                                  ('get_children', ())):
+            self.assertEqual(
+                [c.node for c in getattr(cursor, method)(*arguments)],
+                [z.__wrapped__ for z in getattr(location, method)(*arguments)])
+
+    @hypothesis.settings(perform_health_check=False)
+    @hypothesis.given(ast_strategy, strategies.choices())
+    def test_legacy_apis(self, ast, choice):
+        location = traverse_to_node(choice(tuple(ast)), ast,
+                                    zipper.Zipper(ast[1].node))
+        cursor = location.cursor()
+        for method in ('frame', 'statement', 'root', 'last_child',
+                       'next_sibling', 'previous_sibling'):
+            expected = getattr(location, method)()
+            found = getattr(cursor, method)()
+            if expected is None:
+                self.assertIsNone(found)
+            else:
+                self.assertIs(found.node, expected.__wrapped__)
+        if location.parent is None:
+            self.assertIsNone(cursor.parent)
+        else:
+            self.assertIs(cursor.parent.node, location.parent.__wrapped__)
+        if isinstance(cursor.node, base.BaseNode) and cursor.path:
+            self.assertIs(cursor.scope().node, location.scope().__wrapped__)
+
+    def test_positions_and_editing(self):
+        module = astroid.parse('''
+        def f():
+            pass
+        ''', position_table=True)
+        cursor = next(module.cursor().find_descendants_of_type(nodes.Pass))
+        self.assertEqual((cursor.lineno, cursor.col_offset, cursor.end_lineno),
+                         (3, 4, 3))
+        edited = cursor.replace(nodes.Continue()).root()
+        self.assertIsInstance(edited.node.body[0].body[0], nodes.Continue)
+        self.assertIsInstance(module.body[0].body[0], nodes.Pass)
+        self.assertIsNone(edited.common_ancestor(cursor))
+        self.assertIs(cursor.common_ancestor(cursor.up()).node,
+                      module.body[0].body)
+
+
+class TestFindDescendants(unittest.TestCase):
+    CODE = '''
+    def f(a):
+        def g():
+            return a
+        return [a for a in g()]
+    '''
+
+    def test_skip_class(self):
+        module = astroid.parse(self.CODE)
+        found = list(module.find_descendants_of_type(nodes.Return))
+        self.assertEqual([location.lineno for location in found], [4, 5])
+        self.assertEqual(found[0].frame().name, 'g')
+        found = list(module.find_descendants_of_type(
+            nodes.Return, skip_class=(nodes.ListComp, nodes.FunctionDef)))
+        self.assertEqual(found, [])
+        function = next(module.find_descendants_of_type(nodes.FunctionDef))
+        found = function.find_descendants_of_type(nodes.Return,
+                                                  skip_class=nodes.FunctionDef)
+        self.assertEqual([location.lineno for location in found], [5])
+
+    def test_masks(self):
+        module = astroid.parse(self.CODE)
+        function = module.body[0]
+        mask = base.tree_mask(function)
+        self.assertTrue(mask & nodes.ListComp._class_bit)
+        self.assertFalse(mask & nodes.ClassDef._class_bit)
+        self.assertIs(function._class_mask, mask)
+        self.assertEqual(base.tree_mask(module.body), mask)
+        self.assertEqual(base.classes_mask(nodes.ListComp),
+                         nodes.ListComp._class_bit)
+        self.assertIsNone(base.classes_mask((nodes.Name, tuple)))
+
+    def test_transformed(self):
+        def add_continue(node):
+            node.body += (nodes.Continue(),)
+
+        visitor = transforms.TransformVisitor()
+        visitor.register_transform(
+            nodes.Return, lambda node: nodes.Global(names=['a']))
+        visitor.register_transform(nodes.FunctionDef, add_continue)
+        module = astroid.parse(self.CODE)
+        self.assertEqual(list(module.find_descendants_of_type(
+            (nodes.Global, nodes.Continue))), [])
+        transformed = zipper.Zipper(visitor.visit(module.__wrapped__))
+        found = transformed.find_descendants_of_type(
+            (nodes.Global, nodes.Continue))
+        self.assertEqual(sorted(location.__class__.__name__
+                                for location in found),
+                         ['Continue', 'Continue', 'Global', 'Global'])
+        self.assertEqual(list(module.find_descendants_of_type(
+            (nodes.Global, nodes.Continue))), [])
+
+    def test_edited(self):
+        module = astroid.parse(self.CODE)
+        location = next(module.find_descendants_of_type(nodes.Return))
+        edited = location.replace(nodes.Global(names=['a'])).root()
+        found, = edited.find_descendants_of_type(nodes.Global)
+        self.assertEqual(found.frame().name, 'g')
+        self.assertEqual(len(list(edited.find_descendants_of_type(
+            nodes.Return))), 1)
+
+    def test_other_classes(self):
+        module = astroid.parse(self.CODE)
+        # The sequences have no bits, so all the tree is walked.
+        found = module.find_descendants_of_type((nodes.Return, tuple))
+        self.assertEqual(
+            [location.__wrapped__ for location in found],
+            [location.__wrapped__ for location in module.preorder_descendants()
+             if isinstance(location, (nodes.Return, tuple))])
+        self.assertIs(next(module.find_descendants_of_type(tuple)).__wrapped__,
+                      module.body)
+
+
+class TestEditing(unittest.TestCase):
+    def test_replace(self):
+        module = astroid.parse('''
+        def f():
+            pass
+        def g():
+            return 1
+        ''')
+        location = next(module.find_descendants_of_type(nodes.Pass))
+        edited = location.replace(nodes.Continue()).root()
+        self.assertIsInstance(edited.body, tuple)
+        self.assertIsNot(edited.__wrapped__, module.__wrapped__)
+        self.assertIsInstance(edited.body[0].body[0], nodes.Continue)
+        self.assertIsInstance(module.body[0].body[0], nodes.Pass)
+        # The unedited subtrees are shared by both versions.
+        self.assertIs(edited.body[1], module.body[1])
+        self.assertIs(edited.body[0].args, module.body[0].args)
+        self.assertEqual(edited.body[0].name, 'f')
+
+    def test_replace_and_move(self):
+        module = astroid.parse('a = 1\nb = 2\nc = 3\nd = 4\n')
+        location = module.down().down().right()
+        edited = location.replace(nodes.Pass()).rightmost().leftmost()
+        self.assertIsInstance(edited.right().__wrapped__, nodes.Pass)
+        body = edited.rightmost().up()
+        self.assertEqual([type(node) for node in body],
+                         [nodes.Assign, nodes.Pass, nodes.Assign, nodes.Assign])
+        self.assertIs(body[2], module.body[2])
+        self.assertIsInstance(module.body[1], nodes.Assign)
+
+    def test_edit(self):
+        module = astroid.parse('def f(a):\n    return a\n')
+        location = next(module.find_descendants_of_type(nodes.Name))
+        edited = location.edit(name='b').root()
+        self.assertEqual(edited.as_string().strip(), 'def f(a):\n    return b')
+        self.assertIs(edited.body[0].args, module.body[0].args)
+        with self.assertRaises(ValueError):
+            location.edit(value=1)
+
+    def test_insert_and_remove(self):
+        module = astroid.parse('a = 1\nb = 2\n')
+        first = module.down().down()
+        edited = first.insert_left(nodes.Pass()).insert_right(nodes.Break())
+        self.assertIs(edited.__wrapped__, first.__wrapped__)
+        self.assertEqual([type(node) for node in edited.up()],
+                         [nodes.Pass, nodes.Assign, nodes.Break, nodes.Assign])
+        removed = first.right().remove()
+        self.assertIs(removed.__wrapped__, first.__wrapped__)
+        self.assertEqual(len(removed.up()), 1)
+        empty = removed.remove()
+        self.assertEqual(empty.__wrapped__, ())
+        self.assertEqual(empty.up().body, ())
+        self.assertEqual(len(module.body), 2)
+        # Only the elements of sequences can be inserted or removed.
+        value = first.down().right()
+        self.assertIsNone(value.remove())
+        self.assertIsNone(value.insert_left(nodes.Pass()))
+        self.assertIsNone(module.remove())
+
+    def test_cursor_editing(self):
+        module = astroid.parse('a = 1\nb = 2\n').cursor()
+        second = module.down().down().right()
+        edited = second.insert_right(nodes.Pass()).remove().root()
+        self.assertEqual([type(node) for node in edited.node.body],
+                         [nodes.Assign, nodes.Pass])
+        edited = second.down().right().edit(value=3).root()
+        self.assertEqual(edited.node.body[1].value.value, 3)
+        self.assertIs(edited.node.body[0], module.node.body[0])
+
+
+class TestBatch(unittest.TestCase):
+    CODE = '''
+    def f(a):
+        x = 1
+        return a
+
+    def g():
+        pass
+    '''
+
+    def test_commit(self):
+        module = astroid.parse(self.CODE)
+        batch = zipper.Batch(module)
+        batch.edit(next(module.find_descendants_of_type(nodes.Name)), name='b')
+        statement = next(module.find_descendants_of_type(nodes.Return))
+        batch.insert_left(statement, nodes.Pass())
+        batch.insert_left(statement, nodes.Break())
+        location = next(module.cursor().find_descendants_of_type(nodes.Pass))
+        batch.insert_right(location, nodes.Continue())
+        batch.remove(location)
+        self.assertEqual(len(batch), 5)
+        edited = batch.commit()
+        self.assertEqual(edited.as_string(), astroid.parse('''
+    def f(a):
+        x = 1
+        pass
+        break
+        return b
+
+    def g():
+        continue
+    ''').as_string())
+        self.assertIs(edited.body[0].args, module.body[0].args)
+        self.assertIs(edited.body[0].body[0], module.body[0].body[0])
+        self.assertEqual(len(module.body[1].body), 1)
+
+    def test_many_edits(self):
+        module = astroid.parse('\n'.join('x%d = %d' % (i, i)
+                                         for i in range(500)))
+        batch = zipper.Batch(module)
+        for location in module.find_descendants_of_type(nodes.Const):
+            batch.edit(location, value=location.value + 1)
+        edited = batch.commit()
+        self.assertEqual([statement.value.value for statement in edited.body],
+                         list(range(1, 501)))
+        self.assertIs(edited.body[0].targets, module.body[0].targets)
+
+    def test_root(self):
+        module = astroid.parse('a = 1')
+        batch = zipper.Batch(module)
+        batch.edit(module, name='edited')
+        self.assertEqual(batch.commit().name, 'edited')
+        with self.assertRaises(ValueError):
+            batch.remove(module)
+        with self.assertRaises(ValueError):
+            batch.remove(module.cursor())
+        batch = zipper.Batch(module)
+        batch.replace(module, astroid.parse('b = 2').__wrapped__)
+        batch.edit(next(module.find_descendants_of_type(nodes.Const)),
+                   value=2)
+        with self.assertRaises(ValueError):
+            batch.commit()
+
+    def test_invalid(self):
+        module = astroid.parse(self.CODE)
+        batch = zipper.Batch(module)
+        with self.assertRaises(ValueError):
+            batch.remove(astroid.parse(self.CODE).down().down())
+        with self.assertRaises(ValueError):
+            batch.remove(module.down().down().down())
+        with self.assertRaises(ValueError):
+            batch.replace(module.down().down().replace(nodes.Pass()).right(),
+                          nodes.Pass())
+        function = module.down().down()
+        batch.replace(function, nodes.Pass())
+        batch.edit(next(function.find_descendants_of_type(nodes.Name)),
+                   name='b')
+        with self.assertRaises(ValueError):
+            batch.commit()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,6 +6,34 @@ import collections
 import warnings
 
 
+def _fields(node):
+    return ('lineno', 'col_offset') + node._astroid_fields + node._other_fields
+
+
+def _copy(node):
+    """Copies *node* and the lists in its fields, which a transform may
+    change in place."""
+    copy = node.copy()
+    for field in _fields(node):
+        value = getattr(copy, field)
+        if isinstance(value, list):
+            setattr(copy, field, list(value))
+    return copy
+
+
+def _changed(node, copy):
+    """Tells whether *copy*, made by _copy, was changed since."""
+    for field in _fields(node):
+        old, new = getattr(node, field), getattr(copy, field)
+        if new is old:
+            continue
+        if not (isinstance(old, list) and isinstance(new, list)
+                and len(old) == len(new)
+                and all(a is b for a, b in zip(old, new))):
+            return True
+    return False
+
+
 class TransformVisitor(object):
     """A visitor for handling transforms.
 
@@ -21,6 +49,11 @@ class TransformVisitor(object):
     def _transform(self, node):
         """Call matching transforms for the given node if any and return the
         transformed node.
+
+        The transforms may change the node they're given in place, but
+        not its descendants: the node may be shared with other trees,
+        so they're given a copy of it, which replaces the node if it was
+        changed.
         """
         cls = node.__class__
         if cls not in self.transforms:
@@ -28,33 +61,44 @@ class TransformVisitor(object):
             return node
 
         transforms = self.transforms[cls]
-        orig_node = node  # copy the reference
+        substituted = False
         for transform_func, predicate in transforms:
             if predicate is None or predicate(node):
-                ret = transform_func(node)
+                copy = _copy(node)
+                ret = transform_func(copy)
                 # if the transformation function returns something, it's
                 # expected to be a replacement for the node
                 if ret is not None:
-                    if node is not orig_node:
+                    if substituted:
                         # node has already be modified by some previous
                         # transformation, warn about it
                         warnings.warn('node %s substituted multiple times' % node)
+                    substituted = True
                     node = ret
+                elif _changed(node, copy):
+                    node = copy
         return node
 
     def _visit(self, node):
         if hasattr(node, '_astroid_fields'):
-            for field in node._astroid_fields:
-                value = getattr(node, field)
-                visited = self._visit_generic(value)
-                setattr(node, field, visited)
+            children = [getattr(node, field) for field in node._astroid_fields]
+            visited = [self._visit_generic(child) for child in children]
+            # The nodes on the way to a substituted node are copied
+            # rather than changed, so that the trees sharing them, like
+            # the versions of a tree edited with zippers or the trees
+            # hash-consed together, are left unchanged.
+            if any(new is not old for new, old in zip(visited, children)):
+                node = node.make_node(visited)
         return self._transform(node)
 
     def _visit_generic(self, node):
-        if isinstance(node, list):
-            return [self._visit_generic(child) for child in node]
-        elif isinstance(node, tuple):
-            return tuple(self._visit_generic(child) for child in node)
+        if isinstance(node, (list, tuple)):
+            visited = [self._visit_generic(child) for child in node]
+            # A sequence none of whose children were substituted is
+            # kept, so that it stays shared with other trees.
+            if all(new is old for new, old in zip(visited, node)):
+                return node
+            return tuple(visited)
         else:
             return self._visit(node)
 
@@ -76,7 +120,13 @@ class TransformVisitor(object):
         """Walk the given astroid *tree* and transform each encountered node
 
         Only the nodes which have transforms registered will actually
-        be replaced or changed.
+        be replaced or changed.  The tree isn't changed in place: the
+        transformed tree is returned, sharing the subtrees without
+        substituted nodes with the tree given.  The position table of
+        *module*, if it has one, is carried over to the transformed tree.
         """
-        module.body = [self._visit(child) for child in module.body]
-        return self._transform(module)
+        transformed = self._visit(module)
+        table = getattr(module, 'position_table', None)
+        if table is not None and transformed is not module:
+            transformed.position_table = table.carried(module, transformed)
+        return transformed
@@ -11,8 +11,12 @@ brief introduction to zippers as a whole.  This implementation is
 based on the Clojure implementation,
 https://github.com/clojure/clojure/blob/master/src/clj/clojure/zip.clj .
 
+A Zipper is a proxy for its focus, a Cursor moves the same way at a
+lower cost per step but gives its focus explicitly.
+
 '''
 import collections
+import functools
 
 import wrapt
 
@@ -21,86 +25,169 @@ from astroid import base
 from astroid import node_classes
 
 
-# The following are helper functions for working with singly-linked
-# lists made with two-tuples.  The empty tuple is used to denote the
-# end of a linked list.  The zipper needs singly-linked lists for most
-# of its operations to take constant time.
-def _linked_list(*values):
-    '''Builds a new linked list of tuples out of its arguments.'''
-    tail = ()
-    for value in reversed(values):
-        tail = (value, tail)
-    return tail
-
-
-def _reverse(linked_list):
-    '''Reverses an existing linked list of tuples.'''
-    if linked_list:
-        result = collections.deque((linked_list[0],))
-        tail = linked_list[1]
-        while tail:
-            result.appendleft(tail[0])
-            tail = tail[1]
-        tail = (result.pop(), ())
-        while result:
-            tail = (result.pop(), tail)
-        return tail
-
-
-def _iterate(linked_list):
-    '''Return an iterator over a linked list of tuples.'''
+# The ancestors of the focus are kept in a singly-linked list made
+# with two-tuples, the empty tuple denoting its end, so that going
+# down and up takes constant time.
+def _last(linked_list):
+    '''Returns the last element of a linked list of tuples.'''
     node = linked_list
-    while node:
-        yield node[0]
+    while node[1]:
         node = node[1]
+    return node[0]
 
 
-def _concatenate(left, right):
-    '''Concatenate the first linked lists of tuples onto the second.'''
-    if not left:
-        return right
-    elif not right:
-        return left
+def _moved(path, focus, index):
+    '''Gets the path of the sibling at *index* of *focus*, whose path is
+    *path*.
+
+    The siblings are copied with the focus if it was edited, which
+    happens once per edit, then the moves take constant time.
+    '''
+    siblings, focus_index, parent_nodes, parent_path, changed = path
+    if changed and siblings[focus_index] is not focus:
+        siblings = siblings[:focus_index] + (focus,) + siblings[focus_index + 1:]
+    return Path(siblings, index, parent_nodes, parent_path, changed)
+
+
+def _inserted(path, focus, node, right):
+    '''Gets the path of *focus* once *node* is inserted next to it, None
+    if its parent isn't a sequence.'''
+    if not path or isinstance(path.parent_nodes[0], base.BaseNode):
+        return None
+    siblings, index, parent_nodes, parent_path, _ = path
+    if right:
+        siblings = siblings[:index] + (focus, node) + siblings[index + 1:]
     else:
-        result = [left[0]]
-        tail = left[1]
-        while tail:
-            result.append(tail[0])
-            tail = tail[1]
-        tail = (result.pop(), right)
-        while result:
-            tail = (result.pop(), tail)
-        return tail
+        siblings = siblings[:index] + (node, focus) + siblings[index + 1:]
+        index += 1
+    return Path(siblings, index, parent_nodes, parent_path, True)
 
 
-def _last(linked_list):
-    '''Returns the last element of a linked list of tuples.'''
-    node = linked_list
-    while node[1]:
-        node = node[1]
-    return node[0]
+def _removed(path):
+    '''Gets the new focus and its path once the focus of *path* is
+    removed, None if its parent isn't a sequence.
+
+    The new focus is the left sibling of the removed one, else its right
+    sibling, else the sequence left empty.
+    '''
+    if not path or isinstance(path.parent_nodes[0], base.BaseNode):
+        return None
+    siblings, index, parent_nodes, parent_path, _ = path
+    siblings = siblings[:index] + siblings[index + 1:]
+    if not siblings:
+        return siblings, parent_path and parent_path._replace(changed=True)
+    index = max(index - 1, 0)
+    return siblings[index], Path(siblings, index, parent_nodes, parent_path,
+                                 True)
+
+
+def _ancestry(location):
+    '''Lists the ancestors of the focus of a zipper, from the root down
+    to the focus itself, each with its index among its siblings.'''
+    ancestors = []
+    focus = location.__wrapped__
+    path = location._self_path
+    while path:
+        ancestors.append((focus, path.index))
+        focus = path.parent_nodes[0]
+        path = path.parent_path
+    ancestors.append((focus, 0))
+    ancestors.reverse()
+    return ancestors
+
+
+def _carried(root, new_root):
+    '''Gives *new_root*, made by editing the tree rooted at *root*, the
+    positions of the table of *root*, if it has one, see
+    positions.PositionTable.carried, and returns it.'''
+    table = getattr(root, 'position_table', None)
+    if table is not None:
+        new_root.position_table = table.carried(root, new_root)
+    return new_root
+
+
+class _Positioned(object):
+    '''A view of the focus of a zipper whose root has a position table,
+    for the line properties of its node class.
+
+    The properties are run on the view instead of the node: the
+    positions of the focus, and of the children it looks at, which are
+    views too, are those of the zippers, found in the table for the
+    nodes which have none, like the flyweights.
+    '''
+
+    __slots__ = ('_location',)
 
+    def __init__(self, location):
+        self._location = location
 
-def _initial(linked_list):
-    '''Returns a linked list of tuples containing all elements but the last.'''
-    result = [linked_list[0]]
-    tail = linked_list[1]
-    while tail:
-        result.append(tail[0])
-        tail = tail[1]
-    result.pop()
-    while result:
-        tail = (result.pop(), tail)
-    return tail
+    @property
+    def __class__(self):
+        return self._location.__wrapped__.__class__
+
+    def __getattr__(self, name):
+        location = self._location
+        node = location.__wrapped__
+        if name in ('lineno', 'col_offset'):
+            return location._position(name)
+        if name in ('end_lineno', 'tolineno'):
+            return location._position('end_lineno', 'tolineno')
+        if name in node._astroid_fields:
+            child = location.down()
+            for _ in range(node._astroid_fields.index(name)):
+                child = child.right()
+            if not isinstance(child.__wrapped__, base.BaseNode):
+                return tuple(type(self)(element)
+                             for element in child.children())
+            if not child.__wrapped__:
+                # Empty stays false.
+                return child.__wrapped__
+            return type(self)(child)
+        for cls in type(node).__mro__:
+            if name in vars(cls):
+                attribute = vars(cls)[name]
+                if isinstance(attribute, property):
+                    return attribute.fget(self)
+                if callable(attribute) and not isinstance(attribute, type):
+                    return functools.partial(attribute, self)
+                break
+        return getattr(node, name)
 
 
 # Attributes:
-#     left (linked list): The siblings to the left of the zipper's focus.
-#     right (linked list): The siblings to the right of the zipper's focus.
+#     siblings (tuple): The children of the parent of the zipper's focus,
+#         where the focus itself is stale if it was edited.
+#     index (int): The index of the zipper's focus among its siblings.
 #     parent_nodes (linked list): The ancestors of the zipper's focus
 #     parent_path (Path): The Path from the zipper that created this zipper.
 #     changed (bool): Whether this zipper has been edited or not.
-Path = collections.namedtuple('Path', 'left right parent_nodes parent_path changed')
+Path = collections.namedtuple('Path', 'siblings index parent_nodes parent_path changed')
+
+
+def _find_descendants(location, focus, path, cls, skip_class):
+    '''Iterates over the descendants of *location*, a zipper or a cursor
+    for *focus* at *path*, which are instances of *cls*, in prefix order.
+
+    The children whose subtrees hold no node of *cls* are skipped
+    without going down to them, so that the locations made are those
+    of the nodes found, their ancestors being only kept in the paths.
+    '''
+    wanted = base.classes_mask(cls)
+    to_visit = [(focus, path)]
+    while to_visit:
+        focus, path = to_visit.pop()
+        if isinstance(focus, cls):
+            yield type(location)(focus, path)
+        children = tuple(focus)
+        parent_nodes = (focus, path.parent_nodes if path else ())
+        for index in range(len(children) - 1, -1, -1):
+            child = children[index]
+            if not base.tree_mask(child) & wanted:
+                continue
+            if skip_class is not None and isinstance(child, skip_class):
+                continue
+            to_visit.append((child, Path(children, index, parent_nodes,
+                                         path, False)))
 
 
 class Zipper(wrapt.ObjectProxy):
@@ -147,85 +234,90 @@ class Zipper(wrapt.ObjectProxy):
 
         This takes constant time.
         '''
-        if self._self_path and self._self_path.left:
-            focus, left = self._self_path.left
-            path = self._self_path._replace(left=left,
-                                            right=(self.__wrapped__,
-                                                   self._self_path.right))
-            return type(self)(focus=focus, path=path)
+        path = self._self_path
+        if path and path.index:
+            index = path.index - 1
+            return type(self)(focus=path.siblings[index],
+                              path=_moved(path, self.__wrapped__, index))
 
     def leftmost(self):
         '''Go to the leftmost sibling of the focus.
 
-        This takes time linear in the number of left siblings.
+        This takes constant time.
         '''
-        if self._self_path and self._self_path.left:
-            focus, siblings = _last(self._self_path.left), _initial(self._self_path.left)
-            right = _concatenate(_reverse(siblings), (self.__wrapped__, self._self_path.right))
-            path = self._self_path._replace(left=(), right=right)
-            return type(self)(focus=focus, path=path)
+        path = self._self_path
+        if path and path.index:
+            return type(self)(focus=path.siblings[0],
+                              path=_moved(path, self.__wrapped__, 0))
 
     def right(self):
         '''Go to the next sibling that's directly to the right of the focus.
 
         This takes constant time.
         '''
-        if self._self_path and self._self_path.right:
-            focus, right = self._self_path.right
-            path = self._self_path._replace(left=(self.__wrapped__,
-                                                  self._self_path.left),
-                                            right=right)
-            return type(self)(focus=focus, path=path)
+        path = self._self_path
+        if path and path.index < len(path.siblings) - 1:
+            index = path.index + 1
+            return type(self)(focus=path.siblings[index],
+                              path=_moved(path, self.__wrapped__, index))
 
     def rightmost(self):
         '''Go to the rightmost sibling of the focus.
 
-        This takes time linear in the number of right siblings.
-        '''
-        if self._self_path and self._self_path.right:
-            siblings, focus = _initial(self._self_path.right), _last(self._self_path.right)
-            left = _concatenate(_reverse(siblings), (self.__wrapped__, self._self_path.left))
-            path = self._self_path._replace(left=left, right=())
-            return type(self)(focus=focus, path=path)
-
-    def down(self):
-        '''Go to the leftmost child of the focus.
-
         This takes constant time.
         '''
-        try:
-            children = iter(self.__wrapped__)
-            first = next(children)
-        except StopIteration:
+        path = self._self_path
+        if path and path.index < len(path.siblings) - 1:
+            index = len(path.siblings) - 1
+            return type(self)(focus=path.siblings[index],
+                              path=_moved(path, self.__wrapped__, index))
+
+    def down(self, index=0):
+        '''Go to the leftmost child of the focus, or to its child at
+        *index*.
+
+        This takes constant time: the children of a sequence are the
+        sequence itself, those of a node its few fields.
+        '''
+        children = tuple(self.__wrapped__)
+        if not 0 <= index < len(children):
             return
         if self._self_path:
             parent_nodes = (self.__wrapped__, self._self_path.parent_nodes)
         else:
             parent_nodes = (self.__wrapped__, ())
-        path = Path(left=(),
-                    right=_linked_list(*children),
+        path = Path(siblings=children,
+                    index=index,
                     parent_nodes=parent_nodes,
                     parent_path=self._self_path,
                     changed=False)
-        return type(self)(focus=first, path=path)
+        return type(self)(focus=children[index], path=path)
 
     def up(self):
         '''Go to the parent of the focus.
 
-        This takes time linear in the number of left siblings if the
-        focus has been edited or constant time if it hasn't been
-        edited.
+        This takes time linear in the number of siblings if the focus
+        has been edited or constant time if it hasn't been edited.
         '''
         if self._self_path:
-            left, right, parent_nodes, parent_path, changed = self._self_path
+            siblings, index, parent_nodes, parent_path, changed = self._self_path
             if parent_nodes:
                 focus = parent_nodes[0]
                 # This conditional uses parent_nodes to make going up
                 # take constant time if the focus hasn't been edited.
                 if changed:
-                    focus_node = _concatenate(_reverse(left), (self.__wrapped__, right))
+                    children = (siblings[:index] + (self.__wrapped__,)
+                                + siblings[index + 1:])
+                    # The sequences of nodes are tuples, so the
+                    # unedited children are shared with the old tree.
+                    if isinstance(focus, base.BaseNode):
+                        focus = focus.make_node(children)
+                        if parent_path is None:
+                            focus = _carried(parent_nodes[0], focus)
+                    else:
+                        focus = children
                     return type(self)(
-                        focus=focus.make_node(focus_node),
+                        focus=focus,
                         path=parent_path and parent_path._replace(changed=True))
                 else:
                     return type(self)(focus=focus, path=parent_path)
@@ -243,36 +335,33 @@ class Zipper(wrapt.ObjectProxy):
     def common_ancestor(self, other):
         '''Find the most recent common ancestor of two different zippers.
 
-        This takes time linear in the number of ancestors of both foci
-        and will return None for zippers from two different ASTs.  The
-        new zipper is derived from the zipper the method is called on,
+        This takes time linear in the depths of both foci if this
+        zipper hasn't been edited, and linear in the number of siblings
+        of each of its ancestors otherwise, as with up().  It will
+        return None for zippers from two different ASTs.  The new
+        zipper is derived from the zipper the method is called on,
         so edits in the second argument will not be included in the
         new zipper.
 
         '''
-        if self._self_path:
-            self_ancestors = _reverse((self.__wrapped__, self._self_path.parent_nodes))
-        else:
-            self_ancestors = (self.__wrapped__, ())
-        if other._self_path:
-            other_ancestors = _reverse((other.__wrapped__, other._self_path.parent_nodes))
-        else:
-            other_ancestors = (other.__wrapped__, ())
-        ancestor = None
-        for self_ancestor, other_ancestor in zip(_iterate(self_ancestors), _iterate(other_ancestors)):
-            # This is a kludge to work around the problem of two Empty
-            # nodes in different parts of an AST.  Empty nodes can
-            # never be ancestors, so they can be safely skipped.
-            if self_ancestor is other_ancestor and self_ancestor is not base.Empty:
-                ancestor = self_ancestor
+        self_ancestors = _ancestry(self)
+        depth = 0
+        for (self_ancestor, self_index), (other_ancestor, other_index) in zip(
+                self_ancestors, _ancestry(other)):
+            # The same node can be found at several places in a tree,
+            # like the subtrees shared by hash-consing, so the ancestors
+            # are compared with their indexes too.  Empty nodes can
+            # never be ancestors.
+            if (self_ancestor is other_ancestor and self_index == other_index
+                    and self_ancestor is not base.Empty):
+                depth += 1
             else:
                 break
-        if ancestor is None:
+        if depth == 0:
             return None
-        else:
-            location = self
-            while location.__wrapped__ is not ancestor:
-                location = location.up()
+        location = self
+        for _ in range(len(self_ancestors) - depth):
+            location = location.up()
         return location
 
     def children(self):
@@ -339,8 +428,15 @@ class Zipper(wrapt.ObjectProxy):
             skip_class (base.BaseNode, tuple(base.BaseNode)): If not None, will
                 not include nodes of this type or types or any of the
                 descendants of those nodes.
+
+        Only the subtrees holding nodes of the type are walked, see
+        base.tree_mask, when the type is made of node classes.
         '''
-        return (d for d in self.preorder_descendants(skip_class) if isinstance(d, cls))
+        if base.classes_mask(cls) is None:
+            return (d for d in self.preorder_descendants(skip_class)
+                    if isinstance(d, cls))
+        return _find_descendants(self, self.__wrapped__, self._self_path,
+                                 cls, skip_class)
 
     # Editing
     def replace(self, focus):
@@ -350,11 +446,124 @@ class Zipper(wrapt.ObjectProxy):
             focus (base.BaseNode, collections.Sequence): The object to replace
                 the focus with.
         '''
-        return type(self)(focus=focus, path=self._self_path._replace(changed=True))
+        path = self._self_path
+        return type(self)(focus=focus, path=path and path._replace(changed=True))
+
+    def edit(self, **fields):
+        '''Replaces the node at the focus by a copy with new values for
+        some of its fields, see base.BaseNode.copy.'''
+        node = self.__wrapped__.copy(**fields)
+        if not self._self_path:
+            node = _carried(self.__wrapped__, node)
+        return self.replace(node)
+
+    def insert_left(self, node):
+        '''Inserts a node to the left of the focus, which must be in a
+        sequence.
+
+        This takes time linear in the number of siblings.
+        '''
+        path = _inserted(self._self_path, self.__wrapped__, node, False)
+        if path is not None:
+            return type(self)(focus=self.__wrapped__, path=path)
+
+    def insert_right(self, node):
+        '''Inserts a node to the right of the focus, which must be in a
+        sequence.
+
+        This takes time linear in the number of siblings.
+        '''
+        path = _inserted(self._self_path, self.__wrapped__, node, True)
+        if path is not None:
+            return type(self)(focus=self.__wrapped__, path=path)
+
+    def remove(self):
+        '''Removes the focus, which must be in a sequence, going to its
+        left sibling, else to its right sibling, else to the sequence
+        left empty.
+
+        This takes time linear in the number of siblings.
+        '''
+        removed = _removed(self._self_path)
+        if removed is not None:
+            focus, path = removed
+            return type(self)(focus=focus, path=path)
+
+    # Positions
+    def _position(self, field, attribute=None):
+        value = getattr(self.__wrapped__, attribute or field)
+        if value is None and self._self_path:
+            # The focus may be a flyweight, whose position is in the
+            # table of the root.
+            root = _last(self._self_path.parent_nodes)
+            table = getattr(root, 'position_table', None)
+            if table is not None:
+                ordinal = table.ordinal(self)
+                if ordinal is not None:
+                    return getattr(table[ordinal], field)
+        return value
+
+    @property
+    def lineno(self):
+        '''The line of the focus, looked up in the position table of the
+        root when the focus has none.'''
+        return self._position('lineno')
+
+    @lineno.setter
+    def lineno(self, value):
+        self.__wrapped__.lineno = value
 
-    # def edit(self, *args, **kws):
-    #     return type(self)(focus=self.__wrapped__.make_focus(*args, **kws),
-    #                       path=self._self_path._replace(changed=True))
+    @property
+    def col_offset(self):
+        '''The column of the focus, looked up in the position table of the
+        root when the focus has none.'''
+        return self._position('col_offset')
+
+    @col_offset.setter
+    def col_offset(self, value):
+        self.__wrapped__.col_offset = value
+
+    @property
+    def end_lineno(self):
+        '''The first line of the last descendant of the focus, looked up
+        in the position table of the root when the focus has none.'''
+        return self._position('end_lineno', 'tolineno')
+
+    def _line_property(self, name):
+        path = self._self_path
+        root = _last(path.parent_nodes) if path else self.__wrapped__
+        if getattr(root, 'position_table', None) is None:
+            return getattr(self.__wrapped__, name)
+        return getattr(_Positioned(self), name)
+
+    @property
+    def fromlineno(self):
+        '''The first line of the focus, found from the positions of the
+        zippers when the root has a position table, see _Positioned.'''
+        return self._line_property('fromlineno')
+
+    @property
+    def tolineno(self):
+        '''The last line of the focus, see Zipper.fromlineno.'''
+        return self._line_property('tolineno')
+
+    @property
+    def blockstart_tolineno(self):
+        '''The last line of the header of the block of the focus, see
+        Zipper.fromlineno.'''
+        return self._line_property('blockstart_tolineno')
+
+    def block_range(self, lineno):
+        '''The range of the lines of the block of the focus holding
+        *lineno*, see Zipper.fromlineno.'''
+        return self._line_property('block_range')(lineno)
+
+    def __repr__(self):
+        if not isinstance(self.__wrapped__, base.BaseNode):
+            return super(Zipper, self).__repr__()
+        return '<%s at 0x%x for %s l.%s at 0x%x>' % (
+            type(self).__name__, id(self), type(self.__wrapped__).__name__,
+            self.fromlineno, id(self.__wrapped__))
 
     # Legacy APIs
     @property
@@ -425,3 +634,513 @@ class Zipper(wrapt.ObjectProxy):
                               (node_classes.Module, node_classes.Statement))):
             location = location.up()
         return location
+
+    # Conversions
+    def cursor(self):
+        '''Gets a Cursor with the same focus and path, in constant time.'''
+        return Cursor(self.__wrapped__, self._self_path)
+
+
+class Cursor(object):
+    '''A lighter zipper, which isn't a proxy for its focus.
+
+    A cursor moves like a Zipper, with the same methods and the same
+    Path, but it's a plain object with slots: making one costs far less
+    than making a proxy, and the focus is reached explicitly, as its
+    node attribute, instead of through the proxy.  The two convert to
+    each other in constant time, see Zipper.cursor and Cursor.zipper.
+
+    Attributes:
+        node (base.BaseNode, collections.Sequence): The AST node or
+            sequence at the cursor's focus.
+        path (Path): The Path tuple containing information about the
+            cursor's history, None at the root.
+    '''
+
+    __slots__ = ('node', 'path')
+
+    def __init__(self, node, path=None):
+        self.node = node
+        self.path = path
+
+    def __repr__(self):
+        return '<Cursor at 0x%x for %s at 0x%x>' % (
+            id(self), type(self.node).__name__, id(self.node))
+
+    def zipper(self):
+        '''Gets a Zipper with the same focus and path, in constant time.'''
+        return Zipper(self.node, self.path)
+
+    # Traversal
+    def left(self):
+        '''Go to the next sibling that's directly to the left of the focus.
+
+        This takes constant time.
+        '''
+        path = self.path
+        if path and path.index:
+            index = path.index - 1
+            return type(self)(path.siblings[index],
+                              _moved(path, self.node, index))
+
+    def leftmost(self):
+        '''Go to the leftmost sibling of the focus.
+
+        This takes constant time.
+        '''
+        path = self.path
+        if path and path.index:
+            return type(self)(path.siblings[0], _moved(path, self.node, 0))
+
+    def right(self):
+        '''Go to the next sibling that's directly to the right of the focus.
+
+        This takes constant time.
+        '''
+        path = self.path
+        if path and path.index < len(path.siblings) - 1:
+            index = path.index + 1
+            return type(self)(path.siblings[index],
+                              _moved(path, self.node, index))
+
+    def rightmost(self):
+        '''Go to the rightmost sibling of the focus.
+
+        This takes constant time.
+        '''
+        path = self.path
+        if path and path.index < len(path.siblings) - 1:
+            index = len(path.siblings) - 1
+            return type(self)(path.siblings[index],
+                              _moved(path, self.node, index))
+
+    def down(self, index=0):
+        '''Go to the leftmost child of the focus, or to its child at
+        *index*.
+
+        This takes constant time.
+        '''
+        children = tuple(self.node)
+        if not 0 <= index < len(children):
+            return
+        path = self.path
+        if path:
+            parent_nodes = (self.node, path.parent_nodes)
+        else:
+            parent_nodes = (self.node, ())
+        return type(self)(children[index], Path(siblings=children,
+                                                index=index,
+                                                parent_nodes=parent_nodes,
+                                                parent_path=path,
+                                                changed=False))
+
+    def up(self):
+        '''Go to the parent of the focus.
+
+        This takes time linear in the number of siblings if the focus
+        has been edited or constant time if it hasn't been edited.
+        '''
+        if self.path:
+            siblings, index, parent_nodes, parent_path, changed = self.path
+            if parent_nodes:
+                node = parent_nodes[0]
+                if changed:
+                    children = (siblings[:index] + (self.node,)
+                                + siblings[index + 1:])
+                    if isinstance(node, base.BaseNode):
+                        node = node.make_node(children)
+                        if parent_path is None:
+                            node = _carried(parent_nodes[0], node)
+                    else:
+                        node = children
+                    return type(self)(
+                        node, parent_path and parent_path._replace(changed=True))
+                return type(self)(node, parent_path)
+
+    def root(self):
+        '''Go to the root of the AST for the focus.
+
+        This takes time linear in the number of ancestors of the focus.
+        '''
+        location = self
+        while location.path:
+            location = location.up()
+        return location
+
+    def common_ancestor(self, other):
+        '''Find the most recent common ancestor of two different cursors.
+
+        See Zipper.common_ancestor.
+        '''
+        location = self.zipper().common_ancestor(other.zipper())
+        if location is not None:
+            return location.cursor()
+
+    def children(self):
+        '''Iterates over the children of the focus.'''
+        child = self.down()
+        while child is not None:
+            yield child
+            child = child.right()
+
+    def preorder_descendants(self, dont_recurse_on=None):
+        '''Iterates over the descendants of the focus in prefix order.
+
+        Arguments:
+            dont_recurse_on (base.BaseNode): If not None, will not include nodes
+                of this type or types or any of the descendants of those nodes.
+        '''
+        to_visit = [self]
+        while to_visit:
+            location = to_visit.pop()
+            yield location
+            if dont_recurse_on is None:
+                to_visit.extend(reversed(tuple(location.children())))
+            else:
+                to_visit.extend(c for c in
+                                reversed(tuple(location.children()))
+                                if not isinstance(c.node, dont_recurse_on))
+
+    def postorder_descendants(self, dont_recurse_on=None):
+        '''Iterates over the descendants of the focus in postfix order.
+
+        Arguments:
+            dont_recurse_on (base.BaseNode): If not None, will not include nodes
+                of this type or types or any of the descendants of those nodes.
+        '''
+        to_visit = [self]
+        visited_ancestors = []
+        while to_visit:
+            location = to_visit[-1]
+            if not visited_ancestors or visited_ancestors[-1] is not location:
+                visited_ancestors.append(location)
+                if dont_recurse_on is None:
+                    to_visit.extend(reversed(tuple(location.children())))
+                else:
+                    to_visit.extend(c for c in
+                                    reversed(tuple(location.children()))
+                                    if not isinstance(c.node, dont_recurse_on))
+                continue
+            visited_ancestors.pop()
+            yield location
+            to_visit.pop()
+
+    def find_descendants_of_type(self, cls, skip_class=None):
+        '''Iterates over the descendants of the focus of a given type in
+        prefix order.
+
+        Arguments:
+            skip_class (base.BaseNode, tuple(base.BaseNode)): If not None, will
+                not include nodes of this type or types or any of the
+                descendants of those nodes.
+        '''
+        if base.classes_mask(cls) is None:
+            return (d for d in self.preorder_descendants(skip_class)
+                    if isinstance(d.node, cls))
+        return _find_descendants(self, self.node, self.path, cls, skip_class)
+
+    # Editing
+    def replace(self, node):
+        '''Replaces the existing node at the focus.
+
+        Arguments:
+            node (base.BaseNode, collections.Sequence): The object to replace
+                the focus with.
+        '''
+        path = self.path
+        return type(self)(node, path and path._replace(changed=True))
+
+    def edit(self, **fields):
+        '''Replaces the node at the focus by a copy with new values for
+        some of its fields, see Zipper.edit.'''
+        node = self.node.copy(**fields)
+        if not self.path:
+            node = _carried(self.node, node)
+        return self.replace(node)
+
+    def insert_left(self, node):
+        '''Inserts a node to the left of the focus, see Zipper.insert_left.'''
+        path = _inserted(self.path, self.node, node, False)
+        if path is not None:
+            return type(self)(self.node, path)
+
+    def insert_right(self, node):
+        '''Inserts a node to the right of the focus, see Zipper.insert_right.'''
+        path = _inserted(self.path, self.node, node, True)
+        if path is not None:
+            return type(self)(self.node, path)
+
+    def remove(self):
+        '''Removes the focus, see Zipper.remove.'''
+        removed = _removed(self.path)
+        if removed is not None:
+            return type(self)(*removed)
+
+    # Positions
+    def _position(self, field, attribute=None):
+        value = getattr(self.node, attribute or field)
+        if value is None and self.path:
+            # The focus may be a flyweight, see Zipper._position.
+            return self.zipper()._position(field, attribute)
+        return value
+
+    @property
+    def lineno(self):
+        '''The line of the focus, see Zipper.lineno.'''
+        return self._position('lineno')
+
+    @property
+    def col_offset(self):
+        '''The column of the focus, see Zipper.col_offset.'''
+        return self._position('col_offset')
+
+    @property
+    def end_lineno(self):
+        '''The end line of the focus, see Zipper.end_lineno.'''
+        return self._position('end_lineno', 'tolineno')
+
+    @property
+    def fromlineno(self):
+        '''The first line of the focus, see Zipper.fromlineno.'''
+        return self.zipper().fromlineno
+
+    @property
+    def tolineno(self):
+        '''The last line of the focus, see Zipper.tolineno.'''
+        return self.zipper().tolineno
+
+    @property
+    def blockstart_tolineno(self):
+        '''The last line of the header of the block of the focus, see
+        Zipper.blockstart_tolineno.'''
+        return self.zipper().blockstart_tolineno
+
+    def block_range(self, lineno):
+        '''The range of the lines of the block of the focus holding
+        *lineno*, see Zipper.block_range.'''
+        return self.zipper().block_range(lineno)
+
+    # Legacy APIs
+    @property
+    def parent(self):
+        '''Goes up to the next ancestor of the focus that's a node, not a sequence.'''
+        location = self.up()
+        if location is not None and not isinstance(location.node,
+                                                   base.BaseNode):
+            return location.up()
+        return location
+
+    def get_children(self):
+        '''Iterates over nodes that are children or grandchildren, no sequences.'''
+        child = self.down()
+        while child is not None:
+            if isinstance(child.node, base.BaseNode):
+                yield child
+            else:
+                grandchild = child.down()
+                while grandchild is not None:
+                    yield grandchild
+                    grandchild = grandchild.right()
+            child = child.right()
+
+    def last_child(self):
+        return self.rightmost()
+
+    def next_sibling(self):
+        return self.right()
+
+    def previous_sibling(self):
+        return self.left()
+
+    def nodes_of_class(self, cls, skip_class=None):
+        return self.find_descendants_of_type(cls, skip_class)
+
+    def frame(self):
+        '''Go to the first ancestor of the focus that creates a new frame.
+
+        This takes time linear in the number of ancestors of the focus.
+        '''
+        location = self
+        while (location is not None and not
+               isinstance(location.node,
+                          (node_classes.FunctionDef, node_classes.Lambda,
+                           node_classes.ClassDef, node_classes.Module))):
+            location = location.up()
+        return location
+
+    def scope(self):
+        '''Get the first node defining a new scope, see Zipper.scope.
+
+        The rules of the scopes are applied through a zipper.
+        '''
+        location = self.zipper().scope()
+        if location is not None:
+            return location.cursor()
+
+    def statement(self):
+        '''Go to the first ancestor of the focus that's a Statement.
+
+        This takes time linear in the number of ancestors of the focus.
+        '''
+        location = self
+        while (location is not None and
+               not isinstance(location.node,
+                              (node_classes.Module, node_classes.Statement))):
+            location = location.up()
+        return location
+
+
+class Batch(object):
+    '''Edits to many places of one tree, applied at once.
+
+    Editing through a zipper rebuilds the ancestors of the focus when
+    going up, so going back to the root after every edit costs time
+    linear in the depth of the tree and in the size of the sequences on
+    the way, for every edit.  A batch records the edits of locations
+    found in the original tree, by zippers or cursors, and commit()
+    rebuilds every edited ancestor once, from the deepest up, sharing
+    the subtrees which weren't edited with the original tree.
+
+    The edits to the same location are applied in the order they were
+    recorded, as the zipper methods of the same names would.  A
+    location can't be both replaced or removed and have edited
+    descendants.
+    '''
+
+    def __init__(self, root):
+        '''Arguments:
+            root: The root of the tree, as a node, a zipper or a cursor.
+        '''
+        self._root = _focus_and_path(root)[0]
+        # The edits, by the indexes of their locations from the root.
+        self._edits = collections.OrderedDict()
+
+    def __len__(self):
+        return sum(len(edits) for edits in self._edits.values())
+
+    def _address(self, location, in_sequence=False):
+        focus, path = _focus_and_path(location)
+        indexes = []
+        if path:
+            if _last(path.parent_nodes) is not self._root:
+                raise ValueError('The location is in another tree.')
+            if in_sequence and isinstance(path.parent_nodes[0], base.BaseNode):
+                raise ValueError('The location is not in a sequence.')
+        elif in_sequence:
+            raise ValueError('The root is not in a sequence.')
+        while path:
+            if path.changed:
+                raise ValueError('The location is in an edited tree.')
+            indexes.append(path.index)
+            path = path.parent_path
+        indexes.reverse()
+        return tuple(indexes), focus
+
+    def _record(self, location, edit, in_sequence=False):
+        address = self._address(location, in_sequence)[0]
+        self._edits.setdefault(address, []).append(edit)
+
+    def replace(self, location, node):
+        '''Replaces the focus of *location* by *node*.'''
+        self._record(location, ('replace', node))
+
+    def edit(self, location, **fields):
+        '''Replaces the focus of *location* by a copy with new values for
+        some of its fields, see base.BaseNode.copy.'''
+        if not isinstance(self._address(location)[1], base.BaseNode):
+            raise ValueError('Only nodes have fields.')
+        self._record(location, ('edit', fields))
+
+    def insert_left(self, location, node):
+        '''Inserts *node* to the left of the focus of *location*, which
+        must be in a sequence.'''
+        self._record(location, ('insert_left', node), in_sequence=True)
+
+    def insert_right(self, location, node):
+        '''Inserts *node* to the right of the focus of *location*, which
+        must be in a sequence.'''
+        self._record(location, ('insert_right', node), in_sequence=True)
+
+    def remove(self, location):
+        '''Removes the focus of *location*, which must be in a sequence.'''
+        self._record(location, ('remove', None), in_sequence=True)
+
+    def commit(self):
+        '''Applies the edits, returning a zipper for the new root.
+
+        The original tree isn't changed.  This takes time linear in the
+        number of edits, in their depths and in the numbers of children
+        of their ancestors.
+
+        Raises:
+            ValueError: if an edited location is under a replaced or
+                removed one.
+        '''
+        edits = self._edits
+        # The indexes of the edited children of the ancestors of the
+        # edits, by the depths and then the addresses of the ancestors.
+        levels = collections.defaultdict(
+            lambda: collections.defaultdict(set))
+        for address in edits:
+            if address:
+                levels[len(address) - 1][address[:-1]].add(address[-1])
+        rebuilt = {}
+        for depth in range(max(levels) if levels else -1, -1, -1):
+            for address, indexes in levels.pop(depth, {}).items():
+                parent = self._root
+                for index in address:
+                    parent = tuple(parent)[index]
+                children = list(parent)
+                for index in sorted(indexes, reverse=True):
+                    child = address + (index,)
+                    edited = child in rebuilt
+                    children[index:index + 1] = _apply_edits(
+                        rebuilt.pop(child, children[index]),
+                        edits.get(child, ()), edited)
+                if isinstance(parent, base.BaseNode):
+                    rebuilt[address] = parent.make_node(children)
+                else:
+                    rebuilt[address] = tuple(children)
+                if address:
+                    levels[depth - 1][address[:-1]].add(address[-1])
+        edited = () in rebuilt
+        root = _apply_edits(rebuilt.pop((), self._root), edits.get((), ()),
+                            edited)
+        if len(root) != 1:
+            raise ValueError('The root was removed or given siblings.')
+        if edited and () not in edits:
+            # A replaced root keeps no positions of the old one.
+            _carried(self._root, root[0])
+        return Zipper(root[0])
+
+
+def _focus_and_path(location):
+    '''Gets the focus and the path of a zipper, a cursor or a node.'''
+    if isinstance(location, Cursor):
+        return location.node, location.path
+    if isinstance(location, Zipper):
+        return location.__wrapped__, location._self_path
+    return location, None
+
+
+def _apply_edits(node, edits, has_edited_descendants):
+    '''Applies the edits of a Batch to one of its locations, returning
+    the list of the nodes which take its place.'''
+    left = []
+    right = []
+    nodes = [node]
+    for kind, value in edits:
+        if kind in ('replace', 'remove') and has_edited_descendants:
+            raise ValueError('A node with edited descendants was replaced '
+                             'or removed.')
+        if kind == 'replace':
+            nodes = [value]
+        elif kind == 'edit':
+            nodes = [node.copy(**value) for node in nodes]
+        elif kind == 'insert_left':
+            left.append(value)
+        elif kind == 'insert_right':
+            right.insert(0, value)
+        else:
+            nodes = []
+    return left + nodes + right